@@ -0,0 +1,56 @@
+"""Throughput of `vs ask --batch` at different concurrency levels.
+
+Usage: python benchmarks/bench_batch.py [--latency 0.1] [--questions 24]
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from openai import OpenAI
+from stand_in import StandIn
+
+from vecsync.chat.batch import BatchRunner, Question
+from vecsync.chat.citations import CitationResolver
+from vecsync.chat.clients.openai import OpenAIClient
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.1, help="Simulated round trip in seconds.")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="Seconds between streamed tokens.")
+    parser.add_argument("--questions", type=int, default=24)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    questions = [Question(id=str(i), question=f"Question {i}") for i in range(args.questions)]
+
+    with StandIn(latency=args.latency, token_delay=args.token_delay) as stand_in, tempfile.TemporaryDirectory() as tmp:
+        client = OpenAIClient(
+            "bench",
+            settings_path=Path(tmp) / "settings.json",
+            history_path=Path(tmp) / "history.sqlite",
+            usage_path=Path(tmp) / "usage.sqlite",
+        )
+        client.client = OpenAI(base_url=stand_in.base_url, api_key="stand-in")
+        client.assistant_id = "asst_bench"
+        client.citations = CitationResolver({})
+        client.metadata = {}
+        client.connected = True
+
+        print(f"Simulated round trip: {args.latency * 1000:.0f} ms, {args.questions} questions")
+        for concurrency in args.concurrency:
+            start = perf_counter()
+            answers = list(BatchRunner(client, concurrency=concurrency).run(questions))
+            elapsed = perf_counter() - start
+
+            failed = sum(a.error is not None for a in answers)
+            print(
+                f"concurrency {concurrency:>2}: {elapsed:6.2f} s  {len(answers) / elapsed:6.2f} questions/s  "
+                f"failed {failed}"
+            )
+
+
+if __name__ == "__main__":
+    main()
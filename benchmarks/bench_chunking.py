@@ -0,0 +1,112 @@
+"""Retrieval quality, latency and tokens per answer for each chunking profile.
+
+The harness replays a fixed question set against a local store indexed with each profile and reports:
+- the share of questions whose answer appears in a retrieved passage
+- the tokens of retrieved context sent with each answer
+- the query latency
+
+With ``--documents`` and ``--questions`` it runs on your own files. The questions file is JSONL with a
+``question`` and the ``answer`` text expected in a retrieved passage. Without them, a synthetic corpus
+is generated. Each document plants facts whose question terms and answer are some distance apart, so
+small chunks can separate the answer from the passage that matches the question.
+
+The local store approximates tokens at 0.75 words each. Hit rates carry over to the OpenAI vector store
+as a relative comparison between profiles, not as absolute numbers.
+
+Usage: python benchmarks/bench_chunking.py [--files 200] [--top-k 5]
+       python benchmarks/bench_chunking.py --documents path/to/pdfs --questions questions.jsonl
+"""
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from vecsync.store.chunking import PROFILES, ChunkingPolicy
+from vecsync.store.local import LocalVectorStore
+
+
+def synthetic_corpus(folder: Path, files: int, words: int, rng: random.Random) -> list[dict]:
+    common = [f"word{i}" for i in range(3000)]
+    questions = []
+
+    for i in range(files):
+        text = rng.choices(common, k=words)
+        # Three facts per document, with the answer up to 300 words after the sentence naming the subject
+        for j in range(3):
+            subject, answer = f"compound{i}x{j}", f"answer{i}x{j}"
+            start = rng.randrange(0, words - 400)
+            gap = rng.randrange(0, 300)
+            text[start] = f"The properties of {subject} were measured in the laboratory."
+            text[start + gap + 1] = f"The measured value is {answer}."
+            questions.append({"question": f"What is the measured value of {subject}?", "answer": answer})
+
+        (folder / f"paper_{i}.txt").write_text(" ".join(text))
+
+    return questions
+
+
+def evaluate(store: LocalVectorStore, questions: list[dict], top_k: int) -> dict[str, float]:
+    hits, tokens, latencies = [], [], []
+    store.search(questions[0]["question"])
+
+    for question in questions:
+        start = perf_counter()
+        passages = store.search(question["question"], max_results=top_k)
+        latencies.append(perf_counter() - start)
+
+        hits.append(any(question["answer"].lower() in p.text.lower() for p in passages))
+        tokens.append(sum(len(p.text.split()) for p in passages) / 0.75)
+
+    return {
+        "hit_rate": statistics.mean(hits),
+        "tokens": statistics.mean(tokens),
+        "latency": statistics.median(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documents", type=Path, help="A folder of documents to index instead of synthetic ones.")
+    parser.add_argument("--questions", type=Path, help="JSONL questions with the answer text to look for.")
+    parser.add_argument("--files", type=int, default=200, help="Synthetic documents to generate.")
+    parser.add_argument("--words", type=int, default=3000, help="Words per synthetic document.")
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.documents is not None:
+            files = [f for f in args.documents.rglob("*") if f.suffix in (".pdf", ".txt", ".md")]
+            with open(args.questions) as f:
+                questions = [json.loads(line) for line in f if line.strip()]
+        else:
+            folder = Path(tmp) / "documents"
+            folder.mkdir()
+            questions = synthetic_corpus(folder, args.files, args.words, random.Random(0))
+            files = list(folder.iterdir())
+
+        results = {}
+        for name in PROFILES:
+            store = LocalVectorStore(name, path=Path(tmp) / "stores" / name)
+            start = perf_counter()
+            store.sync(files, chunking=ChunkingPolicy(default=name))
+            indexing = perf_counter() - start
+
+            chunks = sum(f.chunks for f in store._read_manifest().files.values())
+            results[name] = {**evaluate(store, questions, args.top_k), "chunks": chunks, "indexing": indexing}
+
+    print()
+    print(f"{len(files)} documents, {len(questions)} questions, top {args.top_k} passages")
+    print(f"{'profile':>8} {'chunks':>8} {'hit rate':>9} {'tokens/answer':>14} {'p50 query':>10} {'indexing':>9}")
+    for name, r in results.items():
+        print(
+            f"{name:>8} {r['chunks']:>8,} {r['hit_rate']:>9.0%} {r['tokens']:>14,.0f} "
+            f"{r['latency'] * 1000:>7.1f} ms {r['indexing']:>7.1f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Startup and per-turn latency of the Assistants and Responses chat engines side by side.
+
+Usage: python benchmarks/bench_engines.py [--latency 0.1] [--turns 10]
+"""
+
+import argparse
+import statistics
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter
+
+from openai import OpenAI
+from stand_in import StandIn
+
+import vecsync.chat.clients.openai as openai_client
+import vecsync.chat.clients.responses as responses_client
+from vecsync.chat.clients.openai import OpenAIClient, OpenAIHandler
+from vecsync.chat.clients.responses import ResponsesClient
+from vecsync.chat.formatter import PlainFormatter
+from vecsync.store.openai import OpenAiVectorStore
+
+
+def stand_in_store(openai: OpenAI):
+    def create(name: str, client: OpenAI | None = None) -> OpenAiVectorStore:
+        return OpenAiVectorStore(name, client=openai)
+
+    return create
+
+
+def measure(engine: type[OpenAIClient], stand_in: StandIn, turns: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        client = engine(
+            "bench",
+            settings_path=Path(tmp) / "settings.json",
+            history_path=Path(tmp) / "history.sqlite",
+            usage_path=Path(tmp) / "usage.sqlite",
+        )
+        client.client = OpenAI(base_url=stand_in.base_url, api_key="stand-in")
+
+        requests = len(stand_in.requests)
+        start = perf_counter()
+        client.connect()
+        connect = perf_counter() - start
+
+        first_tokens = []
+        for turn in range(turns):
+            handler = OpenAIHandler(client.citations, PlainFormatter(), client.metadata)
+            start = perf_counter()
+            client.stream_response(client.thread_id, client.assistant_id, handler, f"Question {turn}")
+            list(handler.consume_queue())
+            first_tokens.append(handler.first_token - start)
+
+        # A new session, e.g. a second Gradio tab, starts in a conversation of its own
+        handler = OpenAIHandler(client.citations, PlainFormatter(), client.metadata)
+        start = perf_counter()
+        client.stream_response(client.new_thread(), client.assistant_id, handler, "New session")
+        list(handler.consume_queue())
+        new_session = handler.first_token - start
+
+        return {
+            "connect": connect,
+            "first_turn": first_tokens[0],
+            "later_turns": statistics.mean(first_tokens[1:]) if turns > 1 else first_tokens[0],
+            "new_session": new_session,
+            "requests": (len(stand_in.requests) - requests) / (turns + 1),
+        }
+
+
+def run(engine: str, latency: float, turns: int) -> dict[str, float]:
+    with StandIn(latency=latency) as stand_in:
+        openai = OpenAI(base_url=stand_in.base_url, api_key="stand-in")
+        stand_in.add_vector_store("bench")
+        for i in range(20):
+            stand_in.add_file(f"paper_{i}.pdf")
+
+        openai_client.OpenAiVectorStore = stand_in_store(openai)
+        responses_client.OpenAiVectorStore = stand_in_store(openai)
+
+        return measure(ENGINES[engine], stand_in, turns)
+
+
+ENGINES = {"assistants": OpenAIClient, "responses": ResponsesClient}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.1, help="Simulated round trip in seconds.")
+    parser.add_argument("--turns", type=int, default=10)
+    args = parser.parse_args()
+
+    # Each engine starts in a fresh process so neither benefits from SDK modules the other loaded
+    results = {}
+    for engine in ENGINES:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results[engine] = executor.submit(run, engine, args.latency, args.turns).result()
+
+    print(f"Simulated round trip: {args.latency * 1000:.0f} ms, {args.turns} turns (first token times)")
+    print(f"{'':>10}  {'connect':>8}  {'1st turn':>8}  {'later':>8}  {'new session':>11}  {'requests/turn':>13}")
+    for name, r in results.items():
+        print(
+            f"{name:>10}  {r['connect'] * 1000:6.0f} ms  {r['first_turn'] * 1000:6.0f} ms  "
+            f"{r['later_turns'] * 1000:6.0f} ms  {r['new_session'] * 1000:8.0f} ms  {r['requests']:13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
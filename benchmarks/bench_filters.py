@@ -0,0 +1,79 @@
+"""Relevance and latency of searches restricted to one collection with an attribute filter.
+
+The synthetic corpus has several collections which share a common vocabulary, and each collection adds
+its own topic terms. Queries ask about one collection's topic with mostly common words, the way a user
+asks about "the papers in my causal inference collection". Without a filter, passages from the other
+collections compete for the top results and are sent to the model as irrelevant context.
+
+The local store is used so the benchmark runs offline. The OpenAI vector store applies the same filters
+server side.
+
+Usage: python benchmarks/bench_filters.py [--collections 10] [--files 40]
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from vecsync.store.attributes import parse_filters
+from vecsync.store.local import LocalVectorStore
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--collections", type=int, default=10)
+    parser.add_argument("--files", type=int, default=40, help="Files per collection.")
+    parser.add_argument("--words", type=int, default=2000, help="Words per file.")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    common = [f"common{i}" for i in range(5000)]
+    topics = [[f"topic{c}x{i}" for i in range(200)] for c in range(args.collections)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp) / "documents"
+        folder.mkdir()
+        attributes = {}
+        for c in range(args.collections):
+            for i in range(args.files):
+                # Mostly common words with a sprinkling of the collection's topic terms
+                words = rng.choices(common, k=args.words * 9 // 10) + rng.choices(topics[c], k=args.words // 10)
+                rng.shuffle(words)
+                path = folder / f"c{c}_paper_{i}.txt"
+                path.write_text(" ".join(words))
+                attributes[path.name] = {"source": "file", "collection": f"collection {c}"}
+
+        store = LocalVectorStore("bench", path=Path(tmp) / "stores")
+        store.sync(list(folder.iterdir()), attributes)
+
+        queries = []
+        for _ in range(args.queries):
+            target = rng.randrange(args.collections)
+            queries.append((target, " ".join(rng.choices(common[:500], k=4) + rng.choices(topics[target], k=1))))
+
+        store.search(queries[0][1])
+        results = {}
+        for name, filtered in (("no filter", False), ("--filter collection=...", True)):
+            latencies, precision = [], []
+            for target, query in queries:
+                filters = parse_filters([f"collection=collection {target}"]) if filtered else None
+                start = perf_counter()
+                passages = store.search(query, max_results=args.top_k, filters=filters)
+                latencies.append(perf_counter() - start)
+                on_topic = sum(p.filename.startswith(f"c{target}_") for p in passages)
+                precision.append(on_topic / len(passages) if passages else 0)
+            results[name] = (statistics.median(latencies), statistics.mean(precision))
+
+    print(f"{args.collections} collections x {args.files} files, top {args.top_k} passages per query")
+    print(f"{'':>24} {'p50 latency':>12} {'from target collection':>24}")
+    for name, (latency, precision) in results.items():
+        print(f"{name:>24} {latency * 1000:>9.1f} ms {precision:>23.0%}")
+
+
+if __name__ == "__main__":
+    main()
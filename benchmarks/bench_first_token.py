@@ -0,0 +1,66 @@
+"""Time to first token: separate message creation versus sending the message with the run.
+
+Usage: python benchmarks/bench_first_token.py [--latency 0.1] [--rounds 20]
+"""
+
+import argparse
+import statistics
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from time import perf_counter
+
+from openai import OpenAI
+from stand_in import StandIn
+
+from vecsync.chat.clients.openai import OpenAIClient, OpenAIHandler
+from vecsync.chat.formatter import ConsoleFormatter
+
+
+def time_to_first_token(client: OpenAIClient, executor: ThreadPoolExecutor, combined: bool) -> float:
+    handler = OpenAIHandler({}, ConsoleFormatter())
+    start = perf_counter()
+
+    if combined:
+        executor.submit(client.stream_response, client.thread_id, client.assistant_id, handler, "Hello")
+    else:
+        client.send_message("Hello")
+        executor.submit(client.stream_response, client.thread_id, client.assistant_id, handler)
+
+    chunks = handler.consume_queue()
+    next(chunks)
+    elapsed = perf_counter() - start
+    list(chunks)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.1, help="Simulated round trip in seconds.")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    with StandIn(latency=args.latency) as stand_in, tempfile.TemporaryDirectory() as tmp:
+        client = OpenAIClient(
+            "bench",
+            settings_path=Path(tmp) / "settings.json",
+            history_path=Path(tmp) / "history.sqlite",
+            usage_path=Path(tmp) / "usage.sqlite",
+        )
+        client.client = OpenAI(base_url=stand_in.base_url, api_key="stand-in")
+        client.thread_id = client.client.beta.threads.create().id
+        client.assistant_id = "asst_bench"
+        client.connected = True
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            results = {}
+            for name, combined in [("message + run", False), ("run with message", True)]:
+                results[name] = [time_to_first_token(client, executor, combined) for _ in range(args.rounds)]
+
+    print(f"Simulated round trip: {args.latency * 1000:.0f} ms, {args.rounds} rounds")
+    for name, timings in results.items():
+        print(f"{name:>18}: median {statistics.median(timings) * 1000:7.1f} ms  max {max(timings) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""`vs store gc` duration and the file listing time it saves, with sequential and concurrent deletes.
+
+The account holds a store of attached files and many orphaned uploads, as left behind by interrupted
+syncs and deleted stores. Every sync lists all uploaded files, so the orphans slow down each sync until
+they are collected.
+
+Usage: python benchmarks/bench_gc.py [--attached 200] [--orphans 2000] [--latency 0.05]
+"""
+
+import argparse
+import os
+import statistics
+from time import perf_counter
+
+from stand_in import StandIn
+
+from vecsync.connection import ConnectionOptions, openai_client, reset_clients
+from vecsync.store.openai import OpenAiVectorStore
+
+
+def list_latency(store: OpenAiVectorStore, repeats: int = 5) -> float:
+    latencies = []
+    for _ in range(repeats):
+        start = perf_counter()
+        store.client.files.list()
+        latencies.append(perf_counter() - start)
+    return statistics.median(latencies)
+
+
+def run(args, workers: int) -> dict[str, float]:
+    with StandIn(latency=args.latency) as stand_in:
+        os.environ["OPENAI_BASE_URL"] = stand_in.base_url
+        reset_clients()
+
+        store = OpenAiVectorStore("bench", client=openai_client(ConnectionOptions()), workers=workers)
+        store.create()
+        for i in range(args.attached):
+            file = stand_in.add_file(f"paper_{i}.pdf")
+            stand_in.attach_file({"file_id": file["id"]}, store.store.id)
+        for i in range(args.orphans):
+            stand_in.add_file(f"orphan_{i}.pdf")
+
+        before = list_latency(store)
+        result = store.collect_garbage(grace_period=0)
+        after = list_latency(store)
+
+        assert result.files_deleted == args.orphans
+        return {"gc": result.duration, "before": before, "after": after, "reclaimed": result.bytes_reclaimed}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--attached", type=int, default=200)
+    parser.add_argument("--orphans", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated round trip in seconds.")
+    args = parser.parse_args()
+
+    os.environ["OPENAI_API_KEY"] = "stand-in"
+    results = {workers: run(args, workers) for workers in (1, 16)}
+
+    first = next(iter(results.values()))
+    print()
+    print(f"{args.attached} attached files, {args.orphans} orphaned files, {first['reclaimed'] / 1e6:.1f} MB reclaimed")
+    print(f"files.list() p50: {first['before'] * 1000:.0f} ms before gc, {first['after'] * 1000:.0f} ms after")
+    print(f"{'':>12} {'gc duration':>12}")
+    for workers, r in results.items():
+        print(f"{workers:>4} workers {r['gc']:>11.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""CPU and bandwidth of streaming long responses to Gradio.
+
+Each approach is fed the same tokens on a simulated clock. The cost of every update includes building
+the response string and computing the diff which Gradio sends to the browser. Bytes are reported both
+for the diffs actually sent and for the full values, which is what a client without diffs receives.
+
+Usage: python benchmarks/bench_gradio_stream.py [--tokens-per-second 50]
+"""
+
+import argparse
+import json
+from time import process_time
+
+from gradio.utils import diff
+
+from vecsync.chat.stream import StreamBuffer
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def per_chunk(tokens: list[str], clock: SimulatedClock, step: float):
+    response = ""
+    for token in tokens:
+        clock.now += step
+        response += token
+        yield response
+
+
+def buffered(tokens: list[str], clock: SimulatedClock, step: float):
+    buffer = StreamBuffer(clock=clock)
+    for token in tokens:
+        clock.now += step
+        if buffer.append(token):
+            yield buffer.flush()
+    if buffer.pending:
+        yield buffer.flush()
+
+
+def measure(approach, count: int, step: float) -> tuple[float, int, int, int]:
+    tokens = [f"tok{i % 10} " for i in range(count)]
+    updates, diff_bytes, full_bytes = 0, 0, 0
+    previous = ""
+
+    start = process_time()
+    for value in approach(tokens, SimulatedClock(), step):
+        diff_bytes += len(json.dumps(diff(previous, value)))
+        full_bytes += len(value)
+        previous = value
+        updates += 1
+    elapsed = process_time() - start
+
+    return elapsed, updates, diff_bytes, full_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    args = parser.parse_args()
+    step = 1 / args.tokens_per_second
+
+    print(f"{'approach':>10} {'tokens':>7} {'updates':>8} {'cpu us/tok':>11} {'diff B/tok':>11} {'full B/tok':>11}")
+    for approach in [per_chunk, buffered]:
+        for count in [1_000, 2_500, 5_000, 10_000]:
+            elapsed, updates, diff_bytes, full_bytes = measure(approach, count, step)
+            print(
+                f"{approach.__name__:>10} {count:>7} {updates:>8} {elapsed * 1e6 / count:>11.2f} "
+                f"{diff_bytes / count:>11.1f} {full_bytes / count:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Indexing and query latency of the local vector store on a synthetic corpus.
+
+Usage: python benchmarks/bench_local_search.py [--files 500] [--words 5000]
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from vecsync.store.local import LocalVectorStore
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--words", type=int, default=5000, help="Words per file.")
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = [f"term{i}" for i in range(args.vocabulary)]
+    # Zipf-like term frequencies, like natural text
+    weights = [1 / (i + 1) for i in range(args.vocabulary)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp) / "documents"
+        folder.mkdir()
+        for i in range(args.files):
+            (folder / f"paper_{i}.txt").write_text(" ".join(rng.choices(vocabulary, weights, k=args.words)))
+        files = list(folder.iterdir())
+
+        store = LocalVectorStore("bench", path=Path(tmp) / "stores")
+
+        start = perf_counter()
+        store.sync(files)
+        full = perf_counter() - start
+
+        (folder / "paper_0.txt").write_text(" ".join(rng.choices(vocabulary, weights, k=args.words)))
+        start = perf_counter()
+        result = store.sync(files)
+        incremental = perf_counter() - start
+
+        queries = [" ".join(rng.choices(vocabulary[:5000], k=4)) for _ in range(args.queries)]
+        store.search(queries[0])
+        latencies = []
+        for query in queries:
+            start = perf_counter()
+            store.search(query, max_results=10)
+            latencies.append(perf_counter() - start)
+
+        chunks = sum(f.chunks for f in store._read_manifest().files.values())
+
+    print(f"{args.files} files, {chunks:,} chunks")
+    print(f"full index:        {full:6.2f} s")
+    print(f"incremental sync:  {incremental:6.2f} s  ({result.files_saved} file changed)")
+    cuts = statistics.quantiles(latencies, n=20)
+    print(f"query p50 {cuts[9] * 1000:6.1f} ms  p95 {cuts[18] * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""How soon the most relevant files become searchable during a long first sync.
+
+The most recently added tenth of the library stands in for the papers a user is most likely to ask about.
+Uploading every file before attaching any, in arbitrary order, leaves the store empty until all uploads
+finish. Attaching each file as soon as it is uploaded makes files searchable from the start, and syncing
+in priority order makes the most relevant files searchable first.
+
+Usage: python benchmarks/bench_priority.py [--files 600] [--top 0.1] [--workers 8] [--latency 0.05]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from stand_in import StandIn
+
+from vecsync.connection import ConnectionOptions, openai_client, reset_clients
+from vecsync.store.openai import OpenAiVectorStore
+from vecsync.store.priority import SyncPriority
+
+
+def run(files: list[Path], top: set[str], args, strategy: str) -> dict[str, float]:
+    with StandIn(latency=args.latency) as stand_in:
+        os.environ["OPENAI_BASE_URL"] = stand_in.base_url
+        reset_clients()
+
+        # Record when each file becomes searchable
+        searchable: dict[str, float] = {}
+        attach_file = stand_in.attach_file
+
+        def record(body: dict, store_id: str) -> dict:
+            result = attach_file(body, store_id)
+            searchable[stand_in.files[body["file_id"]]["filename"]] = perf_counter()
+            return result
+
+        stand_in.attach_file = record
+
+        store = OpenAiVectorStore("bench", client=openai_client(ConnectionOptions()), workers=args.workers)
+        store.get_or_create()
+
+        start = perf_counter()
+        if strategy == "upload, then attach":
+            uploaded = store._map(store._upload, set(files))
+            store._map(lambda file_id: store._attach(file_id, None), uploaded)
+        else:
+            store.sync(files)
+
+        return {
+            "first": min(searchable.values()) - start,
+            "top": max(searchable[name] for name in top) - start,
+            "all": max(searchable.values()) - start,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=600)
+    parser.add_argument("--top", type=float, default=0.1, help="Share of most recently added files.")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated round trip in seconds.")
+    args = parser.parse_args()
+
+    os.environ["OPENAI_API_KEY"] = "stand-in"
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for i in range(args.files):
+            path = Path(tmp) / f"paper_{i}.pdf"
+            path.write_bytes(b"%PDF-1.4 " + rng.randbytes(1024))
+            files.append(path)
+
+        added = {f.name: rng.uniform(0, 1e9) for f in files}
+        by_added = SyncPriority(order="added").sort(files, added)
+        top = {f.name for f in by_added[: int(args.files * args.top)]}
+
+        results = {
+            "upload, then attach": run(files, top, args, "upload, then attach"),
+            "pipelined": run(files, top, args, "pipelined"),
+            "pipelined, added": run(by_added, top, args, "pipelined"),
+        }
+
+    print()
+    print(f"{args.files} files, {args.workers} workers, simulated round trip {args.latency * 1000:.0f} ms")
+    print(f"{'':>20} {'first file':>11} {f'newest {args.top:.0%}':>11} {'all files':>10}")
+    for name, r in results.items():
+        print(f"{name:>20} {r['first']:>10.2f}s {r['top']:>10.2f}s {r['all']:>9.2f}s")
+
+
+if __name__ == "__main__":
+    main()
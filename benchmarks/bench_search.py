@@ -0,0 +1,71 @@
+"""Latency of `vs search` compared to answering the same question with an assistant run.
+
+Usage: python benchmarks/bench_search.py [--latency 0.1] [--token-delay 0.01]
+"""
+
+import argparse
+import statistics
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from openai import OpenAI
+from stand_in import StandIn
+
+from vecsync.chat.citations import CitationResolver
+from vecsync.chat.clients.openai import OpenAIClient, OpenAIHandler
+from vecsync.chat.formatter import PlainFormatter
+from vecsync.store.openai import OpenAiVectorStore
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.1, help="Simulated round trip in seconds.")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="Seconds between streamed tokens.")
+    parser.add_argument("--tokens", type=int, default=150, help="The number of tokens in each answer.")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with (
+        StandIn(latency=args.latency, token_delay=args.token_delay, tokens=args.tokens) as stand_in,
+        tempfile.TemporaryDirectory() as tmp,
+    ):
+        store_id = stand_in.add_vector_store("bench")["id"]
+        for i in range(20):
+            stand_in.add_file(f"paper_{i}.pdf")
+
+        store = OpenAiVectorStore("bench")
+        store.client = OpenAI(base_url=stand_in.base_url, api_key="stand-in")
+
+        client = OpenAIClient(
+            "bench",
+            settings_path=Path(tmp) / "settings.json",
+            history_path=Path(tmp) / "history.sqlite",
+            usage_path=Path(tmp) / "usage.sqlite",
+        )
+        client.client = store.client
+        client.assistant_id = "asst_bench"
+        client.citations = CitationResolver({})
+        client.metadata = {}
+        client.connected = True
+        thread_id = client._create_thread()
+
+        search, answer = [], []
+        for i in range(args.repeat):
+            start = perf_counter()
+            store.search(f"Question {i}", max_results=5, store_id=store_id)
+            search.append(perf_counter() - start)
+
+            handler = OpenAIHandler(client.citations, PlainFormatter(), client.metadata)
+            start = perf_counter()
+            client.stream_response(thread_id, client.assistant_id, handler, f"Question {i}")
+            list(handler.consume_queue())
+            answer.append(perf_counter() - start)
+
+    print(f"Simulated round trip: {args.latency * 1000:.0f} ms, {args.tokens} tokens per answer")
+    print(f"search:        {statistics.mean(search) * 1000:6.0f} ms to ranked passages")
+    print(f"assistant run: {statistics.mean(answer) * 1000:6.0f} ms to the complete answer")
+
+
+if __name__ == "__main__":
+    main()
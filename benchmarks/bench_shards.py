@@ -0,0 +1,93 @@
+"""Sync, resharding and search with the files spread across several vector stores.
+
+Each search pays a simulated cost for every file attached to the searched store, so a single large store
+answers slower than several smaller ones searched concurrently. Resharding reports the files moved by
+consistent hashing against the files a ``hash % shards`` placement would move.
+
+Usage: python benchmarks/bench_shards.py [--files 400] [--shards 4] [--latency 0.02] [--search-delay 0.0005]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from stand_in import StandIn
+
+from vecsync.connection import ConnectionOptions, openai_client, reset_clients
+from vecsync.store.openai import OpenAiVectorStore
+from vecsync.store.sharding import HashRing, _hash
+
+
+def search_latency(store: OpenAiVectorStore, queries: int) -> float:
+    latencies = []
+    for i in range(queries):
+        start = perf_counter()
+        store.search(f"question {i}", max_results=10)
+        latencies.append(perf_counter() - start)
+    return statistics.median(latencies)
+
+
+def run(files: list[Path], args, shards: int) -> dict[str, float]:
+    with StandIn(latency=args.latency, search_delay=args.search_delay) as stand_in:
+        os.environ["OPENAI_BASE_URL"] = stand_in.base_url
+        reset_clients()
+        client = openai_client(ConnectionOptions())
+
+        store = OpenAiVectorStore("bench", client=client, workers=32, shards=shards)
+        result = store.sync(files)
+        results = {"sync": result.duration, "search": search_latency(store, args.queries)}
+
+        # Add a shard and sync again, moving the files placed on it
+        attached = sum(1 for method, path in stand_in.requests if method == "POST" and path.endswith("/files"))
+        store = OpenAiVectorStore("bench", client=client, workers=32, shards=shards + 1)
+        results["reshard"] = store.sync(files).duration
+        results["moved"] = (
+            sum(1 for method, path in stand_in.requests if method == "POST" and path.endswith("/files")) - attached
+        )
+
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=400)
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated round trip in seconds.")
+    parser.add_argument("--search-delay", type=float, default=0.0005, help="Simulated search seconds per file.")
+    args = parser.parse_args()
+
+    os.environ["OPENAI_API_KEY"] = "stand-in"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for i in range(args.files):
+            path = Path(tmp) / f"paper_{i}.pdf"
+            path.write_bytes(b"%PDF-1.4 " + os.urandom(1024))
+            files.append(path)
+
+        results = {shards: run(files, args, shards) for shards in (1, args.shards)}
+
+    before, after = HashRing(args.shards), HashRing(args.shards + 1)
+    ring_moves = sum(before.shard(f.name) != after.shard(f.name) for f in files)
+    modulo_moves = sum(_hash(f.name) % args.shards != _hash(f.name) % (args.shards + 1) for f in files)
+
+    print()
+    print(f"{args.files} files, simulated round trip {args.latency * 1000:.0f} ms")
+    print(f"{'':>10} {'sync':>8} {'p50 search':>11} {'add a shard':>12} {'files moved':>12}")
+    for shards, r in results.items():
+        print(
+            f"{shards:>3} shards {r['sync']:>7.2f}s {r['search'] * 1000:>8.0f} ms {r['reshard']:>11.2f}s "
+            f"{r['moved']:>12}"
+        )
+    print()
+    print(f"Files moved going from {args.shards} to {args.shards + 1} shards:")
+    print(f"  consistent hashing: {ring_moves} ({ring_moves / args.files:.0%})")
+    print(f"  hash % shards:      {modulo_moves} ({modulo_moves / args.files:.0%})")
+
+
+if __name__ == "__main__":
+    main()
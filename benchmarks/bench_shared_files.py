@@ -0,0 +1,75 @@
+"""Uploads and `vs sync` time for several project stores which share most of their papers.
+
+Each project keeps its own copies of the shared papers under its own file names, as when every project
+exports its papers from a different reference manager. Without the file registry every copy is uploaded
+again, while with it a copy with the same contents is attached by the file ID of the first upload.
+
+Usage: python benchmarks/bench_shared_files.py [--projects 3] [--files 200] [--shared 0.7] [--latency 0.05]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+from pathlib import Path
+
+from stand_in import StandIn
+
+from vecsync.connection import ConnectionOptions, openai_client, reset_clients
+from vecsync.store.openai import OpenAiVectorStore
+from vecsync.store.registry import FileRegistry
+
+
+def run(projects: list[list[Path]], args, registry: FileRegistry | None) -> tuple[float, int]:
+    with StandIn(latency=args.latency) as stand_in:
+        os.environ["OPENAI_BASE_URL"] = stand_in.base_url
+        reset_clients()
+        client = openai_client(ConnectionOptions())
+
+        duration = 0.0
+        for i, files in enumerate(projects):
+            store = OpenAiVectorStore(f"project-{i}", client=client, registry=registry)
+            duration += store.sync(files).duration
+
+        return duration, len(stand_in.files)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=3)
+    parser.add_argument("--files", type=int, default=200, help="Files per project.")
+    parser.add_argument("--shared", type=float, default=0.7, help="Share of each project's files common to all.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated round trip in seconds.")
+    args = parser.parse_args()
+
+    os.environ["OPENAI_API_KEY"] = "stand-in"
+    rng = random.Random(0)
+    shared = [rng.randbytes(4096) for _ in range(int(args.files * args.shared))]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        projects = []
+        for i in range(args.projects):
+            folder = Path(tmp) / f"project_{i}"
+            folder.mkdir()
+            contents = shared + [rng.randbytes(4096) for _ in range(args.files - len(shared))]
+            files = []
+            for j, data in enumerate(contents):
+                path = folder / f"p{i}_paper_{j}.pdf"
+                path.write_bytes(b"%PDF-1.4 " + data)
+                files.append(path)
+            projects.append(files)
+
+        results = {
+            "matched by name": run(projects, args, None),
+            "file registry": run(projects, args, FileRegistry(Path(tmp) / "files.json")),
+        }
+
+    print()
+    print(f"{args.projects} projects x {args.files} files, {args.shared:.0%} shared")
+    print(f"{'':>16} {'sync':>8} {'uploads':>8}")
+    for name, (duration, uploads) in results.items():
+        print(f"{name:>16} {duration:>7.2f}s {uploads:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Time to prompt for `vs chat`: construct the client and connect to the vector store, assistant and thread.
+
+The serial baseline replays the requests the previous implementation made one after another. Cold starts
+have an empty settings file, warm starts reuse the IDs cached by the previous run.
+
+Usage: python benchmarks/bench_startup.py [--latency 0.1] [--files 200]
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import tempfile
+import warnings
+from pathlib import Path
+from time import perf_counter
+from unittest import mock
+
+from openai import OpenAI
+from stand_in import StandIn
+
+from vecsync.chat.clients.openai import OpenAIClient
+from vecsync.store.openai import OpenAiVectorStore
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+
+def start(stand_in: StandIn, settings_path: Path, history_path: Path, baseline: bool = False) -> float:
+    openai = OpenAI(base_url=stand_in.base_url, api_key="stand-in")
+    started = perf_counter()
+
+    client = OpenAIClient(
+        "bench",
+        settings_path=settings_path,
+        history_path=history_path,
+        usage_path=history_path.with_name("usage.sqlite"),
+    )
+    client.client = openai
+
+    with (
+        contextlib.redirect_stdout(io.StringIO()),
+        stand_in_store(openai),
+    ):
+        if baseline:
+            # The previous connect: list stores, list assistants, then list files and attached files
+            store = next(s for s in openai.vector_stores.list() if s.name == "bench")
+            list(openai.beta.assistants.list())
+            list(openai.files.list())
+            list(openai.vector_stores.files.list(vector_store_id=store.id))
+        else:
+            client.connect()
+
+    return perf_counter() - started
+
+
+@contextlib.contextmanager
+def stand_in_store(openai: OpenAI):
+    """Point the vector stores created by the client at the stand-in."""
+
+    def build(name, client=None):
+        return OpenAiVectorStore(name, client=openai)
+
+    with mock.patch("vecsync.chat.clients.openai.OpenAiVectorStore", build):
+        yield
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.1, help="Simulated round trip in seconds.")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {"serial baseline": [], "cold": [], "warm": []}
+
+    with StandIn(latency=args.latency) as stand_in, tempfile.TemporaryDirectory() as tmp:
+        stand_in.add_vector_store("bench")
+        for i in range(args.files):
+            stand_in.add_file(f"paper_{i}.pdf")
+
+        for i in range(args.rounds):
+            settings_path = Path(tmp) / f"settings_{i}.json"
+            history_path = Path(tmp) / "history.sqlite"
+
+            results["serial baseline"].append(start(stand_in, settings_path, history_path, baseline=True))
+            stand_in.requests.clear()
+            results["cold"].append(start(stand_in, settings_path, history_path))
+            results["warm"].append(start(stand_in, settings_path, history_path))
+
+    print(f"Simulated round trip: {args.latency * 1000:.0f} ms, {args.files} files, {args.rounds} rounds")
+    for name, timings in results.items():
+        print(f"{name:>16}: median {statistics.median(timings) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""`vs sync` time and connections opened when uploading many files, sequentially and with concurrent workers.
+
+Every upload and attach request pays the simulated round trip, and every new connection pays a simulated
+TCP and TLS handshake. Workers sharing the process-wide client reuse its pooled connections, while a new
+client for each request opens a new connection every time.
+
+Usage: python benchmarks/bench_sync.py [--files 200] [--latency 0.05] [--handshake 0.05]
+"""
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from openai import OpenAI
+from stand_in import StandIn
+
+from vecsync.connection import ConnectionOptions, openai_client, reset_clients
+from vecsync.store.openai import OpenAiVectorStore
+
+
+class NewClientPerRequest:
+    """Create a new OpenAI client, and with it a new connection, for every request."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+
+    def __getattr__(self, name: str):
+        return getattr(OpenAI(base_url=self.base_url, api_key="stand-in"), name)
+
+
+def run(files: list[Path], args, workers: int, shared: bool) -> tuple[float, int]:
+    with StandIn(latency=args.latency, handshake=args.handshake) as stand_in:
+        os.environ["OPENAI_BASE_URL"] = stand_in.base_url
+        reset_clients()
+
+        client = openai_client(ConnectionOptions()) if shared else NewClientPerRequest(stand_in.base_url)
+        store = OpenAiVectorStore("bench", client=client, workers=workers)
+        result = store.sync(files)
+
+        assert result.files_saved == len(files)
+        return result.duration, stand_in.connections
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated round trip in seconds.")
+    parser.add_argument("--handshake", type=float, default=0.05, help="Simulated connection setup in seconds.")
+    args = parser.parse_args()
+
+    os.environ["OPENAI_API_KEY"] = "stand-in"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for i in range(args.files):
+            path = Path(tmp) / f"paper_{i}.pdf"
+            path.write_bytes(b"%PDF-1.4 " + os.urandom(2048))
+            files.append(path)
+
+        scenarios = {
+            "1 worker": (1, True),
+            "8 workers": (8, True),
+            "32 workers": (32, True),
+            "32 workers, new client per request": (32, False),
+        }
+        results = {name: run(files, args, workers, shared) for name, (workers, shared) in scenarios.items()}
+
+    print()
+    print(
+        f"{args.files} files, simulated round trip {args.latency * 1000:.0f} ms, "
+        f"handshake {args.handshake * 1000:.0f} ms"
+    )
+    print(f"{'':>36} {'duration':>10} {'connections':>12}")
+    for name, (duration, connections) in results.items():
+        print(f"{name:>36} {duration:>9.2f}s {connections:>12}")
+
+
+if __name__ == "__main__":
+    main()
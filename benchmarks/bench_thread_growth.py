@@ -0,0 +1,79 @@
+"""Time to first token over a long conversation with and without thread compaction.
+
+Usage: python benchmarks/bench_thread_growth.py [--turns 60] [--context-delay 0.01]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from time import perf_counter
+
+from openai import OpenAI
+from stand_in import StandIn
+
+from vecsync.chat.citations import CitationResolver
+from vecsync.chat.clients.openai import OpenAIClient, OpenAIHandler
+from vecsync.chat.compaction import ThreadPolicy
+from vecsync.chat.formatter import PlainFormatter
+
+POLICIES = {
+    "unbounded": ThreadPolicy(max_turns=None, max_context_tokens=None),
+    "truncated": ThreadPolicy(max_turns=None, max_context_tokens=None, last_messages=20),
+    "rotated": ThreadPolicy(max_turns=15, max_context_tokens=None),
+}
+
+
+def converse(stand_in: StandIn, policy: ThreadPolicy, turns: int, think: float) -> tuple[list[float], int]:
+    with tempfile.TemporaryDirectory() as tmp:
+        client = OpenAIClient(
+            "bench",
+            settings_path=Path(tmp) / "settings.json",
+            history_path=Path(tmp) / "history.sqlite",
+            usage_path=Path(tmp) / "usage.sqlite",
+        )
+        client.client = OpenAI(base_url=stand_in.base_url, api_key="stand-in")
+        client.assistant_id = "asst_bench"
+        client.citations = CitationResolver({})
+        client.metadata = {}
+        client.connected = True
+        policy.save(client.settings)
+        client.thread_id = client._create_thread()
+
+        first_tokens = []
+        for turn in range(turns):
+            handler = OpenAIHandler(client.citations, PlainFormatter(), client.metadata)
+            start = perf_counter()
+            client.stream_response(client.thread_id, client.assistant_id, handler, f"Question {turn}")
+            list(handler.consume_queue())
+            first_tokens.append(handler.first_token - start)
+
+            # The user reads the answer and types the next question
+            time.sleep(think)
+
+        return first_tokens, client.ledger.total().total_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated round trip in seconds.")
+    parser.add_argument("--context-delay", type=float, default=0.01, help="Seconds per message of context.")
+    parser.add_argument("--turns", type=int, default=60)
+    parser.add_argument("--think", type=float, default=0.2, help="Seconds between questions.")
+    args = parser.parse_args()
+
+    print(f"Simulated round trip: {args.latency * 1000:.0f} ms, {args.context_delay * 1000:.0f} ms per message")
+    with StandIn(latency=args.latency, context_delay=args.context_delay) as stand_in:
+        for name, policy in POLICIES.items():
+            first_tokens, tokens = converse(stand_in, policy, args.turns, args.think)
+            window = max(1, args.turns // 6)
+            print(
+                f"{name:>9}: first token turns 1-{window} {statistics.mean(first_tokens[:window]) * 1000:6.0f} ms  "
+                f"last {window} {statistics.mean(first_tokens[-window:]) * 1000:6.0f} ms  "
+                f"max {max(first_tokens) * 1000:6.0f} ms  {tokens:,} tokens"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+"""A local stand-in for the OpenAI API used by the benchmarks.
+
+The server implements just enough of the Assistants endpoints for vecsync to run against it, with a
+configurable delay on every request to simulate the network round trip and a delay between streamed
+tokens to simulate generation. Point an ``OpenAI`` client at ``StandIn.base_url`` to use it.
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+
+
+class StandIn:
+    """Run the stand-in server in a background thread.
+
+    Parameters
+    ----------
+    latency : float
+        Seconds added to every request, simulating a network round trip.
+    token_delay : float
+        Seconds between streamed tokens.
+    tokens : int
+        The number of tokens in each streamed answer.
+    context_delay : float
+        Seconds added before the first token for every message in the run's context, simulating the cost
+        of processing a long conversation.
+    handshake : float
+        Seconds added when a new connection is opened, simulating the TCP and TLS handshakes.
+    search_delay : float
+        Seconds added to a vector store search for every file attached to the store, simulating the cost
+        of searching a large store.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        token_delay: float = 0.0,
+        tokens: int = 20,
+        context_delay: float = 0.0,
+        handshake: float = 0.0,
+        search_delay: float = 0.0,
+    ):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.tokens = tokens
+        self.context_delay = context_delay
+        self.handshake = handshake
+        self.search_delay = search_delay
+        self.connections = 0
+        self.requests: list[tuple[str, str]] = []
+        self.threads: dict[str, list[dict]] = {}
+        self.vector_stores: dict[str, dict] = {}
+        self.assistants: dict[str, dict] = {}
+        self.files: dict[str, dict] = {}
+        self.vector_store_files: dict[str, dict[str, dict]] = {}
+        self._counter = 0
+        self._lock = threading.Lock()
+
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with stand_in._lock:
+                    stand_in.connections += 1
+                time.sleep(stand_in.handshake)
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                stand_in._handle(self, "GET")
+
+            def do_POST(self):
+                stand_in._handle(self, "POST")
+
+            def do_DELETE(self):
+                stand_in._handle(self, "DELETE")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def next_id(self, prefix: str) -> str:
+        with self._lock:
+            self._counter += 1
+            return f"{prefix}_{self._counter}"
+
+    def _handle(self, request: BaseHTTPRequestHandler, method: str):
+        length = int(request.headers.get("Content-Length") or 0)
+        raw = request.rfile.read(length) if length else b""
+        if request.headers.get_content_type() == "multipart/form-data":
+            # Only the name of an uploaded file is kept
+            body = {"filename": re.search(rb'filename="([^"]+)"', raw).group(1).decode()}
+        else:
+            body = json.loads(raw) if raw else {}
+        path, _, query = request.path.partition("?")
+        path = path.removeprefix("/v1")
+        body.update(parse_qsl(query))
+
+        self.requests.append((method, path))
+        time.sleep(self.latency)
+
+        for route_method, pattern, fn in self.routes():
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                result = fn(body, *match.groups())
+                if isinstance(result, list):
+                    self._send_events(request, result)
+                else:
+                    self._send_json(request, result, status=result.pop("http_status", 200))
+                return
+
+        self._send_json(request, {"error": {"message": f"No route for {method} {path}"}}, status=404)
+
+    def routes(self):
+        return [
+            ("POST", r"/threads", self.create_thread),
+            ("GET", r"/threads/([^/]+)", lambda body, id: self.retrieve(self.threads, id, self.thread)),
+            ("POST", r"/threads/([^/]+)/messages", self.create_message),
+            ("GET", r"/threads/([^/]+)/messages", self.list_messages),
+            ("POST", r"/threads/([^/]+)/runs", self.create_run),
+            ("GET", r"/vector_stores", lambda body: self.page(self.vector_stores)),
+            ("POST", r"/vector_stores", lambda body: self.add_vector_store(body["name"])),
+            ("GET", r"/vector_stores/([^/]+)", lambda body, id: self.retrieve(self.vector_stores, id)),
+            ("GET", r"/vector_stores/([^/]+)/files", lambda body, id: self.page(self.vector_store_files.get(id, {}))),
+            ("POST", r"/vector_stores/([^/]+)/files", self.attach_file),
+            ("GET", r"/vector_stores/([^/]+)/files/([^/]+)", self.vector_store_file),
+            ("DELETE", r"/vector_stores/([^/]+)", self.delete_vector_store),
+            ("DELETE", r"/vector_stores/([^/]+)/files/([^/]+)", self.detach_file),
+            ("POST", r"/vector_stores/([^/]+)/search", self.search),
+            ("GET", r"/assistants", lambda body: self.page(self.assistants)),
+            ("GET", r"/assistants/([^/]+)", lambda body, id: self.retrieve(self.assistants, id)),
+            ("POST", r"/assistants", self.create_assistant),
+            ("GET", r"/files", lambda body: self.page(self.files)),
+            ("POST", r"/files", lambda body: self.add_file(body["filename"])),
+            ("DELETE", r"/files/([^/]+)", self.delete_file),
+            ("POST", r"/chat/completions", self.create_completion),
+            ("POST", r"/responses", self.create_response),
+        ]
+
+    @staticmethod
+    def page(objects: dict[str, dict]) -> dict:
+        data = list(objects.values())
+        return {"object": "list", "data": data, "has_more": False}
+
+    @staticmethod
+    def retrieve(objects: dict, id: str, build=None) -> dict:
+        if id not in objects:
+            return {"error": {"message": f"No such object: {id}"}, "http_status": 404}
+        return build(id) if build else objects[id]
+
+    def thread(self, thread_id: str) -> dict:
+        return {"id": thread_id, "object": "thread", "created_at": 0, "metadata": {}}
+
+    def add_vector_store(self, name: str) -> dict:
+        store = {"id": self.next_id("vs"), "object": "vector_store", "name": name, "created_at": 0}
+        self.vector_stores[store["id"]] = store
+        return store
+
+    def add_file(self, filename: str) -> dict:
+        file = {
+            "id": self.next_id("file"),
+            "object": "file",
+            "filename": filename,
+            "purpose": "assistants",
+            "bytes": 1024,
+            "created_at": 0,
+            "status": "processed",
+        }
+        self.files[file["id"]] = file
+        return file
+
+    def delete_file(self, body: dict, file_id: str) -> dict:
+        with self._lock:
+            if self.files.pop(file_id, None) is None:
+                return {"error": {"message": f"No such file: {file_id}"}, "http_status": 404}
+        return {"id": file_id, "object": "file", "deleted": True}
+
+    def vector_store_file(self, body: dict, store_id: str, file_id: str) -> dict:
+        return {
+            "id": file_id,
+            "object": "vector_store.file",
+            "vector_store_id": store_id,
+            "status": "completed",
+            "created_at": 0,
+            "usage_bytes": 1024,
+            "last_error": None,
+        }
+
+    def attach_file(self, body: dict, store_id: str) -> dict:
+        vector_store_file = self.vector_store_file(body, store_id, body["file_id"])
+        with self._lock:
+            self.vector_store_files.setdefault(store_id, {})[body["file_id"]] = vector_store_file
+        return vector_store_file
+
+    def delete_vector_store(self, body: dict, store_id: str) -> dict:
+        with self._lock:
+            self.vector_stores.pop(store_id, None)
+            self.vector_store_files.pop(store_id, None)
+        return {"id": store_id, "object": "vector_store.deleted", "deleted": True}
+
+    def detach_file(self, body: dict, store_id: str, file_id: str) -> dict:
+        with self._lock:
+            if self.vector_store_files.get(store_id, {}).pop(file_id, None) is None:
+                return {"error": {"message": f"No such file: {file_id}"}, "http_status": 404}
+        return {"id": file_id, "object": "vector_store.file.deleted", "deleted": True}
+
+    def search(self, body: dict, store_id: str) -> dict:
+        if store_id not in self.vector_stores:
+            return {"error": {"message": f"No such vector store: {store_id}"}, "http_status": 404}
+
+        # A store with attached files returns those, otherwise every uploaded file is a match
+        attached = self.vector_store_files.get(store_id, {})
+        time.sleep(self.search_delay * len(attached))
+        files = [file for file in self.files.values() if len(attached) == 0 or file["id"] in attached]
+        files = files[: body.get("max_num_results", 10)]
+        data = [
+            {
+                "object": "vector_store.search_result",
+                "file_id": file["id"],
+                "filename": file["filename"],
+                "score": 1 / (i + 1),
+                "attributes": {},
+                "content": [{"type": "text", "text": f"A passage from {file['filename']} about {body['query']}."}],
+            }
+            for i, file in enumerate(files)
+        ]
+        return {"object": "vector_store.search_results.page", "search_query": body["query"], "data": data}
+
+    def create_response(self, body: dict) -> list:
+        response_id = self.next_id("resp")
+        response = {
+            "id": response_id,
+            "object": "response",
+            "created_at": int(time.time()),
+            "model": body["model"],
+            "status": "in_progress",
+            "output": [],
+            "previous_response_id": body.get("previous_response_id"),
+        }
+        events = [("response.created", {"type": "response.created", "response": response, "sequence_number": 0})]
+
+        for i in range(self.tokens):
+            delta = {
+                "type": "response.output_text.delta",
+                "item_id": f"msg_{response_id}",
+                "output_index": 0,
+                "content_index": 0,
+                "delta": f"token{i} ",
+                "sequence_number": i + 1,
+            }
+            events.append(("response.output_text.delta", delta))
+
+        usage = {"input_tokens": 100, "output_tokens": self.tokens, "total_tokens": 100 + self.tokens}
+        completed = {**response, "status": "completed", "usage": usage}
+        events.append(("response.completed", {"type": "response.completed", "response": completed}))
+        return events
+
+    def create_assistant(self, body: dict) -> dict:
+        assistant = {"id": self.next_id("asst"), "object": "assistant", "name": body["name"], "created_at": 0}
+        self.assistants[assistant["id"]] = assistant
+        return assistant
+
+    @staticmethod
+    def _send_json(request: BaseHTTPRequestHandler, data: dict, status: int = 200):
+        payload = json.dumps(data).encode()
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def _send_events(self, request: BaseHTTPRequestHandler, events: list[tuple[str, dict]]):
+        request.send_response(200)
+        request.send_header("Content-Type", "text/event-stream")
+        request.send_header("Connection", "close")
+        request.end_headers()
+
+        for event, data in events:
+            if event == "sleep":
+                time.sleep(data)
+                continue
+            if event in ("thread.message.delta", "response.output_text.delta") and self.token_delay > 0:
+                time.sleep(self.token_delay)
+            request.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+            request.wfile.flush()
+
+        request.wfile.write(b"event: done\ndata: [DONE]\n\n")
+        request.wfile.flush()
+        request.close_connection = True
+
+    def create_thread(self, body: dict) -> dict:
+        thread_id = self.next_id("thread")
+        self.threads[thread_id] = []
+        for message in body.get("messages") or []:
+            self.create_message(message, thread_id)
+        return self.thread(thread_id)
+
+    def list_messages(self, body: dict, thread_id: str) -> dict:
+        messages = list(self.threads.get(thread_id, []))
+        if body.get("order", "desc") == "desc":
+            messages.reverse()
+        if "after" in body:
+            ids = [m["id"] for m in messages]
+            messages = messages[ids.index(body["after"]) + 1 :]
+
+        limit = int(body.get("limit", 20))
+        return {"object": "list", "data": messages[:limit], "has_more": len(messages) > limit}
+
+    def create_completion(self, body: dict) -> dict:
+        return {
+            "id": self.next_id("chatcmpl"),
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "A short summary of the conversation."},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 1000, "completion_tokens": 50, "total_tokens": 1050},
+        }
+
+    def message(self, thread_id: str, role: str, text: str) -> dict:
+        return {
+            "id": self.next_id("msg"),
+            "object": "thread.message",
+            "created_at": int(time.time()),
+            "thread_id": thread_id,
+            "role": role,
+            "status": "completed",
+            "content": [{"type": "text", "text": {"value": text, "annotations": []}}],
+            "attachments": [],
+            "metadata": {},
+        }
+
+    def create_message(self, body: dict, thread_id: str) -> dict:
+        message = self.message(thread_id, body["role"], body["content"])
+        self.threads.setdefault(thread_id, []).append(message)
+        return message
+
+    def create_run(self, body: dict, thread_id: str) -> list[tuple[str, dict]]:
+        for message in body.get("additional_messages") or []:
+            self.create_message(message, thread_id)
+
+        run = {
+            "id": self.next_id("run"),
+            "object": "thread.run",
+            "thread_id": thread_id,
+            "assistant_id": body["assistant_id"],
+            "status": "queued",
+            "created_at": int(time.time()),
+        }
+        reply = self.message(thread_id, "assistant", "")
+        reply["status"] = "in_progress"
+        reply["content"] = []
+
+        # Only the most recent messages are processed when the run is truncated
+        context = len(self.threads.get(thread_id, []))
+        truncation = body.get("truncation_strategy") or {}
+        if truncation.get("type") == "last_messages":
+            context = min(context, truncation["last_messages"])
+
+        events = [
+            ("thread.run.created", run),
+            ("sleep", context * self.context_delay),
+            ("thread.message.created", reply),
+        ]
+        text = []
+        for i in range(self.tokens):
+            token = f"token{i} "
+            text.append(token)
+            delta = {"content": [{"index": 0, "type": "text", "text": {"value": token, "annotations": []}}]}
+            data = {"id": reply["id"], "object": "thread.message.delta", "delta": delta}
+            events.append(("thread.message.delta", data))
+
+        completed = self.message(thread_id, "assistant", "".join(text))
+        completed["id"] = reply["id"]
+        self.threads.setdefault(thread_id, []).append(completed)
+
+        prompt_tokens = 100 + 50 * context
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": self.tokens,
+            "total_tokens": prompt_tokens + self.tokens,
+        }
+        events.append(("thread.message.completed", completed))
+        events.append(("thread.run.completed", {**run, "status": "completed", "usage": usage}))
+        return events
@@ -0,0 +1,198 @@
+import json
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from time import perf_counter
+
+from pydantic import BaseModel
+
+from vecsync.chat.clients.openai import OpenAIClient, OpenAIHandler
+from vecsync.chat.formatter import PlainFormatter
+from vecsync.chat.sessions import ThreadPool
+from vecsync.chat.usage import Usage
+
+
+class Question(BaseModel):
+    id: str
+    question: str
+
+
+class Citation(BaseModel):
+    id: int
+    file_id: str
+    file: str
+
+
+class Answer(BaseModel):
+    id: str
+    question: str
+    answer: str | None = None
+    citations: list[Citation] = []
+    thread_id: str | None = None
+    first_token_seconds: float | None = None
+    total_seconds: float | None = None
+    usage: Usage | None = None
+    error: str | None = None
+
+
+def get_citations(handler: OpenAIHandler) -> list[Citation]:
+    """Get the files cited in a finished response, numbered as they appear in its text."""
+    files = handler.files.resolve(handler.annotations)
+    return [
+        Citation(id=citation_id, file_id=file_id, file=files[file_id])
+        for file_id, citation_id in handler.annotations.items()
+    ]
+
+
+def read_questions(lines: Iterable[str]) -> list[Question]:
+    """Parse questions from plain text or JSONL.
+
+    Each non-empty line is either a question or a JSON object with a ``question`` and an optional ``id``.
+    Questions without an ID are identified by their line number, which is used to resume a batch.
+
+    Parameters
+    ----------
+    lines : Iterable[str]
+        The lines of the question file.
+
+    Returns
+    -------
+    list[Question]
+        The parsed questions.
+
+    Raises
+    ------
+    ValueError
+        If a JSON line is invalid or has no ``question``, naming the line number.
+    """
+    questions = []
+
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if len(line) == 0:
+            continue
+
+        if line.startswith("{"):
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {number} is not valid JSON: {e.msg}") from e
+            if not isinstance(data.get("question"), str):
+                raise ValueError(f'Line {number} has no "question"')
+            questions.append(Question(id=str(data.get("id", number)), question=data["question"]))
+        else:
+            questions.append(Question(id=str(number), question=line))
+
+    return questions
+
+
+def read_answered(path: Path) -> set[str]:
+    """Get the IDs of questions answered without error in an existing output file."""
+    if not path.exists():
+        return set()
+
+    answered = set()
+    with open(path) as f:
+        for line in f:
+            try:
+                answer = Answer.model_validate_json(line)
+            except ValueError:
+                # The last line may be incomplete if the previous batch was killed mid-write
+                continue
+            if answer.error is None:
+                answered.add(answer.id)
+
+    return answered
+
+
+class BatchRunner:
+    """Answer many questions concurrently with a connected client.
+
+    Each question is asked in a new thread so answers are independent of each other. Threads are created
+    ahead of time in the background, and up to ``concurrency`` runs are streamed at once. All questions
+    share the client's assistant and citation resolver.
+
+    Parameters
+    ----------
+    client : OpenAIClient
+        The connected OpenAI client.
+    concurrency : int
+        The maximum number of questions answered at the same time.
+    """
+
+    def __init__(self, client: OpenAIClient, concurrency: int = 8):
+        self.client = client
+        self.concurrency = concurrency
+        self.threads = ThreadPool(client, size=concurrency)
+
+    def ask(self, question: Question) -> Answer:
+        """Answer a single question, capturing any error in the result."""
+        answer = Answer(id=question.id, question=question.question)
+        handler = OpenAIHandler(self.client.citations, PlainFormatter(), self.client.metadata)
+        start = perf_counter()
+
+        try:
+            answer.thread_id = self.threads.acquire()
+
+            # The run is streamed on this worker thread and the chunks are read back once it finishes
+            self.client.stream_response(
+                answer.thread_id, self.client.assistant_id, handler, question.question, session="batch"
+            )
+
+            text = "".join(handler.consume_queue())
+        except Exception as e:
+            answer.error = f"{type(e).__name__}: {e}"
+            return answer
+
+        run = handler.current_run
+        if run is not None and run.status != "completed":
+            answer.error = f"Run {run.status}: {run.last_error.message if run.last_error else 'no details'}"
+            return answer
+
+        answer.answer = text
+        answer.total_seconds = perf_counter() - start
+        if handler.first_token is not None:
+            answer.first_token_seconds = handler.first_token - start
+
+        answer.citations = get_citations(handler)
+        answer.usage = handler.usage
+
+        return answer
+
+    def run(self, questions: Iterable[Question]) -> Iterator[Answer]:
+        """Answer the questions, yielding each answer as soon as it completes.
+
+        At most ``concurrency`` questions are in flight, so a large question set doesn't queue every run
+        up front. If the consumer stops early, questions which haven't started are not asked.
+
+        Parameters
+        ----------
+        questions : Iterable[Question]
+            The questions to answer.
+
+        Yields
+        ------
+        Answer
+            The answers in order of completion.
+        """
+        questions = iter(questions)
+        self.threads.fill()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            pending = set()
+            try:
+                while True:
+                    for question in questions:
+                        pending.add(executor.submit(self.ask, question))
+                        if len(pending) >= self.concurrency:
+                            break
+
+                    if len(pending) == 0:
+                        return
+
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
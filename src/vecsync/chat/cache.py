@@ -0,0 +1,136 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable
+from contextlib import closing
+from pathlib import Path
+
+from appdirs import user_cache_dir
+
+# A recorded response is the list of raw text chunks, each with its citation markers mapped to file IDs
+Transcript = list[tuple[str, dict[str, str]]]
+
+
+class ResponseCache:
+    """Local cache of assistant responses.
+
+    Responses are keyed by the normalized prompt, the assistant instructions and a fingerprint of the
+    vector store contents, so a repeated question is answered without a run until the store changes.
+    Responses are stored as raw text with their citations so they render exactly like a streamed
+    response with the current formatter and file names.
+
+    Entries expire after ``ttl`` seconds and the least recently used entries are evicted once the cache
+    holds more than ``max_entries`` responses.
+
+    Parameters
+    ----------
+    path : Path | None
+        The path to the SQLite database. If None, the default location in the user cache directory is used.
+    ttl : float
+        The number of seconds a response stays valid.
+    max_entries : int
+        The maximum number of responses kept.
+    clock : Callable[[], float]
+        The clock used to timestamp entries.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        ttl: float = 7 * 24 * 60 * 60,
+        max_entries: int = 1000,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.file = Path(path) if path is not None else Path(user_cache_dir("vecsync")) / "responses.sqlite"
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+
+        with closing(self._connect()) as db, db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    transcript TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.file)
+
+    @staticmethod
+    def fingerprint(file_ids: Iterable[str]) -> str:
+        """Hash the IDs of the files in the vector store, ignoring order."""
+        return hashlib.sha256("\n".join(sorted(file_ids)).encode()).hexdigest()
+
+    @staticmethod
+    def key(prompt: str, instructions: str, fingerprint: str) -> str:
+        """Build the cache key for a prompt.
+
+        The prompt is normalized by collapsing whitespace and ignoring case, so trivially different
+        phrasings of the same question share an entry.
+
+        Parameters
+        ----------
+        prompt : str
+            The user prompt.
+        instructions : str
+            The assistant instructions.
+        fingerprint : str
+            The fingerprint of the vector store contents.
+
+        Returns
+        -------
+        str
+            The cache key.
+        """
+        normalized = " ".join(prompt.split()).casefold()
+        return hashlib.sha256("\0".join([normalized, instructions, fingerprint]).encode()).hexdigest()
+
+    def get(self, key: str) -> Transcript | None:
+        """Get a cached response, or None if it is missing or expired."""
+        now = self.clock()
+
+        with self._lock, closing(self._connect()) as db, db:
+            row = db.execute(
+                "SELECT transcript FROM responses WHERE key = ? AND created_at > ?", (key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                return None
+
+            db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+
+        return [(text, citations) for text, citations in json.loads(row[0])]
+
+    def put(self, key: str, transcript: Transcript):
+        """Cache a response, evicting expired and least recently used entries."""
+        now = self.clock()
+
+        with self._lock, closing(self._connect()) as db, db:
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, transcript, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(transcript), now, now),
+            )
+            db.execute("DELETE FROM responses WHERE created_at <= ?", (now - self.ttl,))
+            db.execute(
+                """
+                DELETE FROM responses WHERE key NOT IN (
+                    SELECT key FROM responses ORDER BY accessed_at DESC LIMIT ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock, closing(self._connect()) as db, db:
+            db.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as db:
+            return db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
@@ -0,0 +1,120 @@
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+# File citations are inserted by OpenAI as markers such as "【4:0†source】". Adjacent markers are matched as
+# one run so that repeated citations of the same file are collapsed.
+MARKER = re.compile(r"【[^】]*】")
+MARKER_RUN = re.compile(r"【[^】]*】(?:\s*【[^】]*】)*")
+
+
+class CitationResolver:
+    """Resolve cited file IDs to file names.
+
+    Names are held in an LRU cache seeded with the files known at connect time. A file synced after the
+    chat started is cited with an ID missing from the cache, so unknown IDs are fetched in the background
+    while the response is still streaming. IDs requested while a fetch is running are fetched together in
+    the next batch, which lists all files with a single lookup.
+
+    Parameters
+    ----------
+    files : dict[str, str] | None
+        The initially known file names keyed by file ID.
+    lookup : Callable[[], dict[str, str]] | None
+        Returns the names of all files keyed by file ID. If None, unknown IDs are never fetched.
+    max_size : int
+        The maximum number of file names kept in the cache.
+    timeout : float
+        The maximum number of seconds ``resolve`` waits on a pending fetch.
+    """
+
+    def __init__(
+        self,
+        files: dict[str, str] | None = None,
+        lookup: Callable[[], dict[str, str]] | None = None,
+        max_size: int = 4096,
+        timeout: float = 10.0,
+    ):
+        self.lookup = lookup
+        self.max_size = max_size
+        self.timeout = timeout
+        self._names: OrderedDict[str, str] = OrderedDict()
+        self._requested: set[str] = set()
+        self._attempted: set[str] = set()
+        self._future: Future | None = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+        for file_id, name in (files or {}).items():
+            self._store(file_id, name)
+
+    def _store(self, file_id: str, name: str):
+        self._names[file_id] = name
+        self._names.move_to_end(file_id)
+        while len(self._names) > self.max_size:
+            evicted, _ = self._names.popitem(last=False)
+            # An evicted name is fetched again when it is next cited
+            self._attempted.discard(evicted)
+
+    def prefetch(self, file_ids: Iterable[str]):
+        """Start fetching the names of any unknown file IDs without blocking."""
+        with self._lock:
+            missing = {f for f in file_ids if f not in self._names} - self._attempted
+            if len(missing) == 0 or self.lookup is None:
+                return
+
+            self._requested |= missing
+            if self._future is None:
+                self._future = self._executor.submit(self._fetch)
+
+    def _fetch(self):
+        while True:
+            with self._lock:
+                batch = self._requested
+                self._requested = set()
+                self._attempted |= batch
+                if len(batch) == 0:
+                    self._future = None
+                    return
+
+            try:
+                names = self.lookup()
+            except Exception:
+                # The IDs are fetched again when they are next cited, in case the error was transient
+                with self._lock:
+                    self._attempted -= batch
+                continue
+
+            with self._lock:
+                for file_id in batch & names.keys():
+                    self._store(file_id, names[file_id])
+
+    def resolve(self, file_ids: Iterable[str]) -> dict[str, str]:
+        """Get the names of the files, waiting on any pending fetch.
+
+        Parameters
+        ----------
+        file_ids : Iterable[str]
+            The IDs of the cited files.
+
+        Returns
+        -------
+        dict[str, str]
+            The file names keyed by file ID. Files which could not be found are named by their ID.
+        """
+        file_ids = list(file_ids)
+        self.prefetch(file_ids)
+
+        future = self._future
+        if future is not None:
+            wait([future], timeout=self.timeout)
+
+        with self._lock:
+            names = {}
+            for file_id in file_ids:
+                if file_id in self._names:
+                    self._names.move_to_end(file_id)
+                names[file_id] = self._names.get(file_id, file_id)
+            return names
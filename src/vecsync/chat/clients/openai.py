@@ -1,14 +1,41 @@
+import asyncio
+import json
+import re
+import threading
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from importlib import resources
 from queue import Empty, Queue
+from time import perf_counter
+from typing import TYPE_CHECKING
 
-from dotenv import load_dotenv
-from openai import AssistantEventHandler, OpenAI
+from openai import AssistantEventHandler, NotFoundError
 from termcolor import cprint
 
+from vecsync.chat.cache import ResponseCache, Transcript
+from vecsync.chat.citations import MARKER, MARKER_RUN, CitationResolver
 from vecsync.chat.clients.base import Assistant
+from vecsync.chat.compaction import SUMMARY_HEADER, ThreadPolicy, summarize
 from vecsync.chat.formatter import ConsoleFormatter, GradioFormatter
+from vecsync.chat.history import HistoryCache
+from vecsync.chat.usage import Budget, BudgetExceeded, Usage, UsageLedger, estimate_cost
+from vecsync.connection import ConnectionOptions, openai_client
 from vecsync.settings import SettingExists, SettingMissing, Settings
+from vecsync.store.metadata import FileMetadata, MetadataIndex
 from vecsync.store.openai import OpenAiVectorStore
+from vecsync.store.sharding import ShardingOptions
+
+if TYPE_CHECKING:
+    from vecsync.store.local import LocalVectorStore
+
+LOCAL_CONTEXT_PROMPT = (
+    "File search is unavailable. Answer from the numbered passages below, which were retrieved from the "
+    "user's documents for this question, and cite them by number in square brackets such as [1].\n\n"
+)
+
+
+class StreamCancelled(Exception):
+    """Raised inside the streaming thread to abort a run which was cancelled by the consumer."""
 
 
 # TODO: This class will likely be refactored into common class across other client types. However
@@ -18,24 +45,103 @@ class OpenAIHandler(AssistantEventHandler):
 
     This class is used to handle streaming events from the OpenAI API. Internally, it puts all streaming
     chunks into a Queue which allows for the streaming to be consumed in real time by other functions.
+    The producer always terminates the queue through ``finish``, either with a ``None`` sentinel or with
+    the exception that ended the run, so consumers block on the queue without polling and never hang.
 
     Parameters
     ----------
-    files : dict[str, str]
-        A dictionary of file IDs and their corresponding names. This is used to format the citations
-        in the response.
+    files : dict[str, str] | CitationResolver
+        The resolver used to name the cited files, or a dictionary of file IDs and their corresponding
+        names. This is used to format the references in the response.
     formatter : ConsoleFormatter | GradioFormatter
         The formatter to use for formatting the output of the response. This can be either a
         ConsoleFormatter or GradioFormatter.
+    metadata : dict[str, FileMetadata] | None
+        An optional dictionary of file IDs and their bibliographic metadata. When available, references
+        are rendered with title, authors and year instead of the file name.
     """
 
-    def __init__(self, files: dict[str, str], formatter: ConsoleFormatter | GradioFormatter):
+    def __init__(
+        self,
+        files: dict[str, str] | CitationResolver,
+        formatter: ConsoleFormatter | GradioFormatter,
+        metadata: dict[str, FileMetadata] | None = None,
+    ):
         super().__init__()
-        self.files = files
+        self.files = files if isinstance(files, CitationResolver) else CitationResolver(files)
+        self.metadata = metadata or {}
         self.queue = Queue()
         self.annotations = {}
-        self.active = True
+        self.transcript: Transcript = []
         self.formatter = formatter
+        self.cancelled = threading.Event()
+        self.finished = False
+        self.first_token: float | None = None
+        self.reported_usage: Usage | None = None
+        self._lock = threading.Lock()
+        self._loop = None
+        self._async_queue = None
+
+    def _put(self, item, final: bool = False):
+        with self._lock:
+            # Nothing may follow the end of the stream, e.g. chunks still arriving after a cancellation
+            if self.finished:
+                return
+            self.finished = final
+
+            if not final and self.first_token is None:
+                self.first_token = perf_counter()
+
+            if self._async_queue is not None:
+                self._loop.call_soon_threadsafe(self._async_queue.put_nowait, item)
+            else:
+                self.queue.put(item)
+
+    def finish(self, error: BaseException | None = None):
+        """Terminate the stream.
+
+        Only the first call has an effect, so the producer can unconditionally call this when it exits.
+
+        Parameters
+        ----------
+        error : BaseException | None
+            The exception which ended the run. It is raised to the consumer after all prior chunks.
+        """
+        self._put(error, final=True)
+
+    def cancel(self):
+        """Cancel the stream.
+
+        The consumer is released immediately and the streaming thread aborts the run on its next event.
+        """
+        self.cancelled.set()
+        self.finish()
+
+    def notice(self, text: str):
+        """Show a notice to the user ahead of the response."""
+        self._put(f"⚠️ {text}\n\n")
+
+    @property
+    def usage(self) -> Usage | None:
+        """The token usage of the run, available once it has finished."""
+        # Engines which don't stream Assistants runs report the usage directly
+        if self.reported_usage is not None:
+            return self.reported_usage
+
+        run = self.current_run
+        if run is None or getattr(run, "usage", None) is None:
+            return None
+
+        return Usage(
+            prompt_tokens=run.usage.prompt_tokens,
+            completion_tokens=run.usage.completion_tokens,
+            total_tokens=run.usage.total_tokens,
+            cost=estimate_cost(run.model, run.usage.prompt_tokens, run.usage.completion_tokens),
+        )
+
+    def on_event(self, event):
+        if self.cancelled.is_set():
+            raise StreamCancelled()
 
     def on_message_delta(self, delta, snapshot):
         # Handle the response chunk
@@ -50,49 +156,126 @@ class OpenAIHandler(AssistantEventHandler):
                             delta_annotations[annotation.text] = annotation.file_citation.file_id
 
                 text = content.text.value
+                self.transcript.append((text, dict(delta_annotations)))
+                text_chunks.append(self._render(text, delta_annotations))
+        self._put("".join(text_chunks))
+
+    def add_text(self, text: str, citations: dict[str, str] | None = None):
+        """Add a chunk of response text with its citation markers mapped to file IDs."""
+        citations = citations or {}
+        self.transcript.append((text, dict(citations)))
+        self._put(self._render(text, citations))
+
+    def _render(self, text: str, citations: dict[str, str]) -> str:
+        if len(citations) == 0:
+            return text
+
+        # Start naming files which were synced after connecting while the rest of the response streams
+        self.files.prefetch(citations.values())
+
+        def replace(run: re.Match) -> str:
+            # Adjacent markers citing the same file are collapsed into a single citation
+            parts = []
+            seen = set()
+            for marker in MARKER.findall(run.group()):
+                file_id = citations.get(marker)
+                if file_id is None:
+                    parts.append(marker)
+                elif file_id not in seen:
+                    seen.add(file_id)
+                    self.annotations.setdefault(file_id, len(self.annotations) + 1)
+                    parts.append(self.formatter.format_citation(self.annotations[file_id]))
+            return "".join(parts)
+
+        return MARKER_RUN.sub(replace, text)
+
+    def replay(self, transcript: Transcript):
+        """Render a recorded response as if it were being streamed.
 
-                if len(delta_annotations) > 0:
-                    for ref_id, file_id in delta_annotations.items():
-                        # TODO: If there are multiple references to the same file then it prints the id several
-                        # times such as "[1] [1] [1]". This should be fixed.
-                        self.annotations.setdefault(file_id, len(self.annotations) + 1)
-                        citation = self.formatter.format_citation(self.annotations[file_id])
-                        text = text.replace(ref_id, citation)
-
-                text_chunks.append(text)
-        self.queue.put("".join(text_chunks))
+        Parameters
+        ----------
+        transcript : Transcript
+            The raw text chunks of a previous response with their citations, as recorded in ``transcript``.
+        """
+        for text, citations in transcript:
+            self.transcript.append((text, citations))
+            self._put(self._render(text, citations))
+        self.on_message_done(message=None)
 
     def on_message_done(self, message):
         # Append citations at the end of the response
-        text = self.formatter.get_references(self.annotations, self.files)
+        files = self.files.resolve(self.annotations)
+        text = self.formatter.get_references(self.annotations, files, self.metadata)
         if len(text) > 0:
-            self.queue.put(text)
-        self.active = False
+            self._put(text)
 
-    def consume_queue(self, timeout: float = 1.0):
+    def consume_queue(self) -> Iterator[str]:
         """Consume chunks from the queue.
 
-        Parameters
-        ----------
-        timeout : float
-            The timeout seconds for the queue. This is used to prevent blocking if there are no chunks
-            available in the queue.
+        Blocks until each chunk arrives and stops at the end-of-stream sentinel. If the consumer stops
+        iterating early, the stream is cancelled.
 
         Yields
         ------
         str
-            The chunks of text from the queue. This will yield until the queue is empty or the
-            active flag is set to False.
+            The chunks of text from the queue.
+
+        Raises
+        ------
+        Exception
+            Any exception raised while streaming the response.
         """
+        try:
+            while True:
+                chunk = self.queue.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                yield chunk
+        finally:
+            if not self.finished:
+                self.cancel()
+
+    async def aconsume_queue(self) -> AsyncIterator[str]:
+        """Consume chunks from the queue in an asyncio event loop.
+
+        This is the async counterpart of ``consume_queue``. Chunks are handed to the event loop as soon as
+        they are produced, without blocking a worker thread for each read.
 
-        while self.active or not self.queue.empty():
-            try:
-                chunk = self.queue.get(timeout=timeout)
-            except Empty:
-                continue
-            if chunk is None:
-                break
-            yield chunk
+        Yields
+        ------
+        str
+            The chunks of text from the queue.
+
+        Raises
+        ------
+        Exception
+            Any exception raised while streaming the response.
+        """
+        async_queue = asyncio.Queue()
+
+        with self._lock:
+            # Move any chunks produced before the consumer attached, then route new chunks to the loop
+            while True:
+                try:
+                    async_queue.put_nowait(self.queue.get_nowait())
+                except Empty:
+                    break
+            self._loop = asyncio.get_running_loop()
+            self._async_queue = async_queue
+
+        try:
+            while True:
+                chunk = await async_queue.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                yield chunk
+        finally:
+            if not self.finished:
+                self.cancel()
 
 
 class OpenAIClient:
@@ -110,17 +293,56 @@ class OpenAIClient:
         This is used to store the thread ID for the current conversation.
     prompt_source : str | None
         The path to the prompt source file. If None, the default prompt will be used.
+    history_path : str | None
+        The path to the local conversation history cache. If None, the default cache location will be used.
+    response_cache : ResponseCache | None
+        An optional cache of responses. When given, repeated prompts against an unchanged vector store are
+        answered from the cache instead of creating a run.
+    usage_path : str | None
+        The path to the local token usage ledger. If None, the default ledger location will be used.
+    local_store : LocalVectorStore | None
+        An optional local vector store to search instead of the OpenAI vector store. Passages are
+        retrieved locally for each prompt and sent with the run, which then runs without file search.
+    local_results : int
+        The number of passages retrieved for each prompt from the local store, or from the OpenAI vector
+        store when a filter is given or its files are sharded.
+    filters : dict | None
+        An optional attribute filter, as returned by ``parse_filters``, restricting retrieval to matching
+        files. Assistant file search can't filter, so passages from matching files are retrieved with a
+        vector store search for each prompt and sent with the run, which then runs without file search.
     """
 
-    def __init__(self, store_name: str, settings_path: str | None = None, prompt_source: str | None = None):
-        load_dotenv(override=True)
-
-        self.client = OpenAI()
+    def __init__(
+        self,
+        store_name: str,
+        settings_path: str | None = None,
+        prompt_source: str | None = None,
+        history_path: str | None = None,
+        response_cache: ResponseCache | None = None,
+        usage_path: str | None = None,
+        local_store: "LocalVectorStore | None" = None,
+        local_results: int = 8,
+        filters: dict | None = None,
+    ):
         self.store_name = store_name
         self.assistant_name = f"vecsync-{store_name}"
         self.connected = False
+        self.thread_id = None
         self.settings_path = settings_path
+        self.settings = Settings(path=settings_path)
+        self.client = openai_client(ConnectionOptions.load(self.settings))
+        self.history = HistoryCache(path=history_path)
+        self.response_cache = response_cache
+        self.ledger = UsageLedger(path=usage_path)
+        self.local_store = local_store
+        self.vector_store = None
+        self._contents: str | None = None
+        self.local_results = local_results
+        self.filters = filters
         self.prompt = self._get_prompt(prompt_source)
+        self._rotation: Future | None = None
+        self._rotation_from: str | None = None
+        self._rotator = ThreadPoolExecutor(max_workers=1)
 
     def _get_prompt(self, prompt_source: str | None = None) -> str:
         """Get the prompt from the prompt source.
@@ -158,17 +380,43 @@ class OpenAIClient:
         4. Thread: The thread is the conversation history which is used to store messages between the
            user and assistant. Threads are created whenever a new assistant is created, the user
            deletes their settings file, or the user runs the application on a different machine.
-        """
-        # Connect to the OpenAI vector store
-        self.vector_store = OpenAiVectorStore(self.store_name)
-        self.vector_store.get()
-
-        # Load the assistant and thread
-        self.assistant_id = self._get_assistant_id()
-        self.thread_id = self._get_thread_id()
 
-        # Load the files in the vector store
-        self.files = {f.id: f.name for f in self.vector_store.get_files()}
+        The four entities are resolved concurrently. The vector store and assistant IDs are cached in
+        the settings file, so a warm start validates each with a single lookup instead of listing the
+        account. With a local store, the files are read from the local index instead.
+        """
+        vector_store = self.local_store or OpenAiVectorStore(
+            self.store_name, client=self.client, shards=ShardingOptions.load(self.settings).shards
+        )
+        self.vector_store = vector_store
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            if self.local_store is not None:
+                store = executor.submit(vector_store.get)
+            else:
+                store = executor.submit(self._get_vector_store, vector_store)
+            files = executor.submit(vector_store.get_file_names)
+            thread = executor.submit(self._get_thread_id, create=False)
+            assistant = executor.submit(self._get_assistant_id, store)
+
+            self.assistant_id = assistant.result()
+            self.thread_id = thread.result()
+            self.files = files.result()
+            store = store.result()
+
+        # The IDs are cached in one write once both lookups finish, since each write replaces the entry
+        if self.local_store is None:
+            self._set_cached_ids(vector_store_id=store.id, assistant_id=self.assistant_id)
+
+        # The thread is created last since a newly created assistant discards the previous thread
+        if self.thread_id is None or isinstance(self.settings["openai_thread_id"], SettingMissing):
+            self.thread_id = self._create_thread()
+
+        self.citations = CitationResolver(self.files, lookup=vector_store.get_file_names)
+        self._contents = None
+
+        # Load the bibliographic metadata for the files, if any
+        self.metadata = MetadataIndex().load()
         self.connected = True
 
     def disconnect(self):
@@ -176,43 +424,95 @@ class OpenAIClient:
         self.assistant_id = None
         self.thread_id = None
         self.files = None
+        self.citations = None
+        self.metadata = None
         self.vector_store = None
+        self._contents = None
         self.connected = False
 
-    def _get_thread_id(self) -> str:
+    def _get_thread_id(self, create: bool = True) -> str | None:
         """Locates or creates the thread ID
 
         Thread IDs are stored locally in the user settings file. The ID is loaded from settings and
-        is created if it doesn't exist.
+        is created if it doesn't exist or was deleted remotely.
+
+        Parameters
+        ----------
+        create : bool
+            Whether to create a new thread if no valid thread is found.
 
         Returns
         -------
-        str
-            The thread ID for the current conversation.
+        str | None
+            The thread ID for the current conversation, or None if no thread was found and create is False.
         """
-        settings = Settings(path=self.settings_path)
-
         # TODO: Ideally we would grab the thread ID from OpenAI but there doesn't seem to be
         # a way to do that. So we are storing it in the settings file for now.
-        match settings["openai_thread_id"]:
+        match self.settings["openai_thread_id"]:
             case SettingMissing():
-                return self._create_thread()
+                return self._create_thread() if create else None
             case SettingExists() as x:
+                try:
+                    self.client.beta.threads.retrieve(x.value)
+                except NotFoundError:
+                    cprint(f"⚠️ Thread {x.value} no longer exists.", "yellow")
+                    return self._create_thread() if create else None
+
                 print(f"✅ Thread found: {x.value}")
                 return x.value
 
-    def _get_assistant_id(self) -> str:
+    def _get_cached_id(self, key: str) -> str | None:
+        match self.settings["openai_resources"]:
+            case SettingExists() as x:
+                return x.value.get(self.store_name, {}).get(key)
+            case SettingMissing():
+                return None
+
+    def _set_cached_ids(self, **ids: str | None):
+        """Cache resource IDs of the store, removing those set to None."""
+        with self.settings.batch():
+            match self.settings["openai_resources"]:
+                case SettingExists() as x:
+                    resources = x.value
+                case SettingMissing():
+                    resources = {}
+
+            cached = {k: v for k, v in resources.get(self.store_name, {}).items() if k not in ids}
+            cached.update({k: v for k, v in ids.items() if v is not None})
+            self.settings["openai_resources"] = {**resources, self.store_name: cached}
+
+    def _get_vector_store(self, vector_store: OpenAiVectorStore):
+        """Locates the vector store, validating the cached ID if there is one."""
+        return vector_store.get(store_id=self._get_cached_id("vector_store_id"))
+
+    def _get_assistant_id(self, store: Future | None = None) -> str:
         """Locates or creates the assistant ID
 
-        Assistant IDs are stored in the OpenAI account. The ID is loaded from the account and is created
-        if it doesn't exist. There should only be one assistant per account at any point in time. This step
-        performs a cleanup check if multiple assistants are found.
+        Assistant IDs are stored in the OpenAI account. A cached ID is validated with a single lookup.
+        Otherwise the ID is loaded from the account and is created if it doesn't exist. There should only
+        be one assistant per account at any point in time. This step performs a cleanup check if multiple
+        assistants are found.
+
+        Parameters
+        ----------
+        store : Future | None
+            A pending vector store lookup which must complete before an assistant can be created.
 
         Returns
         -------
         str
             The assistant ID for the current conversation.
         """
+        cached_id = self._get_cached_id("assistant_id")
+        if cached_id is not None:
+            try:
+                assistant = self.client.beta.assistants.retrieve(cached_id)
+                print(f"✅ Assistant found: {assistant.id}")
+                return assistant.id
+            except NotFoundError:
+                # The stale ID is replaced in the cache once connect() resolves the assistant
+                cprint(f"⚠️ Assistant {cached_id} no longer exists.", "yellow")
+
         # Check if the assistant already exists
         existing_assistants = self.list_assistants()
         count_assistants = len(existing_assistants)
@@ -231,15 +531,18 @@ class OpenAIClient:
         if count_assistants > 0:
             id = existing_assistants[0].id
             print(f"✅ Assistant found remotely: {id}")
-            return id
         else:
-            return self._create_assistant()
+            if store is not None:
+                store.result()
+            id = self._create_assistant()
+
+        return id
 
     def _create_assistant(self) -> str:
         """Creates a new assistant in the OpenAI account.
 
         The assistant is created with the name "vecsync-{store_name}" and is attached to the
-        user's vector store.
+        user's vector store. With a local store there is no remote vector store to attach.
 
         Returns
         -------
@@ -253,19 +556,22 @@ class OpenAIClient:
             tools=[{"type": "file_search"}],
             tool_resources={
                 "file_search": {
-                    "vector_store_ids": [self.vector_store.store.id],
+                    "vector_store_ids": [self.vector_store.store.id] if self.local_store is None else [],
                 }
             },
             model="gpt-4o-mini",
         )
 
-        settings = Settings(path=self.settings_path)
-        del settings["openai_thread_id"]
+        del self.settings["openai_thread_id"]
 
         print(f"🖥️ Assistant created: {assistant.name}")
         print(f"🔗 Assistant URL: https://platform.openai.com/assistants/{assistant.id}")
         return assistant.id
 
+    def new_thread(self) -> str:
+        """Create a new, empty conversation thread without persisting it."""
+        return self.client.beta.threads.create().id
+
     def _create_thread(self) -> str:
         """Creates a new thread in the OpenAI account.
 
@@ -280,40 +586,43 @@ class OpenAIClient:
 
         thread = self.client.beta.threads.create()
         print(f"💬 Conversation started: {thread.id}")
-        settings = Settings(path=self.settings_path)
-        settings["openai_thread_id"] = thread.id
+        self.settings["openai_thread_id"] = thread.id
         return thread.id
 
-    def load_history(self) -> list[dict[str, str]]:
-        """Fetch all prior messages in this thread
+    def load_history(
+        self, thread_id: str | None = None, limit: int | None = None, skip: int = 0
+    ) -> list[dict[str, str]]:
+        """Fetch prior messages in this thread
 
-        This method loads the conversation history from the OpenAI API. The messages are sorted
-        by their creation time.
+        Messages are served from the local history cache after fetching any messages newer than the
+        cache from the OpenAI API.
+
+        Parameters
+        ----------
+        thread_id : str | None
+            The ID of the thread to load. If None, the client's thread is used.
+        limit : int | None
+            The maximum number of messages to return, counting back from the newest. If None, all
+            messages are returned.
+        skip : int
+            The number of newest messages to skip. Used to page back through older messages.
 
         Returns
         -------
         list[dict[str, str]]
-            A list of dictionaries containing the role and content of each message.
-            The role is either "user" or "assistant".
+            A list of dictionaries containing the role and content of each message in chronological
+            order. The role is either "user" or "assistant".
         """
 
         if not self.connected:
             self.connect()
 
-        history = []
-        if self.thread_id is not None:
-            resp = self.client.beta.threads.messages.list(thread_id=self.thread_id)
-            resp_data = sorted(resp.data, key=lambda x: x.created_at)
-
-            for msg in resp_data:
-                content = ""
-                for c in msg.content:
-                    if c.type == "text":
-                        content += c.text.value
-
-                history.append(dict(role=msg.role, content=content))
+        thread_id = thread_id or self.thread_id
+        if thread_id is None:
+            return []
 
-        return history
+        self.history.sync(self.client, thread_id)
+        return self.history.read(thread_id, limit=limit, skip=skip)
 
     def send_message(self, prompt: str):
         """Send a message to the OpenAI thread.
@@ -329,25 +638,233 @@ class OpenAIClient:
 
         return self.client.beta.threads.messages.create(thread_id=self.thread_id, role="user", content=prompt)
 
-    def stream_response(self, thread_id: str, assistant_id: str, handler):
+    def _cache_key(self, prompt: str | None) -> str | None:
+        if self.response_cache is None or prompt is None or not self.connected:
+            return None
+
+        # The files attached to the store are listed once per connection, and only when the cache is used
+        if self._contents is None:
+            self._contents = ResponseCache.fingerprint(
+                [self.vector_store.store.id, *self.vector_store.get_attached_ids()]
+            )
+
+        # Answers retrieved from a subset of the files are cached separately
+        scope = [json.dumps(self.filters, sort_keys=True)] if self.filters is not None else []
+        return ResponseCache.key(prompt, self.prompt, ResponseCache.fingerprint([self._contents, *scope]))
+
+    def _cached_response(self, prompt: str | None) -> tuple[str | None, Transcript | None]:
+        """Get the cache key and cached response for a prompt.
+
+        The cache is optional, so if it can't be read the prompt is answered without it.
+        """
+        try:
+            key = self._cache_key(prompt)
+            return key, self.response_cache.get(key) if key is not None else None
+        except Exception as e:
+            cprint(f"⚠️ Failed to read the response cache: {e}", "yellow")
+            return None, None
+
+    def _cache_response(self, key: str, transcript: Transcript):
+        """Add a completed response to the cache, which is optional, so failures are only reported."""
+        try:
+            self.response_cache.put(key, transcript)
+        except Exception as e:
+            cprint(f"⚠️ Failed to write the response cache: {e}", "yellow")
+
+    def _check_budget(self, handler: OpenAIHandler) -> bool:
+        """Check the daily token budget before a run, returning False if the run must not start."""
+        budget = Budget.load(self.settings)
+        if budget is None:
+            return True
+
+        used = self.ledger.total().total_tokens
+        if used < budget.daily_tokens:
+            return True
+
+        message = f"Daily token budget of {budget.daily_tokens:,} tokens is used up ({used:,} tokens today)."
+        if budget.action == "refuse":
+            handler.finish(BudgetExceeded(message))
+            return False
+
+        handler.notice(message)
+        return True
+
+    def usage_report(self, handler: OpenAIHandler) -> str | None:
+        """Describe the usage of a finished run and of the day so far, or None if the run reported none."""
+        usage = handler.usage
+        if usage is None:
+            return None
+
+        today = f"{self.ledger.total().total_tokens:,}"
+        budget = Budget.load(self.settings)
+        if budget is not None:
+            today += f" of {budget.daily_tokens:,}"
+
+        return f"{usage.describe()} | Today: {today} tokens"
+
+    def stream_response(
+        self,
+        thread_id: str,
+        assistant_id: str,
+        handler: OpenAIHandler,
+        prompt: str | None = None,
+        session: str | None = None,
+    ):
         """Generate a thread run and stream the response.
 
+        If a prompt is given, it is added to the thread as part of the run creation request. This saves the
+        separate message creation round trip before the first token arrives.
+
+        With a response cache, a cached response is replayed through the handler instead of creating a
+        run, and the exchange is then added to the thread so it remains part of the conversation. Completed
+        responses are added to the cache.
+
+        Runs are truncated according to the thread policy in the settings. Once the conversation thread
+        grows past the policy limits it is rotated in the background, and later calls for the old thread
+        are answered in its replacement.
+
+        With a local store, passages for the prompt are retrieved locally and sent as additional
+        instructions, and the run's files are listed as references.
+
+        The token usage of every run is recorded in the usage ledger. Once the daily token budget in the
+        settings is used up, runs are refused with ``BudgetExceeded`` or preceded by a warning.
+
+        The handler is always finished when this returns: with the sentinel on success or cancellation
+        and with the exception if the run failed, so the consumer never waits on a dead producer. A
+        cancelled run is also cancelled remotely so the thread can accept new messages.
+
         Parameters
         ----------
         thread_id : str
             The ID of the thread to stream the response from.
         assistant_id : str
             The ID of the assistant to stream the response from.
-        handler : AssistantEventHandler
+        handler : OpenAIHandler
             The event handler to use for processing the response.
+        prompt : str | None
+            The user message to submit with the run. If None, the run responds to the existing thread.
+        session : str | None
+            The chat session the run belongs to, recorded in the usage ledger.
+        """
+
+        thread_id = self._follow_rotation(thread_id)
+        key, transcript = self._cached_response(prompt)
+
+        if transcript is not None:
+            handler.replay(transcript)
+            handler.finish()
+            self._add_exchange(thread_id, prompt, transcript)
+            return
+
+        if not self._check_budget(handler):
+            return
+
+        additional_messages = [{"role": "user", "content": prompt}] if prompt is not None else None
+        truncation = ThreadPolicy.load(self.settings).truncation_strategy()
+        kwargs = {"truncation_strategy": truncation} if truncation is not None else {}
+
+        try:
+            # A failed search ends the stream like a failed run
+            if (self.local_store is not None or self.filters is not None or self.sharded) and prompt is not None:
+                kwargs.update(self._retrieve_context(prompt, handler))
+
+            with self.client.beta.threads.runs.stream(
+                thread_id=thread_id,
+                assistant_id=assistant_id,
+                additional_messages=additional_messages,
+                event_handler=handler,
+                **kwargs,
+            ) as stream:
+                stream.until_done()
+        except StreamCancelled:
+            if handler.current_run is not None:
+                self.client.beta.threads.runs.cancel(run_id=handler.current_run.id, thread_id=thread_id)
+        except Exception as e:
+            handler.finish(e)
+        else:
+            if key is not None and not handler.cancelled.is_set():
+                self._cache_response(key, handler.transcript)
+            if thread_id == self.thread_id:
+                self._track_turn(thread_id, handler)
+        finally:
+            # Usage is recorded before the stream ends so it is included in the report for this run
+            if (usage := handler.usage) is not None:
+                run = handler.current_run
+                self.ledger.record(usage, thread_id, session=session, run_id=run.id, model=run.model)
+            handler.finish()
+
+    @property
+    def sharded(self) -> bool:
+        """Whether the files are spread across several vector stores, which are searched by the client."""
+        return self.local_store is None and self.vector_store is not None and len(self.vector_store.shards) > 1
+
+    def _retrieve_context(self, prompt: str, handler: OpenAIHandler) -> dict:
+        """Retrieve passages from the vector store and build the run arguments which answer from them."""
+        passages = []
+        for result in self.vector_store.search(prompt, max_results=self.local_results, filters=self.filters):
+            citation_id = handler.annotations.setdefault(result.file_id, len(handler.annotations) + 1)
+            passages.append(f"[{citation_id}] {result.text}")
+
+        # The assistant's file search tool can't be filtered, use the local store or search several shards,
+        # so it is disabled for the run
+        return {"tools": [], "additional_instructions": LOCAL_CONTEXT_PROMPT + "\n\n".join(passages)}
+
+    def _follow_rotation(self, thread_id: str) -> str:
+        """Get the thread which replaced the given thread, if it is being rotated."""
+        rotation = self._rotation
+        if rotation is None or thread_id != self._rotation_from:
+            return thread_id
+
+        try:
+            return rotation.result()
+        except Exception as e:
+            cprint(f"⚠️ Failed to rotate thread {thread_id}: {e}", "yellow")
+            return thread_id
+
+    def _track_turn(self, thread_id: str, handler: OpenAIHandler):
+        """Count a turn in the conversation thread and start rotating it if it grew past the policy limits."""
+        with self.settings.batch():
+            match self.settings["openai_thread_turns"]:
+                case SettingExists(value={"thread_id": tracked, "turns": turns}) if tracked == thread_id:
+                    turns += 1
+                case _:
+                    turns = 1
+            self.settings["openai_thread_turns"] = {"thread_id": thread_id, "turns": turns}
+
+        usage = handler.usage
+        policy = ThreadPolicy.load(self.settings)
+        if self._rotation_from != thread_id and policy.should_rotate(turns, usage.prompt_tokens if usage else None):
+            self._rotation_from = thread_id
+            self._rotation = self._rotator.submit(self._rotate_thread, thread_id)
+
+    def _rotate_thread(self, thread_id: str) -> str:
+        """Replace the conversation thread with a new thread which starts from a summary of the old one.
+
+        Parameters
+        ----------
+        thread_id : str
+            The ID of the thread to retire.
+
+        Returns
+        -------
+        str
+            The ID of the new thread.
         """
+        summary = summarize(self.client, self.load_history(thread_id))
+        thread = self.client.beta.threads.create(messages=[{"role": "assistant", "content": SUMMARY_HEADER + summary}])
+
+        with self.settings.batch():
+            self.settings["openai_thread_id"] = thread.id
+            self.settings["openai_thread_turns"] = {"thread_id": thread.id, "turns": 0}
+
+        self.thread_id = thread.id
+        return thread.id
 
-        with self.client.beta.threads.runs.stream(
-            thread_id=thread_id,
-            assistant_id=assistant_id,
-            event_handler=handler,
-        ) as stream:
-            stream.until_done()
+    def _add_exchange(self, thread_id: str, prompt: str, transcript: Transcript):
+        """Add a prompt and its cached response to the thread without a run."""
+        messages = self.client.beta.threads.messages
+        messages.create(thread_id=thread_id, role="user", content=prompt)
+        messages.create(thread_id=thread_id, role="assistant", content="".join(text for text, _ in transcript))
 
     def list_assistants(self) -> list[Assistant]:
         """List all vecsync assistants in the OpenAI account.
@@ -374,4 +891,6 @@ class OpenAIClient:
             assistant_id (str): The ID of the assistant to delete.
         """
         self.client.beta.assistants.delete(assistant_id)
+        if self._get_cached_id("assistant_id") == assistant_id:
+            self._set_cached_ids(assistant_id=None)
         self.disconnect()
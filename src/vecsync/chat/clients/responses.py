@@ -0,0 +1,277 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from vecsync.chat.cache import Transcript
+from vecsync.chat.citations import MARKER, CitationResolver
+from vecsync.chat.clients.openai import OpenAIClient, OpenAIHandler
+from vecsync.chat.usage import Usage, estimate_cost
+from vecsync.settings import SettingExists
+from vecsync.store.metadata import MetadataIndex
+from vecsync.store.openai import OpenAiVectorStore
+from vecsync.store.sharding import ShardingOptions
+
+
+class ResponseFailed(Exception):
+    """Raised when a streamed response ends with an error."""
+
+
+def _warm_up():
+    # The SDK builds its response event models on first use, which takes about a second and would
+    # otherwise delay the first token of the first turn. This is best effort since it uses SDK internals.
+    try:
+        from openai._models import construct_type
+        from openai.types.responses import ResponseStreamEvent
+
+        construct_type(type_=ResponseStreamEvent, value={"type": "response.output_text.delta", "delta": ""})
+    except Exception:
+        pass
+
+
+class ResponsesClient(OpenAIClient):
+    """OpenAI client which answers with the Responses API instead of assistant runs.
+
+    Each turn is a single streamed request with the ``file_search`` tool pointed at the vector store. No
+    assistant or thread is needed, so connecting only resolves the vector store and its files. A
+    conversation is a chain of responses: every turn passes the ID of the previous response and OpenAI
+    supplies the earlier turns as context, truncating the oldest once the context window is full.
+
+    Conversations are identified by a local ID in place of a thread ID, so the chat interfaces, session
+    pools and response cache work unchanged. The persisted conversation and its latest response ID are
+    stored in the settings file, and messages are recorded in the local history cache since there is no
+    thread to read them back from.
+
+    Takes the same parameters as ``OpenAIClient``. Filters are applied by the ``file_search`` tool itself.
+    Sharded files are searched by the client, which sends the best passages of every shard with the turn.
+    """
+
+    model = "gpt-4o-mini"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._previous: dict[str, str] = {}
+        self._previous_lock = threading.Lock()
+
+    def connect(self):
+        """Connect to the OpenAI API and load the vector store and conversation.
+
+        The vector store and the file names are resolved concurrently, while the SDK's response event
+        models are prepared in the background. The conversation is read from the settings file without a
+        request.
+        """
+        vector_store = self.local_store or OpenAiVectorStore(
+            self.store_name, client=self.client, shards=ShardingOptions.load(self.settings).shards
+        )
+        self.vector_store = vector_store
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            executor.submit(_warm_up)
+            if self.local_store is not None:
+                store = executor.submit(vector_store.get)
+            else:
+                store = executor.submit(self._get_vector_store, vector_store)
+            files = executor.submit(vector_store.get_file_names)
+
+            self.files = files.result()
+            store = store.result()
+
+        if self.local_store is None:
+            self._set_cached_ids(vector_store_id=store.id)
+
+        self.assistant_id = None
+        self.thread_id = self._get_conversation()
+        self.citations = CitationResolver(self.files, lookup=vector_store.get_file_names)
+        self._contents = None
+        self.metadata = MetadataIndex().load()
+        self.connected = True
+
+    def _get_conversation(self) -> str:
+        match self.settings["responses_conversation"]:
+            case SettingExists(value={"id": conversation_id, "previous_response_id": previous}):
+                if previous is not None:
+                    with self._previous_lock:
+                        self._previous[conversation_id] = previous
+                print(f"✅ Conversation found: {conversation_id}")
+                return conversation_id
+            case _:
+                conversation_id = self.new_thread()
+                self.settings["responses_conversation"] = {"id": conversation_id, "previous_response_id": None}
+                print(f"💬 Conversation started: {conversation_id}")
+                return conversation_id
+
+    def new_thread(self) -> str:
+        """Start a new conversation. No request is needed until its first turn."""
+        return f"conv_{uuid.uuid4().hex}"
+
+    def load_history(
+        self, thread_id: str | None = None, limit: int | None = None, skip: int = 0
+    ) -> list[dict[str, str]]:
+        """Read prior messages in the conversation from the local history cache.
+
+        Parameters
+        ----------
+        thread_id : str | None
+            The ID of the conversation to load. If None, the client's conversation is used.
+        limit : int | None
+            The maximum number of messages to return, counting back from the newest. If None, all
+            messages are returned.
+        skip : int
+            The number of newest messages to skip.
+
+        Returns
+        -------
+        list[dict[str, str]]
+            The role and content of each message in chronological order.
+        """
+        if not self.connected:
+            self.connect()
+
+        thread_id = thread_id or self.thread_id
+        if thread_id is None:
+            return []
+
+        return self.history.read(thread_id, limit=limit, skip=skip)
+
+    def stream_response(
+        self,
+        thread_id: str,
+        assistant_id: str | None,
+        handler: OpenAIHandler,
+        prompt: str | None = None,
+        session: str | None = None,
+    ):
+        """Stream a response to the prompt in a conversation.
+
+        The response is chained to the conversation's previous response and streamed through the handler.
+        File citations are rendered with the handler's formatter, and the cited files are listed as
+        references once the response completes. As with ``OpenAIClient.stream_response``, the response
+        cache, local store and daily token budget are applied, usage is recorded in the ledger and the
+        handler is always finished when this returns.
+
+        Parameters
+        ----------
+        thread_id : str
+            The ID of the conversation.
+        assistant_id : str | None
+            Unused, accepted so the chat interfaces can call either client.
+        handler : OpenAIHandler
+            The event handler to use for processing the response.
+        prompt : str | None
+            The user message. If None, nothing is sent.
+        session : str | None
+            The chat session the response belongs to, recorded in the usage ledger.
+        """
+        if prompt is None:
+            handler.finish()
+            return
+
+        key, transcript = self._cached_response(prompt)
+
+        if transcript is not None:
+            handler.replay(transcript)
+            handler.finish()
+            self._add_exchange(thread_id, prompt, transcript)
+            return
+
+        if not self._check_budget(handler):
+            return
+
+        with self._previous_lock:
+            previous = self._previous.get(thread_id)
+
+        kwargs = {"previous_response_id": previous} if previous is not None else {}
+        instructions = self.prompt
+
+        response = None
+        try:
+            # A failed search ends the stream like a failed response
+            if self.local_store is not None or self.sharded:
+                context = self._retrieve_context(prompt, handler)
+                instructions += "\n\n" + context["additional_instructions"]
+            else:
+                tool = {"type": "file_search", "vector_store_ids": [self.vector_store.store.id]}
+                if self.filters is not None:
+                    tool["filters"] = self.filters
+                kwargs["tools"] = [tool]
+
+            stream = self.client.responses.create(
+                model=self.model,
+                instructions=instructions,
+                input=prompt,
+                truncation="auto",
+                stream=True,
+                **kwargs,
+            )
+            with stream:
+                response = self._consume(stream, handler)
+        except Exception as e:
+            handler.finish(e)
+        else:
+            if response is not None:
+                handler.on_message_done(message=None)
+                self._record_turn(thread_id, prompt, response.id, handler.transcript)
+                if key is not None:
+                    self._cache_response(key, handler.transcript)
+        finally:
+            if response is not None and (usage := handler.usage) is not None:
+                self.ledger.record(usage, thread_id, session=session, run_id=response.id, model=response.model)
+            handler.finish()
+
+    def _consume(self, stream, handler: OpenAIHandler):
+        """Feed the streamed events to the handler, returning the completed response or None if cancelled."""
+        last_cited = None
+
+        for event in stream:
+            if handler.cancelled.is_set():
+                # Closing the stream stops generation, there is no run to cancel
+                return None
+
+            match event.type:
+                case "response.output_text.delta":
+                    last_cited = None
+                    handler.add_text(event.delta)
+                case "response.output_text.annotation.added":
+                    annotation = event.annotation if isinstance(event.annotation, dict) else vars(event.annotation)
+                    file_id = annotation.get("file_id")
+                    # Consecutive citations of the same file are shown once
+                    if annotation.get("type") == "file_citation" and file_id != last_cited:
+                        last_cited = file_id
+                        marker = f"【{event.annotation_index}†{file_id}】"
+                        handler.add_text(marker, {marker: file_id})
+                case "response.completed":
+                    response = event.response
+                    handler.reported_usage = Usage(
+                        prompt_tokens=response.usage.input_tokens,
+                        completion_tokens=response.usage.output_tokens,
+                        total_tokens=response.usage.total_tokens,
+                        cost=estimate_cost(response.model, response.usage.input_tokens, response.usage.output_tokens),
+                    )
+                    return response
+                case "response.failed" | "response.incomplete":
+                    error = getattr(event.response, "error", None) or getattr(
+                        event.response, "incomplete_details", None
+                    )
+                    raise ResponseFailed(f"Response {event.response.status}: {error}")
+                case "error":
+                    raise ResponseFailed(event.message)
+
+        return None
+
+    def _record_turn(self, thread_id: str, prompt: str, response_id: str, transcript: Transcript):
+        with self._previous_lock:
+            self._previous[thread_id] = response_id
+
+        if thread_id == self.thread_id:
+            self.settings["responses_conversation"] = {"id": thread_id, "previous_response_id": response_id}
+
+        text = MARKER.sub("", "".join(text for text, _ in transcript))
+        self.history.append(thread_id, [(f"{response_id}_prompt", "user", prompt), (response_id, "assistant", text)])
+
+    def _add_exchange(self, thread_id: str, prompt: str, transcript: Transcript):
+        """Record a cached exchange in the local history.
+
+        The exchange is not part of the response chain, so later turns are answered without it.
+        """
+        text = MARKER.sub("", "".join(text for text, _ in transcript))
+        exchange_id = uuid.uuid4().hex
+        self.history.append(thread_id, [(f"{exchange_id}_prompt", "user", prompt), (exchange_id, "assistant", text)])
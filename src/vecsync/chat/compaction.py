@@ -0,0 +1,97 @@
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+from vecsync.settings import SettingExists, Settings
+
+if TYPE_CHECKING:
+    # Only needed for annotations, so `vs settings` doesn't import openai
+    from openai import OpenAI
+
+SUMMARY_MODEL = "gpt-4o-mini"
+
+SUMMARY_PROMPT = (
+    "Summarize the conversation between a user and a research assistant so it can be continued in a new "
+    "conversation. Keep the questions asked, the key findings and the documents they came from, and any "
+    "preferences the user stated. Be concise and write in the third person."
+)
+
+SUMMARY_HEADER = "Summary of our earlier conversation:\n\n"
+
+
+class ThreadPolicy(BaseModel):
+    """Limits on the conversation context sent with each run, stored in the settings file.
+
+    Every run sends the thread's conversation as context, so a thread which is reused forever makes
+    each run slower and more expensive than the last. Runs can be truncated to the most recent messages,
+    and the conversation thread is rotated once it grows past a number of turns or context tokens. On
+    rotation the earlier conversation is carried into the new thread as a short summary, which costs a
+    completion, so threads are only rotated once a limit is set.
+
+    Parameters
+    ----------
+    max_turns : int | None
+        Rotate the thread after this many questions. If None, the number of turns is not limited.
+    max_context_tokens : int | None
+        Rotate the thread once a run's prompt exceeds this many tokens. The prompt includes the chunks found
+        by file search in every step of the run. If None, the size is not limited.
+    last_messages : int | None
+        Only send this many of the most recent messages with each run. If None, OpenAI truncates
+        automatically to fit the model's context window.
+    """
+
+    max_turns: int | None = None
+    max_context_tokens: int | None = None
+    last_messages: int | None = None
+
+    @classmethod
+    def load(cls, settings: Settings) -> "ThreadPolicy":
+        match settings["thread_policy"]:
+            case SettingExists() as x:
+                return cls(**x.value)
+            case _:
+                return cls()
+
+    def save(self, settings: Settings):
+        settings["thread_policy"] = self.model_dump()
+
+    def truncation_strategy(self) -> dict | None:
+        if self.last_messages is None:
+            return None
+        return {"type": "last_messages", "last_messages": self.last_messages}
+
+    def should_rotate(self, turns: int, prompt_tokens: int | None) -> bool:
+        if self.max_turns is not None and turns >= self.max_turns:
+            return True
+        if self.max_context_tokens is not None and prompt_tokens is not None:
+            return prompt_tokens > self.max_context_tokens
+        return False
+
+
+def summarize(client: "OpenAI", messages: list[dict[str, str]]) -> str:
+    """Summarize a conversation.
+
+    The conversation is read from the local history cache and summarized with a single completion, so
+    nothing is added to the thread being retired.
+
+    Parameters
+    ----------
+    client : OpenAI
+        The OpenAI API client.
+    messages : list[dict[str, str]]
+        The conversation in chronological order with the role and content of each message.
+
+    Returns
+    -------
+    str
+        The summary.
+    """
+    transcript = "\n\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    response = client.chat.completions.create(
+        model=SUMMARY_MODEL,
+        messages=[
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": transcript},
+        ],
+    )
+    return response.choices[0].message.content
@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 
 from termcolor import colored
 
+from vecsync.store.metadata import FileMetadata
+
 
 class BaseFormatter(ABC):
     @abstractmethod
@@ -9,20 +11,27 @@ class BaseFormatter(ABC):
         raise NotImplementedError("Subclasses must implement this method")
 
     @abstractmethod
-    def format_reference(self, citation_id: str, file_name: str) -> str:
+    def format_reference(self, citation_id: str, file_name: str, metadata: FileMetadata | None = None) -> str:
         raise NotImplementedError("Subclasses must implement this method")
 
-    def get_references(self, annotations: dict[str, str], files: dict[str, str]) -> str:
+    def get_references(
+        self,
+        annotations: dict[str, str],
+        files: dict[str, str],
+        metadata: dict[str, FileMetadata] | None = None,
+    ) -> str:
         if len(annotations) == 0:
             return ""
 
+        metadata = metadata or {}
+
         text_chunks = []
         text_chunks.append("\n")
         text_chunks.append("\nReferences")
         text_chunks.append("\n----------\n")
 
         for file_id, citation_id in annotations.items():
-            text_chunks.append(self.format_reference(citation_id, files[file_id]))
+            text_chunks.append(self.format_reference(citation_id, files.get(file_id, file_id), metadata.get(file_id)))
 
         return "".join(text_chunks)
 
@@ -31,7 +40,9 @@ class ConsoleFormatter(BaseFormatter):
     def format_citation(self, citation_id: str) -> str:
         return colored(f"[{citation_id}]", "yellow")
 
-    def format_reference(self, citation_id: str, file_name: str) -> str:
+    def format_reference(self, citation_id: str, file_name: str, metadata: FileMetadata | None = None) -> str:
+        if metadata is not None:
+            file_name = metadata.describe(file_name)
         return colored(f"\n[{citation_id}] {file_name}", "yellow")
 
 
@@ -39,5 +50,30 @@ class GradioFormatter(BaseFormatter):
     def format_citation(self, citation_id: str) -> str:
         return f"<strong>[{citation_id}]</strong>"
 
-    def format_reference(self, citation_id: str, file_name: str) -> str:
+    def format_reference(self, citation_id: str, file_name: str, metadata: FileMetadata | None = None) -> str:
+        if metadata is not None:
+            file_name = metadata.describe(file_name)
         return f"<strong>[{citation_id}]</strong> {file_name}"
+
+
+class PlainFormatter(BaseFormatter):
+    """Formatter for machine readable output.
+
+    Citations are plain text and references are omitted since they are reported separately.
+    """
+
+    def format_citation(self, citation_id: str) -> str:
+        return f"[{citation_id}]"
+
+    def format_reference(self, citation_id: str, file_name: str, metadata: FileMetadata | None = None) -> str:
+        if metadata is not None:
+            file_name = metadata.describe(file_name)
+        return f"\n[{citation_id}] {file_name}"
+
+    def get_references(
+        self,
+        annotations: dict[str, str],
+        files: dict[str, str],
+        metadata: dict[str, FileMetadata] | None = None,
+    ) -> str:
+        return ""
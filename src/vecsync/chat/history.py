@@ -0,0 +1,154 @@
+import sqlite3
+import threading
+from contextlib import closing
+from pathlib import Path
+
+from appdirs import user_cache_dir
+
+# The maximum page size allowed by the OpenAI messages list endpoint
+PAGE_SIZE = 100
+
+
+class HistoryCache:
+    """Local cache of thread messages.
+
+    Messages are stored in SQLite in thread order. Syncing only requests messages after the newest cached
+    message, so reopening a long conversation costs a single request once the cache is warm.
+
+    Parameters
+    ----------
+    path : Path | None
+        The path to the SQLite database. If None, the default location in the user cache directory is used.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.file = Path(path) if path is not None else Path(user_cache_dir("vecsync")) / "history.sqlite"
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        with closing(self._connect()) as db, db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS messages (
+                    thread_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    id TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    PRIMARY KEY (thread_id, seq),
+                    UNIQUE (thread_id, id)
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.file)
+
+    def last_id(self, thread_id: str) -> str | None:
+        """Get the ID of the newest cached message in the thread."""
+        with closing(self._connect()) as db:
+            row = db.execute(
+                "SELECT id FROM messages WHERE thread_id = ? ORDER BY seq DESC LIMIT 1", (thread_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def count(self, thread_id: str) -> int:
+        """Get the number of cached messages in the thread."""
+        with closing(self._connect()) as db:
+            return db.execute("SELECT COUNT(*) FROM messages WHERE thread_id = ?", (thread_id,)).fetchone()[0]
+
+    def sync(self, client, thread_id: str) -> int:
+        """Fetch messages newer than the cache from the OpenAI API.
+
+        Pages are requested oldest first with the newest cached message as the ``after`` cursor. Syncing
+        stops at the first message which is still being generated so it is fetched again once complete.
+
+        Parameters
+        ----------
+        client : OpenAI
+            The OpenAI API client.
+        thread_id : str
+            The ID of the thread to sync.
+
+        Returns
+        -------
+        int
+            The number of new messages cached.
+        """
+        with self._lock:
+            after = self.last_id(thread_id)
+            added = 0
+
+            while True:
+                kwargs = {"after": after} if after is not None else {}
+                page = client.beta.threads.messages.list(thread_id=thread_id, order="asc", limit=PAGE_SIZE, **kwargs)
+
+                rows = []
+                complete = True
+                for msg in page.data:
+                    if getattr(msg, "status", "completed") != "completed":
+                        complete = False
+                        break
+
+                    content = "".join(c.text.value for c in msg.content if c.type == "text")
+                    rows.append((msg.id, msg.role, content))
+
+                if len(rows) > 0:
+                    self._insert(thread_id, rows)
+                    added += len(rows)
+                    after = rows[-1][0]
+
+                if not complete or not page.has_more or len(page.data) == 0:
+                    return added
+
+    def _insert(self, thread_id: str, rows: list[tuple[str, str, str]]):
+        with closing(self._connect()) as db, db:
+            start = db.execute(
+                "SELECT COALESCE(MAX(seq), -1) + 1 FROM messages WHERE thread_id = ?", (thread_id,)
+            ).fetchone()[0]
+            db.executemany(
+                "INSERT OR IGNORE INTO messages (thread_id, seq, id, role, content) VALUES (?, ?, ?, ?, ?)",
+                [(thread_id, start + i, *row) for i, row in enumerate(rows)],
+            )
+
+    def append(self, thread_id: str, messages: list[tuple[str, str, str]]):
+        """Add messages to the end of a conversation which isn't stored in an OpenAI thread.
+
+        Parameters
+        ----------
+        thread_id : str
+            The ID of the conversation.
+        messages : list[tuple[str, str, str]]
+            The ID, role and content of each message in chronological order.
+        """
+        with self._lock:
+            self._insert(thread_id, messages)
+
+    def read(self, thread_id: str, limit: int | None = None, skip: int = 0) -> list[dict[str, str]]:
+        """Read cached messages in chronological order.
+
+        Parameters
+        ----------
+        thread_id : str
+            The ID of the thread to read.
+        limit : int | None
+            The maximum number of messages to return, counting back from the newest. If None, all
+            messages are returned.
+        skip : int
+            The number of newest messages to skip. Used to page back through older messages.
+
+        Returns
+        -------
+        list[dict[str, str]]
+            A list of dictionaries containing the role and content of each message.
+        """
+        with closing(self._connect()) as db:
+            rows = db.execute(
+                "SELECT role, content FROM messages WHERE thread_id = ? ORDER BY seq DESC LIMIT ? OFFSET ?",
+                (thread_id, -1 if limit is None else limit, skip),
+            ).fetchall()
+
+        return [dict(role=role, content=content) for role, content in reversed(rows)]
+
+    def clear(self, thread_id: str):
+        """Remove all cached messages for the thread."""
+        with closing(self._connect()) as db, db:
+            db.execute("DELETE FROM messages WHERE thread_id = ?", (thread_id,))
@@ -1,10 +1,13 @@
 import sys
 from concurrent.futures import ThreadPoolExecutor
 
-import gradio as gr
+from termcolor import cprint
 
 from vecsync.chat.clients.openai import OpenAIClient, OpenAIHandler
 from vecsync.chat.formatter import ConsoleFormatter, GradioFormatter
+from vecsync.chat.sessions import SessionThreads
+from vecsync.chat.stream import StreamBuffer
+from vecsync.chat.usage import BudgetExceeded
 
 
 class ConsoleInterface:
@@ -25,45 +28,103 @@ class ConsoleInterface:
 
     def prompt(self, prompt_text: str):
         fmt = ConsoleFormatter()
-        handler = OpenAIHandler(self.client.files, fmt)
+        handler = OpenAIHandler(self.client.citations, fmt, self.client.metadata)
 
-        self.client.send_message(prompt_text)
+        self.executor.submit(
+            self.client.stream_response, self.client.thread_id, self.client.assistant_id, handler, prompt_text
+        )
+        try:
+            for chunk in handler.consume_queue():
+                sys.stdout.write(chunk)
+                sys.stdout.flush()
+        except BudgetExceeded as e:
+            cprint(f"⛔ {e}", "red")
+            return
 
-        self.executor.submit(self.client.stream_response, self.client.thread_id, self.client.assistant_id, handler)
-        for chunk in handler.consume_queue():
-            sys.stdout.write(chunk)
-            sys.stdout.flush()
+        report = self.client.usage_report(handler)
+        if report is not None:
+            cprint(f"\n\n{report}", "dark_grey")
 
 
 class GradioInterface:
     """Interact with the assistant via the Gradio UI.
 
-    This class allows for messages to be sent and received in a Gradio environment. Multithreading
-    is used to allow for streaming responses. The Gradio UI is launched locally.
+    This class allows for messages to be sent and received in a Gradio environment. Each browser session
+    is given its own OpenAI thread and responses are streamed concurrently, up to the concurrency limit.
+    The Gradio UI is launched locally.
 
     Parameters
     ----------
     client : OpenAIClient
         The OpenAI client used to send and receive messages.
+    concurrency : int
+        The maximum number of responses streamed at the same time.
+    pool_size : int
+        The number of threads kept ready for new sessions.
+    history_page : int
+        The number of prior messages shown when the UI opens and loaded per request for earlier messages.
     """
 
-    def __init__(self, client: OpenAIClient):
+    def __init__(self, client: OpenAIClient, concurrency: int = 4, pool_size: int = 2, history_page: int = 40):
         self.client = client
-        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.concurrency = concurrency
+        self.history_page = history_page
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.sessions = SessionThreads(client, pool_size=pool_size)
 
     def chat_interface(self):
-        def gradio_prompt(message, history):
-            fmt = GradioFormatter()
-            handler = OpenAIHandler(self.client.files, fmt)
-
-            self.client.send_message(message)
+        # Gradio takes seconds to import so it is only loaded when the UI is launched
+        import gradio as gr
 
-            self.executor.submit(self.client.stream_response, self.client.thread_id, self.client.assistant_id, handler)
-            response = ""
-
-            for chunk in handler.consume_queue():
-                response += chunk
-                yield response
+        async def gradio_prompt(message, history, request: gr.Request):
+            fmt = GradioFormatter()
+            handler = OpenAIHandler(self.client.citations, fmt, self.client.metadata)
+            thread_id = self.sessions.get(request.session_hash)
+
+            self.executor.submit(
+                self.client.stream_response,
+                thread_id,
+                self.client.assistant_id,
+                handler,
+                message,
+                request.session_hash,
+            )
+            buffer = StreamBuffer()
+
+            # Gradio sends each update as an append to the previous value, so only the number of updates
+            # needs to be bounded to keep long responses linear
+            try:
+                async for chunk in handler.aconsume_queue():
+                    if buffer.append(chunk):
+                        yield buffer.flush()
+            except BudgetExceeded as e:
+                buffer.append(f"⛔ {e}")
+
+            report = self.client.usage_report(handler)
+            if report is not None:
+                buffer.append(f"\n\n<small>{report}</small>")
+
+            if buffer.pending:
+                yield buffer.flush()
+
+        def open_session(request: gr.Request):
+            thread_id, persisted = self.sessions.open(request.session_hash)
+            if not persisted:
+                return [], 0
+
+            history = self.client.load_history(thread_id, limit=self.history_page)
+            return history, self.client.history.count(thread_id) - len(history)
+
+        def load_earlier(chat, start, request: gr.Request):
+            # Older messages are read from the local history cache only, so paging back is instant. New turns
+            # are added to the cache while the UI is open, so the page is counted from the oldest message shown.
+            thread_id = self.sessions.get(request.session_hash)
+            newer = self.client.history.count(thread_id) - start
+            earlier = self.client.history.read(thread_id, limit=min(self.history_page, start), skip=newer)
+            return earlier + chat, start - len(earlier)
+
+        def close_session(request: gr.Request):
+            self.sessions.close(request.session_hash)
 
         # Gradio doesn't automatically scroll to the bottom of the chat window to accomodate
         # chat history so we add some JavaScript to perform this action on load
@@ -84,10 +145,13 @@ class GradioInterface:
                 }
 
             """
-        history = self.client.load_history()
+        self.sessions.pool.fill()
 
         with gr.Blocks(theme=gr.themes.Base(), js=js) as demo:
-            bot = gr.Chatbot(value=history, height="70vh", type="messages")
+            # The number of cached messages older than the oldest message shown
+            start = gr.State(0)
+            earlier = gr.Button("Load earlier messages", size="sm", variant="secondary")
+            bot = gr.Chatbot(height="70vh", type="messages")
 
             gr.Markdown(
                 """
@@ -99,6 +163,10 @@ class GradioInterface:
                 fn=gradio_prompt,
                 type="messages",
                 chatbot=bot,
+                concurrency_limit=self.concurrency,
             )
 
+            earlier.click(load_earlier, inputs=[bot, start], outputs=[bot, start])
+            demo.load(open_session, outputs=[bot, start])
+            demo.unload(close_session)
             demo.launch()
@@ -0,0 +1,282 @@
+import json
+import re
+import statistics
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+
+from vecsync.chat.batch import get_citations
+from vecsync.chat.clients.openai import OpenAIClient, OpenAIHandler
+from vecsync.chat.formatter import PlainFormatter
+from vecsync.chat.sessions import SessionThreads
+
+
+class Metrics:
+    """Request counters and recent latencies reported by the health endpoint."""
+
+    def __init__(self, window: int = 1000):
+        self.started = perf_counter()
+        self.requests = 0
+        self.active = 0
+        self.rejected = 0
+        self.errors = 0
+        self.first_token: deque[float] = deque(maxlen=window)
+        self.total: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, **counts: int):
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+    def observe(self, first_token: float | None, total: float):
+        with self._lock:
+            if first_token is not None:
+                self.first_token.append(first_token)
+            self.total.append(total)
+
+    @staticmethod
+    def _percentiles(values: list[float]) -> dict[str, float] | None:
+        if len(values) == 0:
+            return None
+        if len(values) == 1:
+            return {"p50": values[0], "p95": values[0]}
+
+        cuts = statistics.quantiles(values, n=20, method="inclusive")
+        return {"p50": cuts[9], "p95": cuts[18]}
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "uptime_seconds": perf_counter() - self.started,
+                "requests": self.requests,
+                "active": self.active,
+                "rejected": self.rejected,
+                "errors": self.errors,
+                "first_token_seconds": self._percentiles(list(self.first_token)),
+                "total_seconds": self._percentiles(list(self.total)),
+            }
+
+
+class ChatServer:
+    """HTTP API for the assistant with Server-Sent Events streaming.
+
+    The server shares one connected client, and with it one pooled HTTP connection to OpenAI, across all
+    requests. Each request is answered in a new thread from the thread pool unless it names a session, in
+    which case the session's thread is reused so follow-up questions keep their context. At most
+    ``concurrency`` responses are streamed at once and further requests are rejected with 429 rather
+    than queued, so callers can retry elsewhere.
+
+    ``POST /chat`` takes ``{"message": str, "session": str | None, "stream": bool}`` and streams ``delta``
+    events with the response text, followed by a ``done`` event with the citations, usage and latency or
+    an ``error`` event. With ``"stream": false`` the complete answer is returned as JSON instead.
+    ``DELETE /sessions/{session}`` forgets a session and ``GET /health`` reports status and metrics.
+
+    Parameters
+    ----------
+    client : OpenAIClient
+        The connected OpenAI client.
+    host : str
+        The interface to listen on.
+    port : int
+        The port to listen on. Use 0 to pick a free port.
+    concurrency : int
+        The maximum number of responses streamed at the same time.
+    pool_size : int
+        The number of threads kept ready for new requests and sessions.
+    """
+
+    def __init__(
+        self,
+        client: OpenAIClient,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        concurrency: int = 8,
+        pool_size: int = 4,
+    ):
+        self.client = client
+        self.concurrency = concurrency
+        self.sessions = SessionThreads(client, pool_size=pool_size, persisted=False)
+        self.metrics = Metrics()
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._session_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server._handle(self, "GET")
+
+            def do_POST(self):
+                server._handle(self, "POST")
+
+            def do_DELETE(self):
+                server._handle(self, "DELETE")
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self):
+        self.sessions.pool.fill()
+        self.httpd.serve_forever()
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def _handle(self, request: BaseHTTPRequestHandler, method: str):
+        path = request.path.split("?")[0]
+
+        try:
+            if method == "GET" and path == "/health":
+                self._send_json(request, self._health())
+            elif method == "POST" and path == "/chat":
+                self._chat(request)
+            elif method == "DELETE" and (match := re.fullmatch(r"/sessions/([^/]+)", path)):
+                self._close_session(match.group(1))
+                self._send_json(request, {"deleted": match.group(1)})
+            else:
+                self._send_json(request, {"error": f"No route for {method} {path}"}, status=404)
+        except (BrokenPipeError, ConnectionResetError):
+            # The caller went away, any stream in progress has already been cancelled
+            pass
+
+    def _health(self) -> dict:
+        return {
+            "status": "ok" if self.client.connected else "disconnected",
+            "assistant_id": self.client.assistant_id,
+            "concurrency": self.concurrency,
+            "sessions": len(self.sessions.sessions),
+            **self.metrics.snapshot(),
+        }
+
+    def _session_lock(self, session: str) -> threading.Lock:
+        with self._lock:
+            return self._session_locks.setdefault(session, threading.Lock())
+
+    def _close_session(self, session: str):
+        self.sessions.close(session)
+        with self._lock:
+            self._session_locks.pop(session, None)
+
+    def _chat(self, request: BaseHTTPRequestHandler):
+        try:
+            length = int(request.headers.get("Content-Length") or 0)
+            body = json.loads(request.rfile.read(length)) if length else {}
+        except ValueError:
+            body = None
+
+        if not isinstance(body, dict) or not isinstance(body.get("message"), str):
+            self._send_json(request, {"error": "Expected a JSON body with a 'message' string"}, status=400)
+            return
+
+        if not self._slots.acquire(blocking=False):
+            self.metrics.add(rejected=1)
+            self._send_json(request, {"error": "Too many concurrent requests"}, status=429, retry_after=1)
+            return
+
+        session = body.get("session")
+        self.metrics.add(requests=1, active=1)
+        try:
+            if session is None:
+                self._respond(request, self.sessions.pool.acquire(), body)
+            else:
+                # A thread accepts one run at a time, so requests within a session are answered in turn
+                with self._session_lock(session):
+                    self._respond(request, self.sessions.get(session), body)
+        finally:
+            self.metrics.add(active=-1)
+            self._slots.release()
+
+    def _respond(self, request: BaseHTTPRequestHandler, thread_id: str, body: dict):
+        handler = OpenAIHandler(self.client.citations, PlainFormatter(), self.client.metadata)
+        start = perf_counter()
+        self.executor.submit(
+            self.client.stream_response,
+            thread_id,
+            self.client.assistant_id,
+            handler,
+            body["message"],
+            body.get("session") or "serve",
+        )
+
+        stream = body.get("stream", True)
+        if stream:
+            request.send_response(200)
+            request.send_header("Content-Type", "text/event-stream")
+            request.send_header("Cache-Control", "no-cache")
+            request.end_headers()
+
+        chunks = handler.consume_queue()
+        text = []
+        try:
+            for chunk in chunks:
+                text.append(chunk)
+                if stream:
+                    self._send_event(request, "delta", {"text": chunk})
+        except (BrokenPipeError, ConnectionResetError):
+            raise
+        except Exception as e:
+            self.metrics.add(errors=1)
+            error = {"error": f"{type(e).__name__}: {e}", "thread_id": thread_id}
+            if stream:
+                self._send_event(request, "error", error)
+            else:
+                self._send_json(request, error, status=502)
+            return
+        finally:
+            # Cancels the run if writing to the caller failed part way through
+            chunks.close()
+
+        total = perf_counter() - start
+        first_token = handler.first_token - start if handler.first_token is not None else None
+        self.metrics.observe(first_token, total)
+
+        result = {
+            "thread_id": thread_id,
+            "session": body.get("session"),
+            "citations": [c.model_dump() for c in get_citations(handler)],
+            "usage": usage.model_dump() if (usage := handler.usage) is not None else None,
+            "first_token_seconds": first_token,
+            "total_seconds": total,
+        }
+
+        if stream:
+            self._send_event(request, "done", result)
+        else:
+            self._send_json(request, {"answer": "".join(text), **result})
+
+    @staticmethod
+    def _send_event(request: BaseHTTPRequestHandler, event: str, data: dict):
+        request.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+        request.wfile.flush()
+
+    @staticmethod
+    def _send_json(request: BaseHTTPRequestHandler, data: dict, status: int = 200, retry_after: int | None = None):
+        payload = json.dumps(data).encode()
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(payload)))
+        if retry_after is not None:
+            request.send_header("Retry-After", str(retry_after))
+        request.end_headers()
+        request.wfile.write(payload)
@@ -0,0 +1,121 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, Queue
+
+from vecsync.chat.clients.openai import OpenAIClient
+
+
+class ThreadPool:
+    """Pool of pre-created OpenAI threads.
+
+    Creating a thread is a round trip to the OpenAI API. The pool keeps a few threads ready in the
+    background so that a new chat session can start without waiting on that request.
+
+    Parameters
+    ----------
+    client : OpenAIClient
+        The connected OpenAI client used to create threads.
+    size : int
+        The number of threads to keep ready.
+    """
+
+    def __init__(self, client: OpenAIClient, size: int = 2):
+        self.client = client
+        self.size = size
+        self.available = Queue()
+        self.executor = ThreadPoolExecutor(max_workers=max(size, 1))
+
+    def _create(self):
+        self.available.put(self.client.new_thread())
+
+    def fill(self):
+        """Start creating threads in the background until the pool is full."""
+        for _ in range(self.size - self.available.qsize()):
+            self.executor.submit(self._create)
+
+    def acquire(self) -> str:
+        """Take a thread from the pool, creating one directly if the pool is empty.
+
+        Returns
+        -------
+        str
+            The ID of a new, empty thread.
+        """
+        try:
+            thread_id = self.available.get_nowait()
+        except Empty:
+            thread_id = self.client.new_thread()
+
+        if self.size > 0:
+            self.executor.submit(self._create)
+        return thread_id
+
+
+class SessionThreads:
+    """Assigns an OpenAI thread to each chat session.
+
+    The first session to open is given the client's persisted thread so that a single local user keeps
+    their conversation history. Every other concurrent session is given its own thread from the pool,
+    so messages from different sessions never interleave. The persisted thread is released when its
+    session closes.
+
+    Parameters
+    ----------
+    client : OpenAIClient
+        The connected OpenAI client.
+    pool_size : int
+        The number of threads to keep ready for new sessions.
+    persisted : bool
+        Whether the first session is given the persisted thread. If False, every session gets a new thread.
+    """
+
+    def __init__(self, client: OpenAIClient, pool_size: int = 2, persisted: bool = True):
+        self.client = client
+        self.persisted = persisted
+        self.pool = ThreadPool(client, size=pool_size)
+        self.sessions: dict[str, str] = {}
+        self.owner: str | None = None
+        self._lock = threading.Lock()
+
+    def open(self, session_id: str) -> tuple[str, bool]:
+        """Assign a thread to the session.
+
+        Parameters
+        ----------
+        session_id : str
+            The unique ID of the session.
+
+        Returns
+        -------
+        tuple[str, bool]
+            The thread ID and whether it is the persisted thread with prior history.
+        """
+        with self._lock:
+            if session_id == self.owner:
+                # The persisted thread may have been rotated since the session opened
+                return self.client.thread_id, True
+
+            if session_id in self.sessions:
+                return self.sessions[session_id], False
+
+            if self.persisted and self.owner is None:
+                self.owner = session_id
+                self.sessions[session_id] = self.client.thread_id
+                return self.client.thread_id, True
+
+        thread_id = self.pool.acquire()
+        with self._lock:
+            self.sessions[session_id] = thread_id
+        return thread_id, False
+
+    def get(self, session_id: str) -> str:
+        """Get the thread for the session, assigning one if needed."""
+        thread_id, _ = self.open(session_id)
+        return thread_id
+
+    def close(self, session_id: str):
+        """Release the session's thread."""
+        with self._lock:
+            self.sessions.pop(session_id, None)
+            if self.owner == session_id:
+                self.owner = None
@@ -0,0 +1,57 @@
+from collections.abc import Callable
+from time import perf_counter
+
+
+class StreamBuffer:
+    """Accumulate streamed chunks and decide when to flush them.
+
+    Interfaces which must redraw the whole response, such as Gradio, pay for every update in proportion to
+    the response length. Flushing on every chunk makes a long answer quadratic in both CPU and bytes.
+    This buffer collects chunks in a list and only signals a flush once enough time has passed or enough
+    text is pending, which bounds the number of redraws.
+
+    Parameters
+    ----------
+    interval : float
+        The minimum number of seconds between flushes.
+    max_chars : int
+        Flush regardless of the interval once this many characters are pending.
+    clock : Callable[[], float]
+        The clock used to measure the interval.
+    """
+
+    def __init__(self, interval: float = 0.1, max_chars: int = 4096, clock: Callable[[], float] = perf_counter):
+        self.interval = interval
+        self.max_chars = max_chars
+        self.clock = clock
+        self._text = ""
+        self._pending: list[str] = []
+        self._pending_chars = 0
+        self._last_flush = clock()
+
+    def append(self, chunk: str) -> bool:
+        """Add a chunk to the buffer.
+
+        Returns
+        -------
+        bool
+            True if the pending text should be flushed now.
+        """
+        self._pending.append(chunk)
+        self._pending_chars += len(chunk)
+
+        return self._pending_chars >= self.max_chars or self.clock() - self._last_flush >= self.interval
+
+    @property
+    def pending(self) -> bool:
+        """Whether any text has been appended since the last flush."""
+        return self._pending_chars > 0
+
+    def flush(self) -> str:
+        """Move the pending text into the response and return the full text."""
+        if self._pending:
+            self._text += "".join(self._pending)
+            self._pending.clear()
+            self._pending_chars = 0
+        self._last_flush = self.clock()
+        return self._text
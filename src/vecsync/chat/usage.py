@@ -0,0 +1,197 @@
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import date
+from pathlib import Path
+
+from appdirs import user_data_dir
+from pydantic import BaseModel
+
+from vecsync.settings import SettingExists, Settings
+
+# USD per million prompt and completion tokens. Models missing here are counted without a cost estimate.
+# See https://platform.openai.com/docs/pricing
+PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+}
+
+
+class Usage(BaseModel):
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    cost: float | None = None
+
+    def __add__(self, other: "Usage") -> "Usage":
+        cost = None if self.cost is None and other.cost is None else (self.cost or 0) + (other.cost or 0)
+        return Usage(
+            prompt_tokens=self.prompt_tokens + other.prompt_tokens,
+            completion_tokens=self.completion_tokens + other.completion_tokens,
+            total_tokens=self.total_tokens + other.total_tokens,
+            cost=cost,
+        )
+
+    def describe(self) -> str:
+        text = f"{self.total_tokens:,} tokens ({self.prompt_tokens:,} prompt + {self.completion_tokens:,} completion)"
+        if self.cost is not None:
+            text += f" ~${self.cost:.4f}"
+        return text
+
+
+def estimate_cost(model: str | None, prompt_tokens: int, completion_tokens: int) -> float | None:
+    """Estimate the cost of a run in USD, or None if the model price is unknown."""
+    # Dated snapshots such as "gpt-4o-mini-2024-07-18" are priced like their base model
+    matches = [name for name in PRICES if model is not None and model.startswith(name)]
+    if len(matches) == 0:
+        return None
+
+    prompt_price, completion_price = PRICES[max(matches, key=len)]
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+class BudgetExceeded(Exception):
+    """Raised instead of starting a run once the daily token budget is used up."""
+
+
+class Budget(BaseModel):
+    """A daily token budget stored in the settings file.
+
+    Parameters
+    ----------
+    daily_tokens : int
+        The number of tokens which may be used per day across all vecsync processes.
+    action : str
+        Either "refuse" to stop starting runs once the budget is used, or "warn" to continue with a warning.
+    """
+
+    daily_tokens: int
+    action: str = "refuse"
+
+    @classmethod
+    def load(cls, settings: Settings) -> "Budget | None":
+        match settings["token_budget"]:
+            case SettingExists() as x:
+                return cls(**x.value)
+            case _:
+                return None
+
+    def save(self, settings: Settings):
+        settings["token_budget"] = self.model_dump()
+
+
+class UsageLedger:
+    """Local ledger of the tokens used by every run.
+
+    Runs are recorded in SQLite with their thread, session and day so usage can be aggregated across
+    processes, such as a batch running alongside a Gradio deployment.
+
+    Parameters
+    ----------
+    path : Path | None
+        The path to the SQLite database. If None, the default location in the user data directory is used.
+    """
+
+    GROUPS = {"day": "day", "thread": "thread_id", "session": "session"}
+
+    def __init__(self, path: Path | None = None):
+        self.file = Path(path) if path is not None else Path(user_data_dir("vecsync")) / "usage.sqlite"
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        with closing(self._connect()) as db, db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    day TEXT NOT NULL,
+                    thread_id TEXT NOT NULL,
+                    session TEXT,
+                    run_id TEXT,
+                    model TEXT,
+                    prompt_tokens INTEGER NOT NULL,
+                    completion_tokens INTEGER NOT NULL,
+                    total_tokens INTEGER NOT NULL,
+                    cost REAL
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS runs_day ON runs (day)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.file)
+
+    def record(
+        self,
+        usage: Usage,
+        thread_id: str,
+        session: str | None = None,
+        run_id: str | None = None,
+        model: str | None = None,
+        day: date | None = None,
+    ):
+        """Record the usage of a run."""
+        day = day or date.today()
+
+        with self._lock, closing(self._connect()) as db, db:
+            db.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    day.isoformat(),
+                    thread_id,
+                    session,
+                    run_id,
+                    model,
+                    usage.prompt_tokens,
+                    usage.completion_tokens,
+                    usage.total_tokens,
+                    usage.cost,
+                ),
+            )
+
+    def total(self, day: date | None = None) -> Usage:
+        """Get the total usage for a day, today by default."""
+        day = day or date.today()
+
+        with closing(self._connect()) as db:
+            row = db.execute(
+                """
+                SELECT COALESCE(SUM(prompt_tokens), 0), COALESCE(SUM(completion_tokens), 0),
+                       COALESCE(SUM(total_tokens), 0), SUM(cost)
+                FROM runs WHERE day = ?
+                """,
+                (day.isoformat(),),
+            ).fetchone()
+
+        return Usage(prompt_tokens=row[0], completion_tokens=row[1], total_tokens=row[2], cost=row[3])
+
+    def summary(self, by: str = "day", since: date | None = None) -> dict[str, Usage]:
+        """Aggregate usage by day, thread or session.
+
+        Parameters
+        ----------
+        by : str
+            The grouping, one of "day", "thread" or "session".
+        since : date | None
+            Only include runs on or after this day. If None, all runs are included.
+
+        Returns
+        -------
+        dict[str, Usage]
+            The usage for each group, largest first for threads and sessions and newest first for days.
+        """
+        column = self.GROUPS[by]
+        order = "day DESC" if by == "day" else "SUM(total_tokens) DESC"
+
+        with closing(self._connect()) as db:
+            rows = db.execute(
+                f"""
+                SELECT COALESCE({column}, ''), SUM(prompt_tokens), SUM(completion_tokens), SUM(total_tokens), SUM(cost)
+                FROM runs WHERE day >= ? GROUP BY {column} ORDER BY {order}
+                """,
+                ((since or date.min).isoformat(),),
+            ).fetchall()
+
+        return {
+            key: Usage(prompt_tokens=prompt, completion_tokens=completion, total_tokens=total, cost=cost)
+            for key, prompt, completion, total, cost in rows
+        }
@@ -0,0 +1,74 @@
+import contextlib
+import sys
+from pathlib import Path
+
+import click
+from termcolor import cprint
+
+from vecsync.chat.batch import BatchRunner, Question, read_answered, read_questions
+from vecsync.chat.clients.openai import OpenAIClient
+from vecsync.constants import DEFAULT_STORE_NAME
+
+
+@click.command("ask")
+@click.argument("question", required=False)
+@click.option(
+    "--batch",
+    "-b",
+    type=click.File("r"),
+    help="A file of questions, one per line or as JSONL with 'id' and 'question'. Use - to read stdin.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Append answers to this JSONL file. Questions already answered in it are skipped. Defaults to stdout.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="The maximum number of questions answered at the same time.",
+)
+@click.option(
+    "--prompt",
+    "-p",
+    type=str,
+    help="The path to the prompt source file used when creating a new assistant.",
+)
+def ask(question: str | None, batch, output: Path | None, concurrency: int, prompt: str | None):
+    """Answer questions without the interactive chat and write the answers as JSONL."""
+    if (question is None) == (batch is None):
+        raise click.UsageError("Provide either a QUESTION or --batch.")
+
+    try:
+        questions = read_questions(batch) if batch is not None else [Question(id="1", question=question)]
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--batch") from e
+
+    skipped = 0
+    if output is not None:
+        answered = read_answered(output)
+        skipped = sum(q.id in answered for q in questions)
+        questions = [q for q in questions if q.id not in answered]
+
+    # Keep stdout clean for the answers
+    with contextlib.redirect_stdout(sys.stderr):
+        client = OpenAIClient(store_name=DEFAULT_STORE_NAME, prompt_source=prompt)
+        client.connect()
+
+    runner = BatchRunner(client, concurrency=concurrency)
+    errors = 0
+
+    with open(output, "a") if output is not None else contextlib.nullcontext(sys.stdout) as f:
+        for answer in runner.run(questions):
+            errors += answer.error is not None
+            f.write(answer.model_dump_json(exclude_none=True) + "\n")
+            f.flush()
+
+    cprint(
+        f"🏁 Answered {len(questions) - errors} questions | Failed: {errors} | Skipped: {skipped}",
+        "green",
+        file=sys.stderr,
+    )
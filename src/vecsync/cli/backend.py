@@ -0,0 +1,58 @@
+from typing import TYPE_CHECKING
+
+import click
+
+from vecsync.constants import DEFAULT_STORE_NAME
+from vecsync.store.attributes import parse_filters
+
+if TYPE_CHECKING:
+    from vecsync.store.local import LocalVectorStore
+
+backend_option = click.option(
+    "--backend",
+    type=click.Choice(["openai", "local"]),
+    default="openai",
+    show_default=True,
+    help="The vector store to use. The local store is indexed and searched offline.",
+)
+
+
+store_option = click.option(
+    "--store",
+    "store_name",
+    default=DEFAULT_STORE_NAME,
+    show_default=True,
+    help="The name of the vector store. Stores of several projects share the files they have in common.",
+)
+
+
+def _parse_filters(ctx: click.Context, param: click.Parameter, value: tuple[str, ...]) -> dict | None:
+    try:
+        return parse_filters(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+
+filter_option = click.option(
+    "--filter",
+    "filters",
+    multiple=True,
+    metavar="EXPR",
+    callback=_parse_filters,
+    help=(
+        "Only retrieve from files whose attributes match, such as year>=2020 or collection=Causal. "
+        "Repeat to require several. Attributes are source, collection, year, hash, path and chunking."
+    ),
+)
+
+
+def local_store(name: str = DEFAULT_STORE_NAME) -> "LocalVectorStore":
+    # NumPy is an optional dependency, so the local store is only imported when selected
+    try:
+        from vecsync.store.local import LocalVectorStore
+    except ImportError as e:
+        raise click.ClickException(
+            "The local store requires NumPy. Install it with `pip install vecsync[local]`."
+        ) from e
+
+    return LocalVectorStore(name)
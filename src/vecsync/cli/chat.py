@@ -1,12 +1,31 @@
 import click
 
+from vecsync.chat.cache import ResponseCache
 from vecsync.chat.clients.openai import OpenAIClient
+from vecsync.chat.clients.responses import ResponsesClient
 from vecsync.chat.interface import ConsoleInterface, GradioInterface
+from vecsync.cli.backend import backend_option, filter_option, local_store
 from vecsync.constants import DEFAULT_STORE_NAME
 
+ENGINES = {"assistants": OpenAIClient, "responses": ResponsesClient}
 
-def start_console_chat(store_name: str, prompt_source: str | None = None):
-    client = OpenAIClient(store_name=store_name, prompt_source=prompt_source)
+
+def start_console_chat(
+    store_name: str,
+    prompt_source: str | None = None,
+    cache: bool = False,
+    backend: str = "openai",
+    engine: str = "assistants",
+    filters: dict | None = None,
+):
+    response_cache = ResponseCache() if cache else None
+    client = ENGINES[engine](
+        store_name=store_name,
+        prompt_source=prompt_source,
+        response_cache=response_cache,
+        local_store=local_store() if backend == "local" else None,
+        filters=filters,
+    )
     client.connect()
 
     ui = ConsoleInterface(client)
@@ -20,11 +39,26 @@ def start_console_chat(store_name: str, prompt_source: str | None = None):
         ui.prompt(prompt)
 
 
-def start_ui_chat(store_name: str, prompt_source: str | None = None):
-    client = OpenAIClient(store_name=store_name, prompt_source=prompt_source)
+def start_ui_chat(
+    store_name: str,
+    prompt_source: str | None = None,
+    concurrency: int = 4,
+    cache: bool = False,
+    backend: str = "openai",
+    engine: str = "assistants",
+    filters: dict | None = None,
+):
+    response_cache = ResponseCache() if cache else None
+    client = ENGINES[engine](
+        store_name=store_name,
+        prompt_source=prompt_source,
+        response_cache=response_cache,
+        local_store=local_store() if backend == "local" else None,
+        filters=filters,
+    )
     client.connect()
 
-    ui = GradioInterface(client)
+    ui = GradioInterface(client, concurrency=concurrency)
     ui.chat_interface()
 
 
@@ -41,10 +75,39 @@ def start_ui_chat(store_name: str, prompt_source: str | None = None):
     type=str,
     help="The path to the prompt source file used when creating a new assistant.",
 )
-def chat(ui: bool, prompt: str | None):
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="The maximum number of concurrent responses in the interactive UI.",
+)
+@click.option(
+    "--cache",
+    is_flag=True,
+    help="Answer repeated questions from a local cache until the vector store changes.",
+)
+@backend_option
+@filter_option
+@click.option(
+    "--engine",
+    type=click.Choice(list(ENGINES)),
+    default="assistants",
+    show_default=True,
+    help="Answer with assistant runs in a thread, or with chained requests to the Responses API.",
+)
+def chat(
+    ui: bool,
+    prompt: str | None,
+    concurrency: int,
+    cache: bool,
+    backend: str,
+    filters: dict | None,
+    engine: str,
+):
     """Chat with the assistant."""
 
     if ui:
-        start_ui_chat(DEFAULT_STORE_NAME, prompt)
+        start_ui_chat(DEFAULT_STORE_NAME, prompt, concurrency, cache, backend, engine, filters)
     else:
-        start_console_chat(DEFAULT_STORE_NAME, prompt)
+        start_console_chat(DEFAULT_STORE_NAME, prompt, cache, backend, engine, filters)
@@ -2,21 +2,24 @@
 
 import click
 
-from vecsync.cli.assistants import group as assistants_group
-from vecsync.cli.chat import chat
-from vecsync.cli.settings import group as settings_group
-from vecsync.cli.store import group as store_group
-from vecsync.cli.sync import sync
+from vecsync.cli.lazy import LazyGroup
 
+# Command modules are only imported when the command runs. Heavy dependencies like gradio and openai
+# are never loaded by commands which don't use them.
+COMMANDS = {
+    "ask": "vecsync.cli.ask:ask",
+    "assistants": "vecsync.cli.assistants:group",
+    "chat": "vecsync.cli.chat:chat",
+    "search": "vecsync.cli.search:search",
+    "serve": "vecsync.cli.serve:serve",
+    "settings": "vecsync.cli.settings:group",
+    "store": "vecsync.cli.store:group",
+    "sync": "vecsync.cli.sync:sync",
+    "usage": "vecsync.cli.usage:group",
+}
 
-@click.group()
+
+@click.group(cls=LazyGroup, lazy_commands=COMMANDS)
 def cli():
     """vecsync CLI tool"""
     pass
-
-
-for group in [assistants_group, store_group, settings_group]:
-    cli.add_command(group)
-
-cli.add_command(sync)
-cli.add_command(chat)
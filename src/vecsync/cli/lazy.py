@@ -0,0 +1,36 @@
+from importlib import import_module
+
+import click
+
+
+class LazyGroup(click.Group):
+    """Click group which imports its subcommands only when they are invoked.
+
+    Commands are registered by name with the import path of the module and attribute which defines them,
+    so that running one command does not pay the import cost of the dependencies used by the others.
+
+    Parameters
+    ----------
+    lazy_commands : dict[str, str] | None
+        A mapping of command name to ``"module:attribute"`` import path.
+    """
+
+    def __init__(self, *args, lazy_commands: dict[str, str] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self.lazy_commands and cmd_name not in self.commands:
+            self.add_command(self._load(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load(self, cmd_name: str) -> click.Command:
+        module_name, attr = self.lazy_commands[cmd_name].split(":")
+        command = getattr(import_module(module_name), attr)
+
+        if not isinstance(command, click.Command):
+            raise ValueError(f"Lazy command '{cmd_name}' at {self.lazy_commands[cmd_name]} is not a click command")
+        return command
@@ -0,0 +1,98 @@
+import json
+import textwrap
+
+import click
+from termcolor import colored
+
+from vecsync.chat.formatter import BaseFormatter, ConsoleFormatter
+from vecsync.cli.backend import backend_option, filter_option, local_store, store_option
+from vecsync.settings import SettingExists, Settings
+from vecsync.store.base import SearchResult
+from vecsync.store.metadata import FileMetadata, MetadataIndex
+from vecsync.store.openai import OpenAiVectorStore
+from vecsync.store.sharding import ShardingOptions
+
+
+def format_results(
+    results: list[SearchResult],
+    formatter: BaseFormatter,
+    metadata: dict[str, FileMetadata] | None = None,
+    width: int = 300,
+) -> str:
+    """Render search results with the same citations and references as a chat response.
+
+    Each file is numbered by its first appearance, so chunks from the same file share a citation.
+
+    Parameters
+    ----------
+    results : list[SearchResult]
+        The search results, most relevant first.
+    formatter : BaseFormatter
+        The formatter used for citations and references.
+    metadata : dict[str, FileMetadata] | None
+        Bibliographic metadata keyed by file ID, used to describe the referenced files.
+    width : int
+        The maximum number of characters shown of each chunk.
+
+    Returns
+    -------
+    str
+        The rendered results.
+    """
+    annotations: dict[str, str] = {}
+    files = {r.file_id: r.filename for r in results}
+    text_chunks = []
+
+    for rank, result in enumerate(results, start=1):
+        citation_id = annotations.setdefault(result.file_id, str(len(annotations) + 1))
+        snippet = textwrap.shorten(result.text, width=width, placeholder=" …")
+        text_chunks.append(f"{rank}. {formatter.format_citation(citation_id)} score {result.score:.3f}\n")
+        text_chunks.append(textwrap.indent(textwrap.fill(snippet, width=100), "   ") + "\n\n")
+
+    text_chunks.append(formatter.get_references(annotations, files, metadata).lstrip("\n"))
+    return "".join(text_chunks)
+
+
+def _cached_store_id(settings: Settings, store_name: str) -> str | None:
+    # The store ID is cached by the chat client when it connects
+    match settings["openai_resources"]:
+        case SettingExists() as x:
+            return x.value.get(store_name, {}).get("vector_store_id")
+        case _:
+            return None
+
+
+@click.command()
+@click.argument("query")
+@click.option(
+    "--top-k",
+    "-k",
+    type=click.IntRange(min=1, max=50),
+    default=5,
+    show_default=True,
+    help="The number of passages to return.",
+)
+@click.option("--json", "as_json", is_flag=True, help="Write the results as JSONL instead of text.")
+@filter_option
+@backend_option
+@store_option
+def search(query: str, top_k: int, as_json: bool, filters: dict | None, backend: str, store_name: str):
+    """Find the passages most relevant to QUERY without generating an answer."""
+    if backend == "local":
+        results = local_store(store_name).search(query, max_results=top_k, filters=filters)
+    else:
+        store = OpenAiVectorStore(store_name, shards=ShardingOptions.load().shards)
+        results = store.search(
+            query, max_results=top_k, store_id=_cached_store_id(Settings(), store_name), filters=filters
+        )
+
+    if as_json:
+        for rank, result in enumerate(results, start=1):
+            click.echo(json.dumps({"rank": rank, **result.model_dump()}))
+        return
+
+    if len(results) == 0:
+        click.echo(colored("No matching passages found.", "yellow"))
+        return
+
+    click.echo(format_results(results, ConsoleFormatter(), MetadataIndex().load()))
@@ -0,0 +1,38 @@
+import click
+from termcolor import cprint
+
+from vecsync.chat.clients.openai import OpenAIClient
+from vecsync.chat.server import ChatServer
+from vecsync.constants import DEFAULT_STORE_NAME
+
+
+@click.command("serve")
+@click.option("--host", type=str, default="127.0.0.1", show_default=True, help="The interface to listen on.")
+@click.option("--port", type=int, default=8000, show_default=True, help="The port to listen on.")
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="The maximum number of concurrent responses. Further requests are rejected with 429.",
+)
+@click.option(
+    "--prompt",
+    "-p",
+    type=str,
+    help="The path to the prompt source file used when creating a new assistant.",
+)
+def serve(host: str, port: int, concurrency: int, prompt: str | None):
+    """Serve the assistant over HTTP with streamed responses."""
+    client = OpenAIClient(store_name=DEFAULT_STORE_NAME, prompt_source=prompt)
+    client.connect()
+
+    server = ChatServer(client, host=host, port=port, concurrency=concurrency)
+    cprint(f"🚀 Serving on {server.url} (POST /chat, GET /health)", "green")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
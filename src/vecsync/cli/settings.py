@@ -1,7 +1,12 @@
 import click
 from termcolor import colored
 
+from vecsync.chat.compaction import ThreadPolicy
+from vecsync.connection import ConnectionOptions, http2_available
 from vecsync.settings import Settings
+from vecsync.store.chunking import PROFILES, ChunkingPolicy
+from vecsync.store.priority import ORDERS, SyncPriority
+from vecsync.store.sharding import ShardingOptions
 
 
 @click.command()
@@ -21,6 +26,158 @@ def show():
     click.echo(f"Settings file data:\n{colored(data.data, 'yellow')}")
 
 
+@click.command()
+@click.option("--max-turns", type=click.IntRange(min=0), help="Rotate the conversation after this many questions.")
+@click.option(
+    "--max-context-tokens",
+    type=click.IntRange(min=0),
+    help="Rotate the conversation once a run's prompt exceeds this many tokens.",
+)
+@click.option("--last-messages", type=click.IntRange(min=0), help="Only send this many recent messages with each run.")
+def thread(max_turns: int | None, max_context_tokens: int | None, last_messages: int | None):
+    """Limit the conversation context sent with each run. Use 0 to remove a limit."""
+    settings = Settings()
+    policy = ThreadPolicy.load(settings)
+
+    updates = {"max_turns": max_turns, "max_context_tokens": max_context_tokens, "last_messages": last_messages}
+    updates = {key: value or None for key, value in updates.items() if value is not None}
+    if len(updates) > 0:
+        policy = policy.model_copy(update=updates)
+        policy.save(settings)
+        click.echo(colored("Thread policy updated.", "green"))
+
+    for key, value in policy.model_dump().items():
+        click.echo(f"{key}: {colored(str(value) if value is not None else 'unlimited', 'yellow')}")
+
+
+@click.command()
+@click.option("--max-connections", type=click.IntRange(min=1), help="The maximum number of open connections.")
+@click.option(
+    "--max-keepalive-connections",
+    type=click.IntRange(min=0),
+    help="The maximum number of idle connections kept open for reuse.",
+)
+@click.option("--keepalive-expiry", type=click.FloatRange(min=0), help="Seconds an idle connection is kept open.")
+@click.option("--connect-timeout", type=click.FloatRange(min=0), help="Seconds to wait for a connection.")
+@click.option("--read-timeout", type=click.FloatRange(min=0), help="Seconds to wait for data from the API.")
+@click.option("--max-retries", type=click.IntRange(min=0), help="The number of times a failed request is retried.")
+@click.option("--http2/--no-http2", default=None, help="Use HTTP/2 when the h2 package is installed.")
+def connection(**updates):
+    """Tune the connection pool and timeouts used for the OpenAI API."""
+    settings = Settings()
+    options = ConnectionOptions.load(settings)
+
+    updates = {key: value for key, value in updates.items() if value is not None}
+    if len(updates) > 0:
+        options = options.model_copy(update=updates)
+        options.save(settings)
+        click.echo(colored("Connection options updated.", "green"))
+
+    for key, value in options.model_dump().items():
+        click.echo(f"{key}: {colored(str(value), 'yellow')}")
+
+    if options.http2 and not http2_available():
+        click.echo(colored('HTTP/2 needs the h2 package, install it with pip install "httpx[http2]"', "yellow"))
+
+
+def _parse_source_profiles(ctx: click.Context, param: click.Parameter, value: tuple[str, ...]) -> dict[str, str]:
+    sources = {}
+    for item in value:
+        source, _, profile = item.partition("=")
+        if profile not in PROFILES:
+            raise click.BadParameter(f"Expected SOURCE=PROFILE with a profile of {', '.join(PROFILES)}, got '{item}'")
+        sources[source] = profile
+    return sources
+
+
+@click.command()
+@click.option("--profile", type=click.Choice(list(PROFILES)), help="The profile used when no other rule applies.")
+@click.option(
+    "--source",
+    "sources",
+    multiple=True,
+    metavar="SOURCE=PROFILE",
+    callback=_parse_source_profiles,
+    help="The profile used for files from a source, such as zotero=large. Use SOURCE=auto to reset.",
+)
+@click.option(
+    "--large-file-size",
+    type=click.IntRange(min=0),
+    help="Files of at least this many bytes use the large file profile. Use 0 to disable.",
+)
+@click.option("--large-file-profile", type=click.Choice(list(PROFILES)), help="The profile used for large files.")
+def chunking(profile: str | None, sources: dict[str, str], large_file_size: int | None, large_file_profile: str | None):
+    """Choose how files are chunked when they are attached to the vector store."""
+    settings = Settings()
+    policy = ChunkingPolicy.load(settings)
+
+    updates = {"default": profile, "large_file_profile": large_file_profile}
+    updates = {key: value for key, value in updates.items() if value is not None}
+    if large_file_size is not None:
+        updates["large_file_bytes"] = large_file_size or None
+    if len(sources) > 0:
+        merged = {**policy.sources, **sources}
+        updates["sources"] = {source: name for source, name in merged.items() if name != "auto"}
+
+    if len(updates) > 0:
+        policy = policy.model_copy(update=updates)
+        policy.save(settings)
+        click.echo(colored("Chunking policy updated. Files are chunked again on the next sync.", "green"))
+
+    for key, value in policy.model_dump().items():
+        click.echo(f"{key}: {colored(str(value), 'yellow')}")
+    for name, chunking_profile in PROFILES.items():
+        details = (
+            f"{chunking_profile.max_chunk_size_tokens} tokens, {chunking_profile.chunk_overlap_tokens} overlap"
+            if chunking_profile is not None
+            else "chosen by OpenAI"
+        )
+        click.echo(f"  {name}: {details}")
+
+
+@click.command()
+@click.argument("count", type=click.IntRange(min=1, max=64), required=False)
+def shards(count: int | None):
+    """Spread the synced files across COUNT vector stores, which are searched concurrently."""
+    settings = Settings()
+    options = ShardingOptions.load(settings)
+
+    if count is not None and count != options.shards:
+        options = options.model_copy(update={"shards": count})
+        options.save(settings)
+        click.echo(colored("Shard count updated. Files are moved between shards on the next sync.", "green"))
+
+    click.echo(f"shards: {colored(str(options.shards), 'yellow')}")
+
+
+@click.command()
+@click.argument("order", type=click.Choice(ORDERS), required=False)
+@click.option("--pin", "pins", multiple=True, metavar="FILENAME", help="Sync a file before any other, in this order.")
+@click.option("--clear-pins", is_flag=True, help="Remove the pinned files.")
+def priority(order: str | None, pins: tuple[str, ...], clear_pins: bool):
+    """Choose which new files are uploaded and attached first, so they become searchable first.
+
+    ORDER is added (most recently added to the source), modified (most recently modified on disk),
+    smallest or none.
+    """
+    settings = Settings()
+    options = SyncPriority.load(settings)
+
+    updates = {}
+    if order is not None:
+        updates["order"] = order
+    if clear_pins or len(pins) > 0:
+        updates["pinned"] = [] if clear_pins else [*options.pinned, *(p for p in pins if p not in options.pinned)]
+
+    if len(updates) > 0:
+        options = options.model_copy(update=updates)
+        options.save(settings)
+        click.echo(colored("Sync priority updated.", "green"))
+
+    for key, value in options.model_dump().items():
+        click.echo(f"{key}: {colored(str(value), 'yellow')}")
+
+
 @click.group(name="settings")
 def group():
     """Commands to manage application settings"""
@@ -29,3 +186,8 @@ def group():
 
 group.add_command(clear)
 group.add_command(show)
+group.add_command(thread)
+group.add_command(connection)
+group.add_command(chunking)
+group.add_command(shards)
+group.add_command(priority)
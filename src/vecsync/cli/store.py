@@ -1,14 +1,23 @@
 import click
 from termcolor import cprint
 
+from vecsync.cli.backend import backend_option, local_store, store_option
 from vecsync.constants import DEFAULT_STORE_NAME
 from vecsync.store.openai import OpenAiVectorStore
+from vecsync.store.registry import FileRegistry
+from vecsync.store.sharding import ShardingOptions
 
 
 @click.command(name="list")
-def list_stores():
+@backend_option
+@store_option
+def list_stores(backend: str, store_name: str):
     """List files in the remote vector store."""
-    store = OpenAiVectorStore(DEFAULT_STORE_NAME)
+    store = (
+        local_store(store_name)
+        if backend == "local"
+        else OpenAiVectorStore(store_name, shards=ShardingOptions.load().shards)
+    )
     files = store.get_files()
 
     num_total = len(files)
@@ -19,12 +28,56 @@ def list_stores():
 
 
 @click.command()
-def delete():
+@backend_option
+@store_option
+def delete(backend: str, store_name: str):
     """Delete all files in the remote vector store."""
-    vstore = OpenAiVectorStore(DEFAULT_STORE_NAME)
+    vstore = (
+        local_store(store_name)
+        if backend == "local"
+        else OpenAiVectorStore(store_name, shards=ShardingOptions.load().shards, registry=FileRegistry())
+    )
     vstore.delete()
 
 
+def collect_garbage(grace_hours: float = 24, dry_run: bool = False, workers: int = 16):
+    """Delete the uploaded files no vector store holds and report the space reclaimed."""
+    # Garbage is collected across the account, so the store name only provides the client and registry
+    vstore = OpenAiVectorStore(DEFAULT_STORE_NAME, workers=workers, registry=FileRegistry())
+    result = vstore.collect_garbage(grace_period=grace_hours * 3600, dry_run=dry_run)
+
+    size = f"{result.bytes_orphaned / 1_000_000:,.1f} MB"
+    if dry_run:
+        cprint(f"🧹 Found {result.files_orphaned} orphaned files ({size})", "green")
+    else:
+        reclaimed = f"{result.bytes_reclaimed / 1_000_000:,.1f} MB"
+        cprint(f"🧹 Deleted {result.files_deleted} of {result.files_orphaned} orphaned files ({reclaimed})", "green")
+    if result.files_recent > 0:
+        cprint(f"Kept {result.files_recent} unattached files uploaded in the last {grace_hours:g} hours", "yellow")
+    cprint(f"Duration: {result.duration:.2f} seconds", "yellow")
+
+
+@click.command()
+@click.option(
+    "--grace-hours",
+    type=click.FloatRange(min=0),
+    default=24,
+    show_default=True,
+    help="Keep unattached files uploaded within this many hours, which a running sync may be about to attach.",
+)
+@click.option("--dry-run", is_flag=True, help="Report the orphaned files without deleting them.")
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1, max=64),
+    default=16,
+    show_default=True,
+    help="The number of files deleted at the same time.",
+)
+def gc(grace_hours: float, dry_run: bool, workers: int):
+    """Delete uploaded files which no vector store in the account holds."""
+    collect_garbage(grace_hours, dry_run, workers)
+
+
 @click.group(name="store")
 def group():
     """Commands to manage the vector store."""
@@ -33,3 +86,4 @@ def group():
 
 group.add_command(list_stores)
 group.add_command(delete)
+group.add_command(gc)
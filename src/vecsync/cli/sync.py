@@ -1,9 +1,17 @@
 import click
 from termcolor import cprint
 
-from vecsync.constants import DEFAULT_STORE_NAME
+from vecsync.chat.cache import ResponseCache
+from vecsync.cli.backend import backend_option, local_store, store_option
+from vecsync.cli.store import collect_garbage
+from vecsync.store.attributes import HashCache
+from vecsync.store.chunking import ChunkingPolicy
 from vecsync.store.file import FileStore
+from vecsync.store.metadata import MetadataIndex
 from vecsync.store.openai import OpenAiVectorStore
+from vecsync.store.priority import SyncPriority
+from vecsync.store.registry import FileRegistry
+from vecsync.store.sharding import ShardingOptions
 from vecsync.store.zotero import ZoteroStore
 
 
@@ -14,7 +22,22 @@ from vecsync.store.zotero import ZoteroStore
     default="file",
     help="Choose the source (file or zotero).",
 )
-def sync(source: str):
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1, max=64),
+    default=8,
+    show_default=True,
+    help="The number of files uploaded to OpenAI at the same time.",
+)
+@click.option(
+    "--gc",
+    "run_gc",
+    is_flag=True,
+    help="Afterwards, delete uploaded files which no vector store holds, as vs store gc does.",
+)
+@backend_option
+@store_option
+def sync(source: str, workers: int, run_gc: bool, backend: str, store_name: str):
     """Sync files from local to remote vector store."""
     if source == "file":
         store = FileStore()
@@ -27,18 +50,47 @@ def sync(source: str):
     else:
         raise ValueError("Invalid source. Use 'file' or 'zotero'.")
 
-    vstore = OpenAiVectorStore(DEFAULT_STORE_NAME)
+    hashes = HashCache()
+    vstore = (
+        local_store(store_name)
+        if backend == "local"
+        else OpenAiVectorStore(
+            store_name,
+            workers=workers,
+            shards=ShardingOptions.load().shards,
+            registry=FileRegistry(),
+            hashes=hashes,
+        )
+    )
     vstore.get_or_create()
 
     files = store.get_files()
+    priority = SyncPriority.load()
+    files = priority.sort(files, store.get_added(files) if priority.order == "added" else None)
 
-    cprint(f"Syncing {len(files)} files from local to OpenAI", "green")
+    cprint(f"Syncing {len(files)} files from local to {'the local store' if backend == 'local' else 'OpenAI'}", "green")
+
+    result = vstore.sync(files, store.get_attributes(files, hashes), ChunkingPolicy.load())
+    hashes.save()
+
+    # Cached responses are keyed on the store contents, so entries for the previous contents can never hit
+    if result.files_saved > 0 or result.files_reused > 0 or result.files_deleted > 0:
+        ResponseCache().clear()
+
+    if source == "zotero":
+        index = MetadataIndex()
+        added = index.refresh(vstore.get_files(), store.get_metadata, names=[f.name for f in files])
+        cprint(f"Indexed metadata for {added} files ({len(index)} total)", "blue")
 
-    result = vstore.sync(files)
     cprint("🏁 Sync results:", "green")
     cprint(
         f"Saved: {result.files_saved} | Deleted: {result.files_deleted} | Skipped: {result.files_skipped} ",
         "yellow",
     )
+    if result.files_reused > 0:
+        cprint(f"Reused: {result.files_reused} files uploaded for other stores", "yellow")
     cprint(f"Remote count: {result.remote_count}", "yellow")
     cprint(f"Duration: {result.duration:.2f} seconds", "yellow")
+
+    if run_gc and backend != "local":
+        collect_garbage(workers=workers)
@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+
+import click
+from termcolor import cprint
+
+from vecsync.chat.usage import Budget, UsageLedger
+from vecsync.settings import Settings
+
+
+@click.command()
+@click.option(
+    "--by",
+    type=click.Choice(["day", "thread", "session"]),
+    default="day",
+    show_default=True,
+    help="How to group the usage.",
+)
+@click.option("--days", type=click.IntRange(min=1), default=30, show_default=True, help="The number of days to show.")
+def show(by: str, days: int):
+    """Show the tokens used by chat runs."""
+    ledger = UsageLedger()
+    summary = ledger.summary(by=by, since=date.today() - timedelta(days=days - 1))
+
+    if len(summary) == 0:
+        cprint(f"No usage in the last {days} days.", "green")
+        return
+
+    cprint(f"Usage by {by} in the last {days} days:", "green", attrs=["bold"])
+    for key, usage in summary.items():
+        cprint(f"  {key or '(none)'}: {usage.describe()}", "yellow")
+
+    budget = Budget.load(Settings())
+    if budget is not None:
+        used = ledger.total().total_tokens
+        cprint(f"Today: {used:,} of {budget.daily_tokens:,} tokens ({budget.action} when used up)", "green")
+
+
+@click.command()
+@click.argument("tokens", type=click.IntRange(min=1), required=False)
+@click.option("--warn", is_flag=True, help="Warn instead of refusing runs once the budget is used up.")
+@click.option("--clear", is_flag=True, help="Remove the budget.")
+def budget(tokens: int | None, warn: bool, clear: bool):
+    """Set the daily token budget shared by all chat, ask and serve processes."""
+    settings = Settings()
+
+    if clear:
+        del settings["token_budget"]
+        cprint("Token budget removed.", "green")
+    elif tokens is not None:
+        Budget(daily_tokens=tokens, action="warn" if warn else "refuse").save(settings)
+        cprint(f"Daily token budget set to {tokens:,} tokens.", "green")
+
+    match Budget.load(settings):
+        case Budget() as current:
+            cprint(f"Daily token budget: {current.daily_tokens:,} tokens ({current.action} when used up)", "yellow")
+        case None:
+            cprint("No token budget set.", "yellow")
+
+
+@click.group(name="usage")
+def group():
+    """Commands to review token usage and budgets"""
+    pass
+
+
+group.add_command(show)
+group.add_command(budget)
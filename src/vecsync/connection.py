@@ -0,0 +1,119 @@
+import threading
+from importlib.util import find_spec
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, ConfigDict
+
+from vecsync.settings import SettingExists, Settings
+
+if TYPE_CHECKING:
+    # Only needed for annotations, so `vs settings` doesn't import openai
+    from openai import OpenAI
+
+# One client per set of options, shared by the whole process
+_clients: dict["ConnectionOptions", "OpenAI"] = {}
+_clients_lock = threading.Lock()
+
+
+class ConnectionOptions(BaseModel):
+    """HTTP connection pool and timeout options for the OpenAI API, stored in the settings file.
+
+    Every store, chat client and command in the process shares one OpenAI client built from these
+    options, so concurrent requests reuse warm keep-alive connections instead of each opening their own.
+
+    Parameters
+    ----------
+    max_connections : int
+        The maximum number of open connections to the API.
+    max_keepalive_connections : int
+        The maximum number of idle connections kept open for reuse.
+    keepalive_expiry : float
+        Seconds an idle connection is kept open.
+    connect_timeout : float
+        Seconds to wait for a connection to be established.
+    read_timeout : float
+        Seconds to wait for data from the API, including between streamed events.
+    max_retries : int
+        The number of times a failed request is retried.
+    http2 : bool
+        Use HTTP/2 when the ``h2`` package is installed, multiplexing requests over fewer connections.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    max_connections: int = 64
+    max_keepalive_connections: int = 32
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 600.0
+    max_retries: int = 2
+    http2: bool = True
+
+    @classmethod
+    def load(cls, settings: Settings | None = None) -> "ConnectionOptions":
+        match (settings or Settings())["connection"]:
+            case SettingExists() as x:
+                return cls(**x.value)
+            case _:
+                return cls()
+
+    def save(self, settings: Settings):
+        settings["connection"] = self.model_dump()
+
+
+def http2_available() -> bool:
+    return find_spec("h2") is not None
+
+
+def openai_client(options: ConnectionOptions | None = None) -> "OpenAI":
+    """Get the OpenAI client shared by the process.
+
+    The client is created on first use with the API key from the environment or a ``.env`` file, and
+    reused by every later call with the same options.
+
+    Parameters
+    ----------
+    options : ConnectionOptions | None
+        The connection options. If None, the options are loaded from the settings file.
+
+    Returns
+    -------
+    OpenAI
+        The shared OpenAI client.
+    """
+    options = options or ConnectionOptions.load()
+
+    with _clients_lock:
+        if options not in _clients:
+            _clients[options] = _create_client(options)
+        return _clients[options]
+
+
+def _create_client(options: ConnectionOptions) -> "OpenAI":
+    from dotenv import load_dotenv
+    from openai import DEFAULT_CONNECTION_LIMITS, DefaultHttpxClient, OpenAI, Timeout
+
+    load_dotenv(override=True)
+
+    # The limits are built with the same HTTP library as the SDK's own defaults
+    limits = type(DEFAULT_CONNECTION_LIMITS)(
+        max_connections=options.max_connections,
+        max_keepalive_connections=options.max_keepalive_connections,
+        keepalive_expiry=options.keepalive_expiry,
+    )
+
+    http_client = DefaultHttpxClient(
+        limits=limits,
+        timeout=Timeout(options.read_timeout, connect=options.connect_timeout),
+        http2=options.http2 and http2_available(),
+    )
+
+    return OpenAI(http_client=http_client, max_retries=options.max_retries)
+
+
+def reset_clients():
+    """Close the shared clients so the next call to ``openai_client`` creates a new one."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
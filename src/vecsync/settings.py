@@ -1,10 +1,21 @@
 import json
+import os
+import sys
+import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
 from appdirs import user_config_dir
 from pydantic import BaseModel
 
+if sys.platform == "win32":  # pragma: no cover
+    import msvcrt
+else:
+    import fcntl
+
 
 class SettingExists(BaseModel):
     key: str
@@ -20,30 +31,196 @@ class SettingData(BaseModel):
     data: str
 
 
+# Parsed settings are shared by every Settings instance in the process and keyed by file path. Each entry
+# holds the (mtime, size, inode) signature of the file it was parsed from so writes by other processes
+# are picked up on the next read.
+_cache: dict[Path, tuple[tuple[int, int, int], dict[str, Any]]] = {}
+_locks: dict[Path, "FileLock"] = {}
+_locks_guard = threading.Lock()
+
+
+class FileLock:
+    """Exclusive lock held across threads and processes.
+
+    The lock is taken on a sidecar ``.lock`` file so the settings file itself can be atomically
+    replaced while the lock is held. It is re-entrant within a thread. Use ``FileLock.get`` to obtain
+    the single lock instance shared by everything in the process that protects the same file.
+
+    Parameters
+    ----------
+    path : Path
+        The path of the file to protect.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path.with_name(path.name + ".lock")
+        self._depth = 0
+        self._handle = None
+        self._thread_lock = threading.RLock()
+
+    @classmethod
+    def get(cls, path: Path) -> "FileLock":
+        with _locks_guard:
+            if path not in _locks:
+                _locks[path] = cls(path)
+            return _locks[path]
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+
+        if self._depth == 0:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = open(self.path, "a+b")
+            if sys.platform == "win32":  # pragma: no cover
+                self._handle.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(self._handle.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            else:
+                fcntl.flock(self._handle.fileno(), fcntl.LOCK_EX)
+
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._depth -= 1
+
+        if self._depth == 0:
+            if sys.platform == "win32":  # pragma: no cover
+                self._handle.seek(0)
+                msvcrt.locking(self._handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+            self._handle.close()
+            self._handle = None
+
+        self._thread_lock.release()
+        return False
+
+
 class Settings:
+    """Key-value settings persisted as JSON.
+
+    Reads are served from an in-process cache which is only re-parsed when the file changes on disk.
+    Writes take a cross-process lock, re-read the latest data and atomically replace the file, so
+    concurrent ``vs`` processes never lose updates or observe a partially written file. Several
+    updates can be grouped into a single write with ``batch()``.
+
+    Parameters
+    ----------
+    path : Path | None
+        The path to the settings file. If None, the default location in the user config directory is used.
+    """
+
     def __init__(self, path: Path | None = None):
-        self.file = path or Path(user_config_dir("vecsync")) / "settings.json"
+        self.file = Path(path) if path is not None else Path(user_config_dir("vecsync")) / "settings.json"
+        self.lock = FileLock.get(self.file)
+        # Each thread batches its own updates, so a batch in one thread never captures another's writes
+        self._local = threading.local()
 
         if not self.file.exists():
             self.create()
 
+    @property
+    def _pending(self) -> dict[str, Any] | None:
+        return getattr(self._local, "pending", None)
+
+    @_pending.setter
+    def _pending(self, value: dict[str, Any] | None):
+        self._local.pending = value
+
     def create(self):
-        self.file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.file, "w") as f:
-            json.dump({}, f)  # initialize empty JSON
+        with self.lock:
+            if not self.file.exists():
+                self._write({})  # initialize empty JSON
 
     def delete(self):
-        if self.file.exists():
-            self.file.unlink()
+        with self.lock:
+            if self.file.exists():
+                self.file.unlink()
+            _cache.pop(self.file, None)
 
     def info(self) -> SettingData:
         """Get the location and data of the settings file."""
         return SettingData(location=str(self.file), data=self.file.read_text())
 
-    def __getitem__(self, key: str) -> SettingExists | SettingMissing:
+    @staticmethod
+    def _signature(stat: os.stat_result) -> tuple[int, int, int]:
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _read(self) -> dict[str, Any]:
+        """Return the current settings, parsing the file only if it changed since the last read."""
+        if self._pending is not None:
+            return self._pending
+
+        try:
+            signature = self._signature(self.file.stat())
+        except FileNotFoundError:
+            return {}
+
+        cached = _cache.get(self.file)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
         with open(self.file) as f:
             data = json.load(f)
-            result = data.get(key, None)
+
+        _cache[self.file] = (signature, data)
+        return data
+
+    def _write(self, data: dict[str, Any]):
+        """Atomically replace the settings file. Must be called while holding the lock."""
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.file.parent, prefix=f".{self.file.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.file)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        _cache[self.file] = (self._signature(self.file.stat()), data)
+
+    @contextmanager
+    def batch(self) -> Iterator["Settings"]:
+        """Group several updates into a single locked read-modify-write.
+
+        Changes made inside the block are written once on exit and discarded if an exception is raised.
+        """
+        with self.lock:
+            if self._pending is not None:
+                yield self
+                return
+
+            self._pending = dict(self._read())
+            try:
+                yield self
+                pending = self._pending
+            finally:
+                self._pending = None
+            self._write(pending)
+
+    def _update(self, key: str, value: Any | None = None, remove: bool = False):
+        with self.lock:
+            data = self._read() if self._pending is not None else dict(self._read())
+
+            if remove:
+                data.pop(key, None)
+            else:
+                data[key] = value
+
+            if self._pending is None:
+                self._write(data)
+
+    def __getitem__(self, key: str) -> SettingExists | SettingMissing:
+        result = self._read().get(key, None)
 
         if result is None:
             return SettingMissing(key=key)
@@ -51,19 +228,7 @@ class Settings:
             return SettingExists(key=key, value=result)
 
     def __delitem__(self, key: str):
-        with open(self.file) as f:
-            data = json.load(f)
-
-        if key in data:
-            data.pop(key)
-
-        with open(self.file, "w") as f:
-            json.dump(data, f)
-
-    def __setitem__(self, key: str, value: str):
-        with open(self.file) as f:
-            data = json.load(f)
-            data[key] = value
+        self._update(key, remove=True)
 
-        with open(self.file, "w") as f:
-            json.dump(data, f)
+    def __setitem__(self, key: str, value: Any):
+        self._update(key, value)
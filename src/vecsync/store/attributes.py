@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+
+from appdirs import user_cache_dir
+
+# Attribute values are limited to 512 characters by the OpenAI API
+MAX_VALUE_LENGTH = 512
+
+OPERATORS = {"!=": "ne", ">=": "gte", "<=": "lte", "=": "eq", ">": "gt", "<": "lt"}
+
+FILTER_PATTERN = re.compile(r"^\s*(\w+)\s*(!=|>=|<=|=|>|<)\s*(.*?)\s*$")
+
+
+def file_hash(path: Path) -> str:
+    """Get the SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class HashCache:
+    """Local cache of file digests keyed by path, reused while a file's size and modification time match.
+
+    Every sync needs the content hash of each file, and reading a large library again on every sync
+    takes longer than the sync itself. Only new and changed files are read, as the local store does when
+    indexing. The cache is persisted as JSON in the user cache directory and can be used from several
+    threads.
+
+    Parameters
+    ----------
+    path : Path | None
+        The path to the cache file. If None, the default location in the user cache directory is used.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.file = path or Path(user_cache_dir("vecsync")) / "hashes.json"
+        self._entries: dict[str, dict] | None = None
+        self._lock = threading.Lock()
+
+    def load(self) -> dict[str, dict]:
+        """Load the cache from disk, returning an empty cache if no file exists or it can't be read."""
+        with self._lock:
+            if self._entries is None:
+                try:
+                    with open(self.file) as f:
+                        self._entries = json.load(f)
+                except (FileNotFoundError, ValueError):
+                    self._entries = {}
+            return self._entries
+
+    def hash(self, path: Path) -> str:
+        """Get the SHA-256 digest of a file's contents, reading the file only if it changed."""
+        key = str(Path(path).resolve())
+        stat = path.stat()
+        entry = self.load().get(key)
+        if entry is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["hash"]
+
+        digest = file_hash(path)
+        with self._lock:
+            self._entries[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": digest}
+        return digest
+
+    def save(self):
+        """Atomically write the cache, dropping the entries of files which no longer exist."""
+        entries = {k: v for k, v in self.load().items() if os.path.exists(k)}
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.file.parent, prefix=f".{self.file.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.file)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+
+def file_attributes(
+    path: Path,
+    source: str,
+    root: Path | None = None,
+    collection: str | None = None,
+    year: int | None = None,
+    hashes: HashCache | None = None,
+) -> dict[str, str | int]:
+    """Build the attributes stored with a file in the vector store, which searches can filter on.
+
+    Parameters
+    ----------
+    path : Path
+        The path of the local file.
+    source : str
+        The source the file was synced from, such as ``file`` or ``zotero``.
+    root : Path | None
+        The directory the source was read from. If given, the path is stored relative to it.
+    collection : str | None
+        The name of the collection the file belongs to, if any.
+    year : int | None
+        The publication year of the document, if known.
+    hashes : HashCache | None
+        The cache of file digests. If None, the file is read to hash it.
+
+    Returns
+    -------
+    dict[str, str | int]
+        The attributes, omitting any which are unknown.
+    """
+    relative = path.relative_to(root) if root is not None and path.is_relative_to(root) else path
+
+    attributes = {
+        "source": source,
+        "collection": collection,
+        "year": year,
+        "hash": hashes.hash(path) if hashes is not None else file_hash(path),
+        # The end of a long path is the part which identifies the file
+        "path": relative.as_posix()[-MAX_VALUE_LENGTH:],
+    }
+    return {key: value for key, value in attributes.items() if value is not None}
+
+
+def _parse_value(value: str) -> str | int | float | bool:
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value.strip("\"'")
+
+
+def parse_filters(expressions: list[str] | tuple[str, ...]) -> dict | None:
+    """Parse filter expressions such as ``year>=2020`` into an OpenAI attribute filter.
+
+    Each expression compares an attribute with a value using ``=``, ``!=``, ``>``, ``>=``, ``<`` or
+    ``<=``. Numbers and ``true`` or ``false`` are compared as such, anything else as text. Files must
+    match every expression.
+
+    Parameters
+    ----------
+    expressions : list[str] | tuple[str, ...]
+        The filter expressions.
+
+    Returns
+    -------
+    dict | None
+        The comparison filter, a compound ``and`` filter for several expressions, or None if there are no
+        expressions.
+
+    Raises
+    ------
+    ValueError
+        If an expression can't be parsed.
+    """
+    filters = []
+    for expression in expressions:
+        match = FILTER_PATTERN.match(expression)
+        if match is None or match.group(3) == "":
+            raise ValueError(f"Invalid filter '{expression}', expected a comparison such as year>=2020")
+
+        key, operator, value = match.groups()
+        filters.append({"type": OPERATORS[operator], "key": key, "value": _parse_value(value)})
+
+    if len(filters) == 0:
+        return None
+    if len(filters) == 1:
+        return filters[0]
+    return {"type": "and", "filters": filters}
+
+
+def matches(filters: dict | None, attributes: dict) -> bool:
+    """Check whether a file's attributes match a filter, as the OpenAI API would."""
+    if filters is None:
+        return True
+
+    match filters["type"]:
+        case "and":
+            return all(matches(f, attributes) for f in filters["filters"])
+        case "or":
+            return any(matches(f, attributes) for f in filters["filters"])
+
+    value, expected = attributes.get(filters["key"]), filters["value"]
+    if value is None:
+        return False
+
+    try:
+        match filters["type"]:
+            case "eq":
+                return value == expected
+            case "ne":
+                return value != expected
+            case "gt":
+                return value > expected
+            case "gte":
+                return value >= expected
+            case "lt":
+                return value < expected
+            case "lte":
+                return value <= expected
+    except TypeError:
+        # A number compared with text never matches
+        return False
+
+    raise ValueError(f"Unknown filter type '{filters['type']}'")
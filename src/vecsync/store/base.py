@@ -14,3 +14,10 @@ class StoredFile(BaseModel):
     id: str
     name: str
     status: FileStatus
+
+
+class SearchResult(BaseModel):
+    file_id: str
+    filename: str
+    score: float
+    text: str
@@ -0,0 +1,98 @@
+from pathlib import Path
+
+from pydantic import BaseModel, field_validator
+
+from vecsync.settings import SettingExists, Settings
+
+
+class ChunkingProfile(BaseModel):
+    """How a file is split into chunks when it is attached to the vector store.
+
+    Smaller chunks retrieve more precise passages and send fewer tokens with each answer, but split
+    context which spans paragraphs. Larger chunks keep more context together at the cost of more tokens.
+
+    Parameters
+    ----------
+    max_chunk_size_tokens : int
+        The maximum number of tokens in a chunk, between 100 and 4096.
+    chunk_overlap_tokens : int
+        The number of tokens shared by consecutive chunks, at most half the chunk size.
+    """
+
+    max_chunk_size_tokens: int
+    chunk_overlap_tokens: int
+
+    def strategy(self) -> dict:
+        """Get the chunking strategy parameter of the OpenAI API."""
+        return {"type": "static", "static": self.model_dump()}
+
+    def words(self) -> tuple[int, int]:
+        """Get the chunk size and overlap in words for the local store, at about 0.75 words per token."""
+        return self.max_chunk_size_tokens * 3 // 4, self.chunk_overlap_tokens * 3 // 4
+
+
+# The "auto" profile leaves chunking to OpenAI, which currently uses 800 tokens with a 400 token overlap
+PROFILES: dict[str, ChunkingProfile | None] = {
+    "auto": None,
+    "small": ChunkingProfile(max_chunk_size_tokens=300, chunk_overlap_tokens=60),
+    "medium": ChunkingProfile(max_chunk_size_tokens=800, chunk_overlap_tokens=200),
+    "large": ChunkingProfile(max_chunk_size_tokens=1600, chunk_overlap_tokens=400),
+}
+
+
+class ChunkingPolicy(BaseModel):
+    """The chunking profile used for each synced file, stored in the settings file.
+
+    A profile can be chosen per source, and large files such as books can use a different profile than
+    papers. The large file rule is checked first, so a book from a source with its own profile still uses
+    the large file profile. Files matching neither rule use the default profile.
+
+    Parameters
+    ----------
+    default : str
+        The profile used when no other rule applies.
+    sources : dict[str, str]
+        The profile used for files from each source, such as ``zotero``.
+    large_file_bytes : int | None
+        Files of at least this size use ``large_file_profile``. If None, file size is not considered.
+    large_file_profile : str
+        The profile used for large files.
+    """
+
+    default: str = "auto"
+    sources: dict[str, str] = {}
+    large_file_bytes: int | None = None
+    large_file_profile: str = "large"
+
+    @field_validator("default", "large_file_profile")
+    @classmethod
+    def check_profile(cls, name: str) -> str:
+        if name not in PROFILES:
+            raise ValueError(f"Unknown chunking profile '{name}', expected one of {', '.join(PROFILES)}")
+        return name
+
+    @field_validator("sources")
+    @classmethod
+    def check_sources(cls, sources: dict[str, str]) -> dict[str, str]:
+        for name in sources.values():
+            cls.check_profile(name)
+        return sources
+
+    @classmethod
+    def load(cls, settings: Settings | None = None) -> "ChunkingPolicy":
+        match (settings or Settings())["chunking"]:
+            case SettingExists() as x:
+                return cls(**x.value)
+            case _:
+                return cls()
+
+    def save(self, settings: Settings):
+        settings["chunking"] = self.model_dump()
+
+    def select(self, path: Path, source: str | None = None) -> str:
+        """Get the name of the profile used for a file, checking the large file rule before the source."""
+        if self.large_file_bytes is not None and path.stat().st_size >= self.large_file_bytes:
+            return self.large_file_profile
+        if source is not None and source in self.sources:
+            return self.sources[source]
+        return self.default
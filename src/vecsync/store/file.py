@@ -1,5 +1,7 @@
 from pathlib import Path
 
+from vecsync.store.attributes import HashCache, file_attributes
+
 
 class FileStore:
     def __init__(self, path: Path | None = None):
@@ -16,3 +18,15 @@ class FileStore:
             if file.is_file():
                 files.append(file)
         return files
+
+    def get_attributes(self, files: list[Path], hashes: HashCache | None = None) -> dict[str, dict]:
+        """Get the vector store attributes of each file keyed by file name."""
+        return {f.name: file_attributes(f, "file", root=self.path, hashes=hashes) for f in files}
+
+    def get_added(self, files: list[Path]) -> dict[str, float]:
+        """Get the time each file was added to the directory keyed by file name.
+
+        Copying or moving a file into the directory updates its status change time, which stands in for the
+        time it was added.
+        """
+        return {f.name: f.stat().st_ctime for f in files}
@@ -0,0 +1,460 @@
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import time
+from collections.abc import Callable
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+from appdirs import user_data_dir
+from pydantic import BaseModel
+from termcolor import cprint
+
+from vecsync.store.attributes import matches
+from vecsync.store.base import FileStatus, SearchResult, StoredFile
+from vecsync.store.chunking import PROFILES, ChunkingPolicy
+from vecsync.store.openai import SyncOperationResult, _progress
+
+TOKEN = re.compile(r"\w+")
+
+# BM25 term frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN.findall(text.lower())
+
+
+def chunk_words(text: str, size: int = 200, overlap: int = 40) -> list[str]:
+    """Split text into overlapping windows of words."""
+    words = text.split()
+    if len(words) == 0:
+        return []
+
+    step = max(1, size - overlap)
+    return [" ".join(words[i : i + size]) for i in range(0, max(1, len(words) - overlap), step)]
+
+
+def extract_text(path: Path) -> str:
+    """Extract the text of a PDF or plain text file."""
+    if path.suffix.lower() != ".pdf":
+        return path.read_text(errors="ignore")
+
+    try:
+        from pypdf import PdfReader
+    except ImportError as e:
+        raise ImportError("Indexing PDFs locally requires pypdf. Install it with `pip install vecsync[local]`.") from e
+
+    return "\n".join(page.extract_text() or "" for page in PdfReader(path).pages)
+
+
+class LocalStoreInfo(BaseModel):
+    id: str
+    name: str
+    created_at: int
+
+
+class IndexedFile(BaseModel):
+    name: str
+    size: int
+    mtime: float
+    chunks: int
+    embedded: bool = False
+    attributes: dict = {}
+    chunking: str = "auto"
+
+
+class Manifest(BaseModel):
+    store: LocalStoreInfo
+    files: dict[str, IndexedFile] = {}
+    vocabulary: int = 0
+    index: int = 0
+
+
+class LocalVectorStore:
+    """Offline vector store backed by an on-disk BM25 index.
+
+    Text is extracted from each file, split into chunks and indexed locally, so search works without a
+    network connection. Every file is tokenized once into its own segment, and on sync only new and
+    changed files are extracted again. The segments are then merged into a term-major inverted index
+    of flat NumPy arrays, which searches memory-map instead of loading. A query scores every chunk
+    containing one of its terms in a few vectorized operations.
+
+    With an ``embed`` function, each chunk is also embedded and the BM25 score is blended with the
+    cosine similarity to the query.
+
+    Parameters
+    ----------
+    name : str
+        The name of the store.
+    path : Path | None
+        The directory holding the local stores. If None, the default location in the user data
+        directory is used.
+    embed : Callable[[list[str]], np.ndarray] | None
+        Returns one embedding row per text. If None, chunks are ranked by BM25 only.
+    semantic_weight : float
+        The weight of the cosine similarity in the blended score when embeddings are available.
+    chunk_size : int
+        The number of words in each chunk.
+    chunk_overlap : int
+        The number of words shared by consecutive chunks.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: Path | None = None,
+        embed: Callable[[list[str]], np.ndarray] | None = None,
+        semantic_weight: float = 0.5,
+        chunk_size: int = 200,
+        chunk_overlap: int = 40,
+    ):
+        self.name = name
+        root = Path(path) if path is not None else Path(user_data_dir("vecsync")) / "local"
+        self.path = root / name
+        self.embed = embed
+        self.semantic_weight = semantic_weight
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.store: LocalStoreInfo | None = None
+        self._index: dict[str, np.ndarray] | None = None
+        self._index_version: int | None = None
+
+    @property
+    def _manifest_file(self) -> Path:
+        return self.path / "manifest.json"
+
+    def _read_manifest(self) -> Manifest:
+        if not self._manifest_file.exists():
+            raise ValueError(f"Local vector store with name {self.name} not found.")
+        return Manifest.model_validate_json(self._manifest_file.read_text())
+
+    def _write_manifest(self, manifest: Manifest):
+        # Written last and replaced atomically, so readers see either the old or the new index
+        tmp = self._manifest_file.with_suffix(".tmp")
+        tmp.write_text(manifest.model_dump_json())
+        os.replace(tmp, self._manifest_file)
+
+    def create(self) -> LocalStoreInfo:
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.store = LocalStoreInfo(id=f"local-{self.name}", name=self.name, created_at=int(time.time()))
+        self._write_manifest(Manifest(store=self.store))
+        return self.store
+
+    def get(self, store_id: str | None = None) -> LocalStoreInfo:
+        self.store = self._read_manifest().store
+        return self.store
+
+    def get_or_create(self) -> LocalStoreInfo:
+        try:
+            return self.get()
+        except ValueError:
+            return self.create()
+
+    def get_files(self) -> list[StoredFile]:
+        manifest = self._read_manifest()
+        return [StoredFile(id=k, name=v.name, status=FileStatus.ATTACHED) for k, v in manifest.files.items()]
+
+    def get_attached_ids(self) -> set[str]:
+        """Get the IDs of all indexed files."""
+        return set(self._read_manifest().files)
+
+    def get_file_names(self) -> dict[str, str]:
+        """Get the names of all indexed files keyed by file ID."""
+        try:
+            return {k: v.name for k, v in self._read_manifest().files.items()}
+        except ValueError:
+            return {}
+
+    def delete(self):
+        cprint(f"👋 Deleting local vector store {self.name}", "red")
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.store = None
+        self._index = None
+
+    @staticmethod
+    def file_id(name: str) -> str:
+        return "file-local-" + hashlib.sha1(name.encode()).hexdigest()[:24]
+
+    def _vocabulary(self) -> dict[str, int]:
+        file = self.path / "vocabulary.json"
+        return json.loads(file.read_text()) if file.exists() else {}
+
+    def _index_file(self, file: Path, file_id: str, vocabulary: dict[str, int], chunking: str = "auto") -> int:
+        """Tokenize a file into its segment, adding any new terms to the vocabulary."""
+        # The "auto" profile uses the store's own chunk size
+        profile = PROFILES.get(chunking)
+        size, overlap = profile.words() if profile is not None else (self.chunk_size, self.chunk_overlap)
+        chunks = chunk_words(extract_text(file), size, overlap)
+
+        indptr = [0]
+        terms, counts = [], []
+        for chunk in chunks:
+            ids, chunk_counts = np.unique(
+                [vocabulary.setdefault(t, len(vocabulary)) for t in tokenize(chunk)], return_counts=True
+            )
+            terms.append(ids)
+            counts.append(chunk_counts)
+            indptr.append(indptr[-1] + len(ids))
+
+        segment = {
+            "indptr": np.array(indptr, dtype=np.int64),
+            "terms": np.concatenate(terms).astype(np.int32) if terms else np.zeros(0, dtype=np.int32),
+            "counts": np.concatenate(counts).astype(np.int32) if counts else np.zeros(0, dtype=np.int32),
+        }
+        if self.embed is not None and len(chunks) > 0:
+            segment["embeddings"] = self._normalize(np.asarray(self.embed(chunks), dtype=np.float32))
+
+        segments = self.path / "segments"
+        segments.mkdir(exist_ok=True)
+        np.savez(segments / f"{file_id}.npz", **segment)
+        (segments / f"{file_id}.json").write_text(json.dumps(chunks))
+        return len(chunks)
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    def _build_index(self, manifest: Manifest) -> int:
+        """Merge the segments into a new version of the inverted index."""
+        version = manifest.index + 1
+        directory = self.path / f"index-{version}"
+        directory.mkdir(exist_ok=True)
+
+        file_ids = list(manifest.files)
+        lengths, chunk_file, chunk_offset, chunk_terms, chunk_counts, chunk_ids, embeddings = [], [], [], [], [], [], []
+        offset = 0
+        for number, file_id in enumerate(file_ids):
+            with np.load(self.path / "segments" / f"{file_id}.npz") as segment:
+                indptr, terms, counts = segment["indptr"], segment["terms"], segment["counts"]
+                n = len(indptr) - 1
+                sizes = np.diff(indptr)
+
+                owners = np.repeat(np.arange(n), sizes)
+                lengths.append(np.bincount(owners, weights=counts, minlength=n))
+                chunk_file.append(np.full(n, number, dtype=np.int32))
+                chunk_offset.append(np.arange(n, dtype=np.int32))
+                chunk_ids.append((owners + offset).astype(np.int32))
+                chunk_terms.append(terms)
+                chunk_counts.append(counts)
+                if "embeddings" in segment:
+                    embeddings.append(segment["embeddings"])
+                offset += n
+
+        terms = np.concatenate(chunk_terms) if chunk_terms else np.zeros(0, dtype=np.int32)
+        order = np.argsort(terms, kind="stable")
+        index = {
+            "term_indptr": np.concatenate([[0], np.cumsum(np.bincount(terms, minlength=manifest.vocabulary))]),
+            "postings": (np.concatenate(chunk_ids) if chunk_ids else terms)[order],
+            "tf": (np.concatenate(chunk_counts) if chunk_counts else terms)[order].astype(np.float32),
+            "lengths": (np.concatenate(lengths) if lengths else np.zeros(0)).astype(np.float32),
+            "chunk_file": np.concatenate(chunk_file) if chunk_file else np.zeros(0, dtype=np.int32),
+            "chunk_offset": np.concatenate(chunk_offset) if chunk_offset else np.zeros(0, dtype=np.int32),
+        }
+        # Semantic scores are only used when every chunk has been embedded
+        if len(embeddings) == len(file_ids) and len(file_ids) > 0:
+            index["embeddings"] = np.concatenate(embeddings)
+
+        for key, array in index.items():
+            np.save(directory / f"{key}.npy", array)
+        (directory / "files.json").write_text(json.dumps(file_ids))
+        return version
+
+    def _load_index(self, manifest: Manifest) -> dict | None:
+        if manifest.index == 0:
+            return None
+        if self._index_version != manifest.index:
+            directory = self.path / f"index-{manifest.index}"
+            self._index = {p.stem: np.load(p, mmap_mode="r") for p in directory.glob("*.npy")}
+            self._index["files"] = json.loads((directory / "files.json").read_text())
+            self._index["vocabulary"] = self._vocabulary()
+            self._index_version = manifest.index
+        return self._index
+
+    def sync(
+        self,
+        files: list[Path],
+        attributes: dict[str, dict] | None = None,
+        chunking: ChunkingPolicy | None = None,
+    ) -> SyncOperationResult:
+        """Index new and changed files and remove deleted files from the index.
+
+        Parameters
+        ----------
+        files : list[Path]
+            The local files which the store should contain.
+        attributes : dict[str, dict] | None
+            Attributes to store with each file keyed by file name, which searches can filter on.
+        chunking : ChunkingPolicy | None
+            The policy choosing how each file is chunked. Files are indexed again when their profile
+            changes. If None, the store's chunk size is used.
+
+        Returns
+        -------
+        SyncOperationResult
+            The number of files indexed, deleted and skipped.
+        """
+        ts_start = perf_counter()
+        if not self.store:
+            self.get_or_create()
+
+        manifest = self._read_manifest()
+        vocabulary = self._vocabulary()
+
+        attributes = attributes or {}
+        incoming = {self.file_id(f.name): f for f in files}
+        files_to_remove = [k for k in manifest.files if k not in incoming]
+        files_to_index = []
+        for file_id, file in incoming.items():
+            stat = file.stat()
+            indexed = manifest.files.get(file_id)
+            profile = chunking.select(file, attributes.get(file.name, {}).get("source")) if chunking else "auto"
+            if (
+                indexed is None
+                or indexed.size != stat.st_size
+                or indexed.mtime != stat.st_mtime
+                or indexed.chunking != profile
+                or (self.embed is not None and not indexed.embedded)
+            ):
+                files_to_index.append((file_id, file, stat, profile))
+
+        if len(files_to_index) > 0:
+            cprint(f"Indexing {len(files_to_index)} files in local vector store", "blue")
+            for file_id, file, stat, profile in _progress(files_to_index):
+                chunks = self._index_file(file, file_id, vocabulary, profile)
+                manifest.files[file_id] = IndexedFile(
+                    name=file.name,
+                    size=stat.st_size,
+                    mtime=stat.st_mtime,
+                    chunks=chunks,
+                    embedded=self.embed is not None,
+                    chunking=profile,
+                )
+
+        # Attributes are kept in the manifest, so changing them doesn't require indexing the file again
+        retagged = False
+        for file_id, file in incoming.items():
+            indexed = manifest.files[file_id]
+            if file.name in attributes and indexed.attributes != attributes[file.name]:
+                indexed.attributes = attributes[file.name]
+                retagged = True
+
+        for file_id in files_to_remove:
+            del manifest.files[file_id]
+            for suffix in (".npz", ".json"):
+                (self.path / "segments" / f"{file_id}{suffix}").unlink(missing_ok=True)
+
+        if len(files_to_index) > 0 or len(files_to_remove) > 0:
+            (self.path / "vocabulary.json").write_text(json.dumps(vocabulary))
+            manifest.vocabulary = len(vocabulary)
+
+            previous = manifest.index
+            manifest.index = self._build_index(manifest)
+            self._write_manifest(manifest)
+            # Open memory maps of the old index stay valid until they are closed
+            shutil.rmtree(self.path / f"index-{previous}", ignore_errors=True)
+        elif retagged:
+            self._write_manifest(manifest)
+
+        return SyncOperationResult(
+            files_saved=len(files_to_index),
+            files_deleted=len(files_to_remove),
+            files_skipped=len(incoming) - len(files_to_index),
+            remote_count=len(manifest.files),
+            duration=perf_counter() - ts_start,
+        )
+
+    def search(
+        self, query: str, max_results: int = 10, store_id: str | None = None, filters: dict | None = None
+    ) -> list[SearchResult]:
+        """Search the index for the chunks most relevant to a query.
+
+        Parameters
+        ----------
+        query : str
+            The search query.
+        max_results : int
+            The maximum number of chunks to return.
+        store_id : str | None
+            Unused, accepted for compatibility with ``OpenAiVectorStore.search``.
+        filters : dict | None
+            An attribute filter, as returned by ``parse_filters``, which files must match. If None, every
+            file is searched.
+
+        Returns
+        -------
+        list[SearchResult]
+            The matching chunks, most relevant first.
+        """
+        manifest = self._read_manifest()
+        index = self._load_index(manifest)
+        if index is None or len(index["lengths"]) == 0:
+            return []
+
+        vocabulary = index["vocabulary"]
+        terms = np.unique([vocabulary[t] for t in tokenize(query) if t in vocabulary]).astype(np.int64)
+        scores = self._bm25(index, terms)
+
+        if "embeddings" in index and self.embed is not None:
+            query_embedding = self._normalize(np.asarray(self.embed([query]), dtype=np.float32))[0]
+            similarity = np.asarray(index["embeddings"] @ query_embedding)
+            top = scores.max()
+            scores = (1 - self.semantic_weight) * (scores / top if top > 0 else scores) + (
+                self.semantic_weight * similarity
+            )
+
+        if filters is not None:
+            allowed = np.array([matches(filters, manifest.files[f].attributes) for f in index["files"]], dtype=bool)
+            scores = np.where(allowed[index["chunk_file"]], scores, 0)
+
+        k = min(max_results, len(scores))
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        ranked = ranked[scores[ranked] > 0]
+
+        # Chunk texts are only read for the files in the results
+        texts: dict[str, list[str]] = {}
+        results = []
+        for chunk in ranked:
+            file_id = index["files"][index["chunk_file"][chunk]]
+            if file_id not in texts:
+                texts[file_id] = json.loads((self.path / "segments" / f"{file_id}.json").read_text())
+            results.append(
+                SearchResult(
+                    file_id=file_id,
+                    filename=manifest.files[file_id].name,
+                    score=float(scores[chunk]),
+                    text=texts[file_id][index["chunk_offset"][chunk]],
+                )
+            )
+
+        return results
+
+    @staticmethod
+    def _bm25(index: dict, terms: np.ndarray) -> np.ndarray:
+        lengths = index["lengths"]
+        n = len(lengths)
+        scores = np.zeros(n, dtype=np.float32)
+        if len(terms) == 0:
+            return scores
+
+        indptr = index["term_indptr"]
+        starts, ends = indptr[terms], indptr[terms + 1]
+        if (ends - starts).sum() == 0:
+            return scores
+
+        # Gather the postings of all query terms at once
+        postings = np.concatenate([index["postings"][s:e] for s, e in zip(starts, ends, strict=True)])
+        tf = np.concatenate([index["tf"][s:e] for s, e in zip(starts, ends, strict=True)])
+        df = ends - starts
+        idf = np.log(1 + (n - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[postings] / max(float(lengths.mean()), math.ulp(1)))
+        weights = np.repeat(idf, df) * tf * (BM25_K1 + 1) / (tf + norm)
+        return np.bincount(postings, weights=weights, minlength=n).astype(np.float32)
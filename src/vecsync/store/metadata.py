@@ -0,0 +1,137 @@
+import json
+import os
+import tempfile
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from appdirs import user_config_dir
+from pydantic import BaseModel
+
+from vecsync.store.base import StoredFile
+
+
+class FileMetadata(BaseModel):
+    title: str | None = None
+    authors: list[str] = []
+    year: int | None = None
+
+    def describe(self, file_name: str) -> str:
+        """Render a short bibliographic description, falling back to the file name."""
+        if not self.title:
+            return file_name
+
+        if len(self.authors) == 0:
+            byline = ""
+        elif len(self.authors) == 1:
+            byline = self.authors[0]
+        elif len(self.authors) == 2:
+            byline = f"{self.authors[0]} & {self.authors[1]}"
+        else:
+            byline = f"{self.authors[0]} et al."
+
+        year = f"({self.year})" if self.year is not None else ""
+        prefix = " ".join(x for x in [byline, year] if x)
+
+        return f"{prefix}. {self.title}" if prefix else self.title
+
+
+class MetadataIndex:
+    """Local index of bibliographic metadata keyed by remote file ID.
+
+    The index is persisted as JSON next to the settings file and loaded once into memory so that
+    chat formatting only performs dictionary lookups. Entries are added incrementally as new files
+    are synced and pruned when their remote files disappear.
+
+    Parameters
+    ----------
+    path : Path | None
+        The path to the index file. If None, the default location in the user config directory is used.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.file = path or Path(user_config_dir("vecsync")) / "metadata.json"
+        self._entries: dict[str, FileMetadata] | None = None
+
+    def load(self) -> dict[str, FileMetadata]:
+        """Load the index from disk, returning an empty index if no file exists."""
+        if self._entries is None:
+            if self.file.exists():
+                with open(self.file) as f:
+                    data = json.load(f)
+                self._entries = {k: FileMetadata(**v) for k, v in data.items()}
+            else:
+                self._entries = {}
+        return self._entries
+
+    def _write(self):
+        """Atomically replace the index file, so chats reading it never see a partial write."""
+        self.file.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.file.parent, prefix=f".{self.file.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({k: v.model_dump() for k, v in self.load().items()}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.file)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def __contains__(self, file_id: str) -> bool:
+        return file_id in self.load()
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+    def get(self, file_id: str) -> FileMetadata | None:
+        return self.load().get(file_id)
+
+    def refresh(
+        self,
+        remote_files: list[StoredFile],
+        lookup: Callable[[], dict[str, FileMetadata]],
+        names: Iterable[str] | None = None,
+    ) -> int:
+        """Bring the index in line with the remote files.
+
+        Files already in the index are left untouched. The lookup is only invoked if at least one
+        remote file which it can describe is missing from the index, so that an up-to-date index costs
+        no database access.
+
+        Parameters
+        ----------
+        remote_files : list[StoredFile]
+            The files currently stored remotely.
+        lookup : Callable[[], dict[str, FileMetadata]]
+            Returns metadata keyed by file name for all local files in a single batch.
+        names : Iterable[str] | None
+            The names of the local files the lookup describes. Other remote files, such as files synced
+            from other sources, are never looked up. If None, every remote file may be looked up.
+
+        Returns
+        -------
+        int
+            The number of entries added to the index.
+        """
+        entries = self.load()
+        remote_ids = {f.id for f in remote_files}
+        names = set(names) if names is not None else None
+        missing = {f.name: f.id for f in remote_files if f.id not in entries and (names is None or f.name in names)}
+        stale = entries.keys() - remote_ids
+
+        added = 0
+        if len(missing) > 0:
+            metadata = lookup()
+            for name, file_id in missing.items():
+                if name in metadata:
+                    entries[file_id] = metadata[name]
+                    added += 1
+
+        for file_id in stale:
+            entries.pop(file_id)
+
+        if added > 0 or len(stale) > 0:
+            self._write()
+
+        return added
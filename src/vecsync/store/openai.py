@@ -1,37 +1,114 @@
+import heapq
+import itertools
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import suppress
 from pathlib import Path
-from time import perf_counter
+from time import perf_counter, time
 
-from dotenv import load_dotenv
-from openai import OpenAI
+from openai import NotFoundError, OpenAI
 from pydantic import BaseModel
 from termcolor import cprint
-from tqdm import tqdm
 
-from vecsync.store.base import FileStatus, StoredFile
+from vecsync.connection import openai_client
+from vecsync.store.attributes import HashCache, file_hash
+from vecsync.store.base import FileStatus, SearchResult, StoredFile
+from vecsync.store.chunking import PROFILES, ChunkingPolicy
+from vecsync.store.registry import FileRegistry
+from vecsync.store.sharding import HashRing, shard_index, shard_name
+
+
+def _progress(iterable, total: int | None = None):
+    # tqdm is only needed while syncing, so it isn't imported by commands which just read the store
+    from tqdm import tqdm
+
+    return tqdm(iterable, total=total)
 
 
 class SyncOperationResult(BaseModel):
     files_saved: int
+    files_reused: int = 0
     files_deleted: int
     files_skipped: int
     remote_count: int
     duration: float
 
 
+class GarbageCollectionResult(BaseModel):
+    files_orphaned: int
+    files_recent: int
+    files_deleted: int
+    bytes_orphaned: int
+    bytes_reclaimed: int
+    duration: float
+
+
 class OpenAiVectorStore:
-    def __init__(self, name: str):
-        load_dotenv(override=True)
-        self.client = OpenAI()
+    """Vector store in the OpenAI API.
+
+    Parameters
+    ----------
+    name : str
+        The name of the vector store.
+    client : OpenAI | None
+        The OpenAI client to use. If None, the client shared by the process is used.
+    workers : int
+        The number of files uploaded, attached or deleted concurrently while syncing.
+    shards : int
+        The number of vector stores the files are spread across. Each file is placed on one shard by
+        consistent hashing of its name, and searches fan out to every shard. The first shard is the
+        store named ``name``, the others are named ``{name}-shard-{index}``.
+    registry : FileRegistry | None
+        The registry of files shared with other stores. If None, files are only matched by name and the
+        store is assumed to be the only one holding its files.
+    hashes : HashCache | None
+        The cache of file digests used to match files with the registry. If None, files whose attributes
+        have no hash are read to hash them.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        client: OpenAI | None = None,
+        workers: int = 8,
+        shards: int = 1,
+        registry: FileRegistry | None = None,
+        hashes: HashCache | None = None,
+    ):
+        self.client = client or openai_client()
         self.name = name
         self.store = None
+        self.workers = workers
+        self.registry = registry
+        self.hashes = hashes
+        self.ring = HashRing(shards)
+        self.shards = [self] + [
+            OpenAiVectorStore(shard_name(name, index), client=self.client, workers=workers)
+            for index in range(1, shards)
+        ]
 
     def create(self):
-        self.store = self.client.vector_stores.create(name=self.name)
+        for shard in self.shards:
+            if shard.store is None:
+                shard.store = self.client.vector_stores.create(name=shard.name)
         return self.store
 
-    def get(self):
-        stores = self.client.vector_stores.list()
-
+    def get(self, store_id: str | None = None):
+        if store_id is not None:
+            # A known ID is validated with a single lookup instead of listing every store
+            try:
+                store = self.client.vector_stores.retrieve(store_id)
+                if store.name == self.name:
+                    self.store = store
+                    if len(self.shards) > 1:
+                        self._get_shards(list(self.client.vector_stores.list()))
+                    return store
+            except NotFoundError:
+                pass
+
+        stores = list(self.client.vector_stores.list())
+
+        self._get_shards(stores)
         for store in stores:
             if store.name == self.name:
                 self.store = store
@@ -39,12 +116,30 @@ class OpenAiVectorStore:
 
         raise ValueError(f"Vector store with name {self.name} not found.")
 
+    def _get_shards(self, stores: list):
+        """Locate the stores of the other shards in a listing of the account's vector stores.
+
+        Shards added since the last sync have no store yet. They are left unset, read as empty and
+        created by the next sync.
+        """
+        by_name = {store.name: store for store in stores}
+        for shard in self.shards[1:]:
+            shard.store = by_name.get(shard.name)
+
+    def _fan_out(self, fn: Callable) -> list:
+        """Call a function on every shard with a store concurrently, returning the results in shard order."""
+        shards = [shard for shard in self.shards if shard.store is not None]
+        if len(shards) == 1:
+            return [fn(shards[0])]
+        with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+            return list(executor.map(fn, shards))
+
     def get_files(self) -> list[StoredFile]:
         if not self.store:
             self.get()
 
         uploaded_files = self.client.files.list()
-        vector_store_files = set([f.id for f in self.client.vector_stores.files.list(vector_store_id=self.store.id)])
+        vector_store_files = self.get_attached_ids()
 
         files = []
 
@@ -59,97 +154,434 @@ class OpenAiVectorStore:
 
         return files
 
-    def get_or_create(self):
+    def get_attached_ids(self) -> set[str]:
+        """Get the IDs of the files attached to any shard of the store."""
+        if not self.store:
+            self.get()
+
+        return {
+            f.id
+            for files in self._fan_out(
+                lambda shard: shard.client.vector_stores.files.list(vector_store_id=shard.store.id)
+            )
+            for f in files
+        }
+
+    def get_file_names(self) -> dict[str, str]:
+        """Get the names of all uploaded files keyed by file ID."""
+        return {f.id: f.filename for f in self.client.files.list()}
+
+    def search(
+        self, query: str, max_results: int = 10, store_id: str | None = None, filters: dict | None = None
+    ) -> list[SearchResult]:
+        """Search the vector store for the chunks most relevant to a query.
+
+        Unlike a chat, no assistant run is created so the results are returned in a single round trip
+        when the store ID is known.
+
+        Parameters
+        ----------
+        query : str
+            The search query.
+        max_results : int
+            The maximum number of chunks to return, between 1 and 50.
+        store_id : str | None
+            The ID of the vector store, if known. If None or the store no longer exists, the store is
+            looked up by name first.
+        filters : dict | None
+            An attribute filter, as returned by ``parse_filters``, which files must match. If None, every
+            file is searched.
+
+        Returns
+        -------
+        list[SearchResult]
+            The matching chunks, most relevant first. With several shards, each shard is searched
+            concurrently and the best chunks of all shards are returned.
+        """
+        if len(self.shards) == 1:
+            return self._search(query, max_results, store_id, filters)
+
+        # The shards are located with a single listing, validating a known ID of the first shard
+        if self.store is None:
+            self.get(store_id)
+
+        # The shards use the same ranker, so their scores can be compared with each other
+        results = self._fan_out(
+            lambda shard: shard._search(query, max_results, store_id if shard is self else None, filters)
+        )
+        return heapq.nlargest(max_results, itertools.chain.from_iterable(results), key=lambda r: r.score)
+
+    def _search(self, query: str, max_results: int, store_id: str | None, filters: dict | None) -> list[SearchResult]:
+        """Search this store alone, looking it up by name if the store ID is unknown or no longer exists."""
+        if store_id is None:
+            store_id = (self.store or self.get()).id
+
+        kwargs = {"filters": filters} if filters is not None else {}
         try:
-            return self.get()
-        except ValueError:
-            return self.create()
+            results = self.client.vector_stores.search(store_id, query=query, max_num_results=max_results, **kwargs)
+        except NotFoundError:
+            if self.store is not None and self.store.id == store_id:
+                raise
+            results = self.client.vector_stores.search(
+                self.get().id, query=query, max_num_results=max_results, **kwargs
+            )
+
+        return [
+            SearchResult(
+                file_id=r.file_id,
+                filename=r.filename,
+                score=r.score,
+                text="\n".join(c.text for c in r.content if c.type == "text"),
+            )
+            for r in results
+        ]
+
+    def get_or_create(self):
+        """Get the vector store, creating it and any of its shards which don't exist yet."""
+        with suppress(ValueError):
+            self.get()
+        # Every shard is located before any is created, so existing shards are never duplicated
+        return self.create()
 
     def delete(self):
+        """Delete the vector store and its shards, and the files no other store holds."""
         if not self.store:
             self.get()
 
-        remote_files = self.client.files.list()
-        self._delete_files([f.id for f in remote_files])
+        held = {
+            f.id
+            for shard_files in self._fan_out(
+                lambda shard: shard.client.vector_stores.files.list(vector_store_id=shard.store.id)
+            )
+            for f in shard_files
+        }
+        released = [f for f in held if self.registry is None or self.registry.release(f, self.name)]
+        files_to_remove = self._unheld_elsewhere(released)
+        self._delete_files(files_to_remove)
+        if self.registry is not None:
+            self.registry.save()
+
+        for shard in self.shards:
+            if shard.store is None:
+                continue
+            cprint(f"👋 Deleting vector store {shard.store.name}", "red")
+            self.client.vector_stores.delete(vector_store_id=shard.store.id)
+            shard.store = None
+
+    def collect_garbage(self, grace_period: float = 24 * 3600, dry_run: bool = False) -> GarbageCollectionResult:
+        """Delete uploaded files which no vector store in the account holds.
+
+        Interrupted syncs and deleted stores leave uploaded files behind which are never searched, but
+        slow down every file listing and cost storage. Files of every store are checked, so files shared
+        with other stores are kept.
+
+        Parameters
+        ----------
+        grace_period : float
+            Files uploaded within this many seconds are kept, since a running sync may be about to
+            attach them.
+        dry_run : bool
+            If True, the orphaned files are only counted.
+
+        Returns
+        -------
+        GarbageCollectionResult
+            The number and size of the orphaned files, and of the files deleted.
+        """
+        ts_start = perf_counter()
 
-        cprint(f"👋 Deleting vector store {self.store.name}", "red")
-        self.client.vector_stores.delete(vector_store_id=self.store.id)
-        self.store = None
+        held = self._held_by_stores()
 
-    def _attach_files(self, files_to_attach: set[str]):
-        cprint(f"Attaching {len(files_to_attach)} files to OpenAI vector store", "blue")
-        for file in tqdm(files_to_attach):
-            self.client.vector_stores.files.create_and_poll(
-                vector_store_id=self.store.id,
-                file_id=file,
-            )
+        # Only files uploaded for vector stores are collected, not files used for batches or fine-tuning
+        unheld = [f for f in self.client.files.list() if f.purpose == "assistants" and f.id not in held]
+        cutoff = time() - grace_period
+        orphaned = [f for f in unheld if f.created_at <= cutoff]
 
-    def _delete_files(self, files_to_remove: list[str]) -> set[str]:
-        cprint(f"👋 Deleting {len(files_to_remove)} files from OpenAI file storage", "red")
+        deleted = set()
+        if not dry_run and len(orphaned) > 0:
+            deleted = self._delete_files([f.id for f in orphaned])
+            if self.registry is not None:
+                self.registry.forget(deleted)
+                self.registry.save()
 
-        removed_file_ids = []
-        for file_id in tqdm(files_to_remove):
-            self.client.vector_stores.files.delete(vector_store_id=self.store.id, file_id=file_id)
-            result = self.client.files.delete(file_id=file_id)
-            if result.deleted:
-                removed_file_ids.append(file_id)
+        ts_end = perf_counter()
 
-        return set(removed_file_ids)
+        return GarbageCollectionResult(
+            files_orphaned=len(orphaned),
+            files_recent=len(unheld) - len(orphaned),
+            files_deleted=len(deleted),
+            bytes_orphaned=sum(f.bytes or 0 for f in orphaned),
+            bytes_reclaimed=sum(f.bytes or 0 for f in orphaned if f.id in deleted),
+            duration=ts_end - ts_start,
+        )
 
-    def _upload_files(self, files_to_upload: set[Path]) -> set[str]:
-        cprint(f"Uploading {len(files_to_upload)} files to OpenAI file storage", "blue")
+    def _held_by_stores(self, exclude: set[str] | None = None) -> set[str]:
+        """Get the IDs of the files attached to any vector store in the account, except the excluded stores."""
+        stores = [store for store in self.client.vector_stores.list() if store.id not in (exclude or set())]
+        cprint(f"Checking the files of {len(stores)} OpenAI vector stores", "blue")
+        held = set()
+        for file_ids in self._map(
+            lambda store: [f.id for f in self.client.vector_stores.files.list(vector_store_id=store.id)], stores
+        ):
+            held.update(file_ids)
+        return held
+
+    def _unheld_elsewhere(self, file_ids: list[str]) -> list[str]:
+        """Keep the files which no other vector store in the account holds.
+
+        The registry only knows about stores synced on this machine since it was added, so other stores
+        are checked before a file is deleted from file storage.
+        """
+        if len(file_ids) == 0:
+            return []
+        held = self._held_by_stores(exclude={shard.store.id for shard in self.shards if shard.store is not None})
+        return [file_id for file_id in file_ids if file_id not in held]
+
+    def _map(self, fn: Callable, items: Iterable) -> list:
+        """Call a function on every item with up to ``workers`` requests in flight, showing progress.
+
+        The requests share the client's connection pool, so each worker reuses a warm connection.
+        """
+        items = list(items)
+        with ThreadPoolExecutor(max_workers=max(min(self.workers, len(items)), 1)) as executor:
+            futures = [executor.submit(fn, item) for item in items]
+            return [future.result() for future in _progress(as_completed(futures), total=len(futures))]
+
+    def _attach(self, file_id: str, attributes: dict | None):
+        # Files are chunked with the profile named in their attributes, or by OpenAI if there is none
+        profile = PROFILES.get((attributes or {}).get("chunking", "auto"))
+        kwargs = {"chunking_strategy": profile.strategy()} if profile is not None else {}
+        self.client.vector_stores.files.create_and_poll(
+            vector_store_id=self.store.id, file_id=file_id, attributes=attributes, **kwargs
+        )
 
-        uploaded_file_ids = []
-        for file in tqdm(files_to_upload):
-            with open(file, "rb") as f:
-                file_object = self.client.files.create(file=f, purpose="assistants")
-                uploaded_file_ids.append(file_object.id)
+    def _reattach_files(self, attributes: dict[str, dict]):
+        cprint(f"Chunking {len(attributes)} files in OpenAI vector store again", "blue")
 
-        return set(uploaded_file_ids)
+        def reattach(file_id: str):
+            # The chunks of an attached file can't be changed, so it is detached and attached again
+            self._detach(file_id)
+            self._attach(file_id, attributes[file_id])
 
-    def sync(self, files: list[Path]):
-        ts_start = perf_counter()
-        if not self.store:
-            self.get_or_create()
+        self._map(reattach, attributes)
 
-        incoming_file_names = set([f.name for f in files])
+    def _detach(self, file_id: str):
+        # Files placed on another shard aren't attached to this one
+        with suppress(NotFoundError):
+            self.client.vector_stores.files.delete(vector_store_id=self.store.id, file_id=file_id)
 
-        # Check file storage
-        remote_files = self.client.files.list()
-        remote_file_ids = set([f.id for f in remote_files])
-        remote_file_names = set([f.filename for f in remote_files])
+    def _detach_files(self, files_to_detach: set[str]):
+        cprint(f"Detaching {len(files_to_detach)} files from OpenAI vector store {self.name}", "blue")
+        self._map(self._detach, files_to_detach)
 
-        # Determine missing files
-        duplicate_file_names = remote_file_names & incoming_file_names
-        new_file_names = incoming_file_names - remote_file_names
-        extra_file_names = remote_file_names - incoming_file_names
+    def _update_attributes(self, attributes: dict[str, dict]):
+        cprint(f"Updating attributes of {len(attributes)} files in OpenAI vector store", "blue")
 
-        files_to_upload = [f for f in files if f.name in new_file_names]
-        files_to_remove = [f.id for f in remote_files if f.filename in extra_file_names]
+        def update(file_id: str):
+            self.client.vector_stores.files.update(
+                file_id=file_id, vector_store_id=self.store.id, attributes=attributes[file_id]
+            )
+
+        self._map(update, attributes)
+
+    def _delete_files(self, files_to_remove: list[str]) -> set[str]:
+        cprint(f"👋 Deleting {len(files_to_remove)} files from OpenAI file storage", "red")
+
+        def delete(file_id: str) -> str | None:
+            result = self.client.files.delete(file_id=file_id)
+            return file_id if result.deleted else None
 
-        if len(files_to_upload) > 0:
-            remote_file_ids.update(self._upload_files(files_to_upload))
+        return {file_id for file_id in self._map(delete, files_to_remove) if file_id is not None}
 
-        if len(files_to_remove) > 0:
-            remote_file_ids.difference_update(self._delete_files(files_to_remove))
+    def _upload(self, file: Path) -> str:
+        with open(file, "rb") as f:
+            return self.client.files.create(file=f, purpose="assistants").id
 
-        # Check vector storage
-        existing_vector_files = self.client.vector_stores.files.list(vector_store_id=self.store.id)
+    def _update_shard(self, file_ids: set[str], attributes: dict[str, dict], existing_vector_files: list) -> set[str]:
+        """Update the attributes of the files attached to this shard, chunking them again if needed.
+
+        Returns
+        -------
+        set[str]
+            The IDs of attached files which are placed on another shard or were removed.
+        """
         existing_vector_file_ids = set([f.id for f in existing_vector_files])
 
-        # Determine missing files
-        files_to_attach = remote_file_ids - existing_vector_file_ids
+        outdated, rechunk = {}, {}
+        for f in existing_vector_files:
+            current = f.attributes or {}
+            if f.id not in file_ids or f.id not in attributes or current == attributes[f.id]:
+                continue
+            if current.get("chunking", "auto") != attributes[f.id].get("chunking", "auto"):
+                rechunk[f.id] = attributes[f.id]
+            else:
+                outdated[f.id] = attributes[f.id]
+
+        if len(outdated) > 0:
+            self._update_attributes(outdated)
+        if len(rechunk) > 0:
+            self._reattach_files(rechunk)
+
+        return existing_vector_file_ids - file_ids
+
+    def _retire_shards(self):
+        """Delete the stores of shards beyond the current number of shards, whose files were moved."""
+        for store in list(self.client.vector_stores.list()):
+            index = shard_index(self.name, store.name)
+            if index is not None and index >= len(self.shards):
+                cprint(f"👋 Deleting vector store {store.name} of a removed shard", "red")
+                self.client.vector_stores.delete(vector_store_id=store.id)
+
+    def _content_hashes(self, files: list[Path], attributes: dict[str, dict]) -> dict[str, str]:
+        """Get the content hash of each file keyed by name, reading files whose attributes have none."""
+        hashes = {name: values["hash"] for name, values in attributes.items() if "hash" in values}
+        missing = [f for f in files if f.name not in hashes]
+        if len(missing) > 0:
+            digest = self.hashes.hash if self.hashes is not None else file_hash
+            hashes.update(self._map(lambda file: (file.name, digest(file)), missing))
+        return hashes
+
+    def sync(
+        self,
+        files: list[Path],
+        attributes: dict[str, dict] | None = None,
+        chunking: ChunkingPolicy | None = None,
+    ) -> SyncOperationResult:
+        """Upload new files, attach every file to the vector store and remove files no longer synced.
+
+        Files are matched with uploaded files by name. With a registry, a file with the same contents as
+        a file uploaded for another store is attached by its file ID instead of being uploaded again, and a
+        removed file is only deleted from file storage once no store holds it.
+
+        Parameters
+        ----------
+        files : list[Path]
+            The local files which the store should contain. New files are uploaded and attached in this
+            order, so the first files become searchable first.
+        attributes : dict[str, dict] | None
+            Attributes to store with each file in the vector store, keyed by file name. Searches can
+            filter on them. Files which are already attached are updated if their attributes changed.
+        chunking : ChunkingPolicy | None
+            The policy choosing how each file is chunked. The chosen profile is stored in the ``chunking``
+            attribute, and attached files are chunked again when it changes. If None, OpenAI chooses.
+
+        Returns
+        -------
+        SyncOperationResult
+            The number of files saved, reused, deleted and skipped.
+        """
+        ts_start = perf_counter()
+        if any(shard.store is None for shard in self.shards):
+            self.get_or_create()
+
+        by_name = {name: dict(values) for name, values in (attributes or {}).items()}
 
-        if len(files_to_attach) > 0:
-            self._attach_files(files_to_attach)
+        # Check file storage and the files held by each shard
+        remote_files = self.client.files.list()
+        names = {f.id: f.filename for f in remote_files}
+        remote_ids_by_name = {f.filename: f.id for f in remote_files}
+        existing = self._fan_out(
+            lambda shard: list(shard.client.vector_stores.files.list(vector_store_id=shard.store.id))
+        )
+        attached = [{f.id for f in shard_files} for shard_files in existing]
+        held = set().union(*attached)
+        hashes = self._content_hashes(files, by_name) if self.registry is not None else {}
+
+        # Match each file with an uploaded file by name, then by contents
+        file_ids: dict[str, str] = {}
+        files_to_upload = []
+        skipped = reused = 0
+        for file in files:
+            entry = self.registry.find(hashes[file.name]) if self.registry is not None else None
+            if file.name in remote_ids_by_name:
+                file_ids[file.name] = remote_ids_by_name[file.name]
+                skipped += 1
+            elif entry is not None and entry.file_id in names:
+                file_ids[file.name] = entry.file_id
+                if entry.file_id in held:
+                    skipped += 1
+                else:
+                    reused += 1
+            else:
+                files_to_upload.append(file)
+
+        if chunking is not None:
+            for file in files:
+                values = by_name.setdefault(file.name, {})
+                values["chunking"] = chunking.select(file, values.get("source"))
+
+        # Each file belongs to the shard the ring places it on, keyed by the name it was uploaded under
+        def shard_of(file: Path) -> int:
+            file_id = file_ids.get(file.name)
+            return self.ring.shard(names[file_id] if file_id is not None else file.name)
+
+        # Files are uploaded and attached in the order given, each new file attached as soon as it is
+        # uploaded, so the first files become searchable while the rest are still syncing
+        queue, queued = [], set()
+        for file in files:
+            file_id = file_ids.get(file.name)
+            if file_id is None:
+                queue.append(file)
+            elif file_id not in queued and file_id not in attached[shard_of(file)]:
+                queue.append(file)
+                queued.add(file_id)
+
+        def place(file: Path) -> tuple[str, str]:
+            file_id = file_ids.get(file.name) or self._upload(file)
+            self.shards[shard_of(file)]._attach(file_id, by_name.get(file.name))
+            return file_id, file.name
+
+        if len(queue) > 0:
+            cprint(f"Uploading {len(files_to_upload)} and attaching {len(queue)} files to OpenAI vector store", "blue")
+            for file_id, name in self._map(place, queue):
+                if name not in file_ids:
+                    names[file_id] = name
+                    file_ids[name] = file_id
+
+        # Attributes are keyed by file ID from here on
+        attributes = {file_ids[name]: values for name, values in by_name.items() if name in file_ids}
+
+        placed = [set() for _ in self.shards]
+        for file_id in set(file_ids.values()):
+            placed[self.ring.shard(names[file_id])].add(file_id)
+
+        # Files are detached from their previous shard only once every shard has its files attached
+        misplaced = [
+            shard._update_shard(shard_ids, attributes, shard_files)
+            for shard, shard_ids, shard_files in zip(self.shards, placed, existing, strict=True)
+        ]
+        for shard, shard_ids in zip(self.shards, misplaced, strict=True):
+            if len(shard_ids) > 0:
+                shard._detach_files(shard_ids)
+
+        # Removed files are deleted from file storage unless another store holds them
+        removed = held - set(file_ids.values())
+        released = [
+            file_id
+            for file_id in removed
+            if file_id in names and (self.registry is None or self.registry.release(file_id, self.name))
+        ]
+        files_to_remove = self._unheld_elsewhere(released)
+        deleted = self._delete_files(files_to_remove) if len(files_to_remove) > 0 else set()
+        if len(removed) > len(files_to_remove):
+            cprint(f"Kept {len(removed) - len(files_to_remove)} removed files which other stores hold", "blue")
+
+        if self.registry is not None:
+            for name, file_id in file_ids.items():
+                self.registry.add(hashes[name], file_id, names[file_id], self.name)
+            self.registry.forget(deleted)
+            self.registry.save()
+
+        self._retire_shards()
 
         ts_end = perf_counter()
         duration = ts_end - ts_start
 
         return SyncOperationResult(
             files_saved=len(files_to_upload),
-            files_deleted=len(files_to_remove),
-            files_skipped=len(duplicate_file_names),
-            remote_count=len(existing_vector_file_ids | files_to_attach),
+            files_reused=reused,
+            files_deleted=len(deleted),
+            files_skipped=skipped,
+            remote_count=sum(len(shard_ids) for shard_ids in placed),
             duration=duration,
         )
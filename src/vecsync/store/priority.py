@@ -0,0 +1,68 @@
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel
+
+from vecsync.settings import SettingExists, Settings
+
+ORDERS = ("none", "added", "modified", "smallest")
+
+
+class SyncPriority(BaseModel):
+    """The order in which new files are uploaded and attached while syncing, stored in the settings file.
+
+    A first sync of a large library takes a long time, and files become searchable one by one as they are
+    attached. Syncing the most relevant files first makes the store useful long before the sync finishes.
+    Pinned files go first in the order listed, then the other files in the chosen order.
+
+    Parameters
+    ----------
+    order : str
+        ``added`` syncs the files most recently added to the source first, ``modified`` the files most
+        recently modified on disk, ``smallest`` the smallest files, which are quickest to upload and chunk,
+        and ``none`` keeps the order of the source.
+    pinned : list[str]
+        The names of files synced before any other file.
+    """
+
+    order: Literal["none", "added", "modified", "smallest"] = "none"
+    pinned: list[str] = []
+
+    @classmethod
+    def load(cls, settings: Settings | None = None) -> "SyncPriority":
+        match (settings or Settings())["priority"]:
+            case SettingExists() as x:
+                return cls(**x.value)
+            case _:
+                return cls()
+
+    def save(self, settings: Settings):
+        settings["priority"] = self.model_dump()
+
+    def sort(self, files: list[Path], added: dict[str, float] | None = None) -> list[Path]:
+        """Sort files in the order they should be synced.
+
+        Parameters
+        ----------
+        files : list[Path]
+            The files to sync.
+        added : dict[str, float] | None
+            The time each file was added to the source as a timestamp, keyed by file name. Only used by the
+            ``added`` order, which puts files without a time last.
+
+        Returns
+        -------
+        list[Path]
+            The files, with ties kept in their original order.
+        """
+        match self.order:
+            case "added":
+                added = added or {}
+                files = sorted(files, key=lambda f: -added.get(f.name, float("-inf")))
+            case "modified":
+                files = sorted(files, key=lambda f: -f.stat().st_mtime)
+            case "smallest":
+                files = sorted(files, key=lambda f: f.stat().st_size)
+
+        pinned = {name: i for i, name in enumerate(self.pinned)}
+        return sorted(files, key=lambda f: pinned.get(f.name, len(pinned)))
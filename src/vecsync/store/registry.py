@@ -0,0 +1,133 @@
+import json
+import os
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+
+from appdirs import user_config_dir
+from pydantic import BaseModel
+
+from vecsync.settings import FileLock
+
+
+class RegisteredFile(BaseModel):
+    file_id: str
+    filename: str
+    stores: list[str] = []
+
+
+class FileRegistry:
+    """Local registry of uploaded files keyed by content hash, with the stores each file is attached to.
+
+    Several vector stores can share one uploaded file. A file with the same contents as an uploaded file
+    is attached to another store by its file ID instead of being uploaded again, and the stores holding a
+    file are counted so it is only deleted from file storage once no store holds it.
+
+    The registry is persisted as JSON next to the settings file and only knows about stores synced on
+    this machine. Changes are recorded until ``save()``, which takes a cross-process lock, re-reads the
+    latest registry, applies the changes to it and atomically replaces the file, so concurrent syncs of
+    different stores keep each other's holders.
+
+    Parameters
+    ----------
+    path : Path | None
+        The path to the registry file. If None, the default location in the user config directory is used.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.file = path or Path(user_config_dir("vecsync")) / "files.json"
+        self.lock = FileLock.get(self.file)
+        self._entries: dict[str, RegisteredFile] | None = None
+        self._changes: list[Callable[[dict[str, RegisteredFile]], object]] = []
+
+    def _read(self) -> dict[str, RegisteredFile]:
+        if not self.file.exists():
+            return {}
+        with open(self.file) as f:
+            data = json.load(f)
+        return {k: RegisteredFile(**v) for k, v in data.items()}
+
+    def load(self) -> dict[str, RegisteredFile]:
+        """Load the registry from disk, returning an empty registry if no file exists."""
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    def save(self):
+        """Apply the changes made since the last save to the latest registry on disk."""
+        with self.lock:
+            entries = self._read()
+            for change in self._changes:
+                change(entries)
+
+            self.file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.file.parent, prefix=f".{self.file.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump({k: v.model_dump() for k, v in entries.items()}, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.file)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+
+        self._entries = entries
+        self._changes = []
+
+    def _apply(self, change: Callable[[dict[str, RegisteredFile]], object]):
+        """Apply a change to the loaded registry and record it for the next save."""
+        self._changes.append(change)
+        return change(self.load())
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+    def find(self, content_hash: str) -> RegisteredFile | None:
+        """Get the uploaded file with the given contents, if any."""
+        return self.load().get(content_hash)
+
+    def add(self, content_hash: str, file_id: str, filename: str, store: str):
+        """Record that a store holds an uploaded file."""
+
+        def change(entries: dict[str, RegisteredFile]):
+            entry = entries.get(content_hash)
+            if entry is None or entry.file_id != file_id:
+                entry = entries[content_hash] = RegisteredFile(file_id=file_id, filename=filename)
+            if store not in entry.stores:
+                entry.stores.append(store)
+
+        self._apply(change)
+
+    def release(self, file_id: str, store: str) -> bool:
+        """Record that a store no longer holds an uploaded file.
+
+        Returns
+        -------
+        bool
+            True if no other store holds the file, so it can be deleted from file storage. Files which
+            aren't in the registry are held by no other store.
+        """
+
+        def change(entries: dict[str, RegisteredFile]) -> bool:
+            for content_hash, entry in list(entries.items()):
+                if entry.file_id != file_id:
+                    continue
+                if store in entry.stores:
+                    entry.stores.remove(store)
+                if len(entry.stores) > 0:
+                    return False
+                del entries[content_hash]
+            return True
+
+        return self._apply(change)
+
+    def forget(self, file_ids: set[str]):
+        """Remove the entries of files which no longer exist in file storage."""
+        file_ids = set(file_ids)
+
+        def change(entries: dict[str, RegisteredFile]):
+            for content_hash in [h for h, entry in entries.items() if entry.file_id in file_ids]:
+                del entries[content_hash]
+
+        self._apply(change)
@@ -0,0 +1,87 @@
+import bisect
+import hashlib
+import re
+
+from pydantic import BaseModel, Field
+
+from vecsync.settings import SettingExists, Settings
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring placing files on the shards of a vector store.
+
+    Each shard owns many points on the ring and a file belongs to the shard owning the first point after
+    the file's hash. Adding a shard only moves the files which now fall on the new shard's points, about
+    one in N files, and removing a shard only moves the files it held.
+
+    Parameters
+    ----------
+    shards : int
+        The number of shards.
+    replicas : int
+        The number of points each shard owns on the ring. More points spread files more evenly.
+    """
+
+    def __init__(self, shards: int, replicas: int = 128):
+        if shards < 1:
+            raise ValueError("A vector store needs at least one shard")
+
+        self.shards = shards
+        points = sorted(
+            (_hash(f"shard-{shard}-{replica}"), shard) for shard in range(shards) for replica in range(replicas)
+        )
+        self._hashes = [h for h, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard(self, key: str) -> int:
+        """Get the index of the shard a file belongs to, keyed by its name."""
+        if self.shards == 1:
+            return 0
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._shards[index]
+
+
+def shard_name(name: str, index: int) -> str:
+    """Get the name of a shard's vector store.
+
+    The first shard is the store itself, so a store keeps its files in place when it is first sharded.
+    """
+    return name if index == 0 else f"{name}-shard-{index}"
+
+
+def shard_index(name: str, store_name: str) -> int | None:
+    """Get the index of the shard a vector store holds, or None if it isn't a shard of the store."""
+    if store_name == name:
+        return 0
+    match = re.fullmatch(re.escape(name) + r"-shard-(\d+)", store_name)
+    return int(match.group(1)) if match is not None else None
+
+
+class ShardingOptions(BaseModel):
+    """The number of vector stores the synced files are spread across, stored in the settings file.
+
+    A single vector store and the assistant searching it stop scaling as the corpus grows. Sharded files
+    are placed across several stores, which are searched concurrently.
+
+    Parameters
+    ----------
+    shards : int
+        The number of vector stores. Changing it moves the fewest files needed on the next sync.
+    """
+
+    shards: int = Field(default=1, ge=1)
+
+    @classmethod
+    def load(cls, settings: Settings | None = None) -> "ShardingOptions":
+        match (settings or Settings())["sharding"]:
+            case SettingExists() as x:
+                return cls(**x.value)
+            case _:
+                return cls()
+
+    def save(self, settings: Settings):
+        settings["sharding"] = self.model_dump()
@@ -1,10 +1,14 @@
+import re
 import sqlite3
+from datetime import datetime, timezone
 from pathlib import Path
 
 from pydantic import BaseModel
 from termcolor import cprint
 
 from vecsync.settings import SettingExists, SettingMissing, Settings
+from vecsync.store.attributes import HashCache, file_attributes
+from vecsync.store.metadata import FileMetadata
 
 
 class Collection(BaseModel):
@@ -20,6 +24,7 @@ class ZoteroStore:
     ):
         self.root = root
         self.db = db_connection
+        self.collection_id = None
 
     @classmethod
     def client(cls):
@@ -94,12 +99,16 @@ class ZoteroStore:
             collections.append(collection)
         return collections
 
+    def _get_collection_id(self) -> int:
+        if self.collection_id is None:
+            self.collection_id = self._resolve_collection(self.get_collections())
+        return self.collection_id
+
     def get_files(self):
         """
         Get all files from the Zotero database.
         """
-        collections = self.get_collections()
-        collection_id = self._resolve_collection(collections)
+        collection_id = self._get_collection_id()
 
         cursor = self.db.cursor()
         cursor.execute(
@@ -123,3 +132,105 @@ class ZoteroStore:
             filename = row[1].replace("storage:", "")
             files.append(self.root / "storage" / key / filename)
         return files
+
+    def get_attributes(self, files: list[Path], hashes: HashCache | None = None) -> dict[str, dict]:
+        """Get the vector store attributes of each file keyed by file name.
+
+        Files are tagged with the name of the collection they were synced from and their publication year.
+        """
+        collection_id = self._get_collection_id()
+        collection = next((c.name for c in self.get_collections() if c.id == collection_id), None)
+        metadata = self.get_metadata()
+
+        return {
+            f.name: file_attributes(
+                f,
+                "zotero",
+                root=self.root / "storage",
+                collection=collection,
+                year=metadata[f.name].year if f.name in metadata else None,
+                hashes=hashes,
+            )
+            for f in files
+        }
+
+    def get_added(self, files: list[Path]) -> dict[str, float]:
+        """Get the time each file's item was added to the Zotero library keyed by file name."""
+        collection_id = self._get_collection_id()
+
+        cursor = self.db.cursor()
+        cursor.execute(
+            """
+            SELECT
+                a.path,
+                i.dateAdded
+            FROM collectionItems ci
+            INNER JOIN itemAttachments a ON ci.itemID = a.parentItemID
+            INNER JOIN items i ON a.parentItemID = i.itemID
+            WHERE
+                ci.collectionID = ?
+                AND a.contentType = 'application/pdf'
+        """,
+            (collection_id,),
+        )
+        names = {f.name for f in files}
+        added = {}
+        for path, date_added in cursor.fetchall():
+            filename = path.replace("storage:", "")
+            if filename in names and date_added:
+                # Zotero stores times in UTC as "YYYY-MM-DD HH:MM:SS"
+                added[filename] = datetime.fromisoformat(date_added).replace(tzinfo=timezone.utc).timestamp()
+        return added
+
+    def get_metadata(self) -> dict[str, FileMetadata]:
+        """
+        Get bibliographic metadata for every PDF attachment in the collection.
+
+        All attachments are resolved in a single query which joins the parent items with their
+        field values and ordered creators. The result is keyed by attachment file name, which is
+        the name the file is uploaded under.
+        """
+        collection_id = self._get_collection_id()
+
+        cursor = self.db.cursor()
+        cursor.execute(
+            """
+            SELECT
+                a.path,
+                MAX(CASE WHEN f.fieldName = 'title' THEN v.value END) AS title,
+                MAX(CASE WHEN f.fieldName = 'date' THEN v.value END) AS date,
+                (
+                    SELECT group_concat(lastName, '|')
+                    FROM (
+                        SELECT c.lastName
+                        FROM itemCreators ic
+                        INNER JOIN creators c ON ic.creatorID = c.creatorID
+                        WHERE ic.itemID = a.parentItemID
+                        ORDER BY ic.orderIndex
+                    )
+                ) AS authors
+            FROM collectionItems ci
+            INNER JOIN itemAttachments a ON ci.itemID = a.parentItemID
+            INNER JOIN items i ON a.parentItemID = i.itemID
+            LEFT JOIN itemData d ON i.itemID = d.itemID
+            LEFT JOIN fields f ON d.fieldID = f.fieldID
+            LEFT JOIN itemDataValues v ON d.valueID = v.valueID
+            WHERE
+                ci.collectionID = ?
+                AND a.contentType = 'application/pdf'
+            GROUP BY a.itemID
+        """,
+            (collection_id,),
+        )
+        rows = cursor.fetchall()
+        metadata = {}
+        for path, title, date, authors in rows:
+            filename = path.replace("storage:", "")
+            # Zotero stores dates as "YYYY-MM-DD originalText" with zeros for unknown parts
+            year = re.match(r"\d{4}", date or "")
+            metadata[filename] = FileMetadata(
+                title=title,
+                authors=authors.split("|") if authors else [],
+                year=int(year.group()) if year and year.group() != "0000" else None,
+            )
+        return metadata
@@ -0,0 +1,66 @@
+import pytest
+
+from vecsync.chat.batch import Answer, BatchRunner, Question, read_answered, read_questions
+
+
+def test_read_questions():
+    lines = ["What is A?\n", "\n", '{"id": "q2", "question": "What is B?"}\n', '{"question": "What is C?"}\n']
+
+    assert read_questions(lines) == [
+        Question(id="1", question="What is A?"),
+        Question(id="q2", question="What is B?"),
+        Question(id="4", question="What is C?"),
+    ]
+
+
+def test_read_questions_invalid():
+    with pytest.raises(ValueError, match='Line 2 has no "question"'):
+        read_questions(["What is A?", '{"id": "q2", "prompt": "What is B?"}'])
+
+    with pytest.raises(ValueError, match="Line 1 is not valid JSON"):
+        read_questions(['{"question": "What is A?"'])
+
+
+def test_read_answered(tmp_path):
+    path = tmp_path / "answers.jsonl"
+    assert read_answered(path) == set()
+
+    with open(path, "w") as f:
+        f.write(Answer(id="1", question="A", answer="a").model_dump_json() + "\n")
+        f.write(Answer(id="2", question="B", error="RuntimeError: failed").model_dump_json() + "\n")
+        f.write('{"id": "3", "quest')
+
+    # Failed and partially written answers are asked again
+    assert read_answered(path) == {"1"}
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_batch_runner(mocked_client, concurrency):
+    mocked_client.connect()
+    runner = BatchRunner(mocked_client, concurrency=concurrency)
+    questions = [Question(id=str(i), question=f"Question {i}") for i in range(5)]
+
+    answers = list(runner.run(questions))
+
+    assert sorted(a.id for a in answers) == ["0", "1", "2", "3", "4"]
+    for answer in answers:
+        assert answer.error is None
+        assert answer.answer == "Thisisatestmessagefromtheassistant"
+        assert answer.first_token_seconds <= answer.total_seconds
+
+    # Each question is asked in its own thread
+    assert len({a.thread_id for a in answers}) == 5
+    assert mocked_client.thread_id not in {a.thread_id for a in answers}
+
+
+def test_batch_runner_error(mocked_client, monkeypatch):
+    mocked_client.connect()
+
+    def fail(**kwargs):
+        raise RuntimeError("Run failed")
+
+    monkeypatch.setattr(mocked_client.client.beta.threads.runs, "stream", fail)
+    answers = list(BatchRunner(mocked_client, concurrency=2).run([Question(id="1", question="Q")]))
+
+    assert answers[0].error == "RuntimeError: Run failed"
+    assert answers[0].answer is None
@@ -0,0 +1,64 @@
+from vecsync.chat.cache import ResponseCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_key_normalized():
+    fingerprint = ResponseCache.fingerprint(["file_2", "file_1"])
+    assert fingerprint == ResponseCache.fingerprint(["file_1", "file_2"])
+
+    key = ResponseCache.key("What is  the answer?", "instructions", fingerprint)
+    assert key == ResponseCache.key(" what is the ANSWER? ", "instructions", fingerprint)
+    assert key != ResponseCache.key("What is the answer?", "other instructions", fingerprint)
+    assert key != ResponseCache.key("What is the answer?", "instructions", ResponseCache.fingerprint(["file_1"]))
+
+
+def test_cache_put_get(tmp_path):
+    cache = ResponseCache(path=tmp_path / "responses.sqlite")
+    transcript = [("The answer【4:0†source】", {"【4:0†source】": "file_1"}), (" is 42", {})]
+
+    assert cache.get("key") is None
+    cache.put("key", transcript)
+    assert cache.get("key") == transcript
+    assert len(cache) == 1
+
+    cache.clear()
+    assert cache.get("key") is None
+
+
+def test_cache_ttl(tmp_path):
+    clock = Clock()
+    cache = ResponseCache(path=tmp_path / "responses.sqlite", ttl=60, clock=clock)
+    cache.put("key", [("text", {})])
+
+    clock.now += 59
+    assert cache.get("key") is not None
+
+    clock.now += 1
+    assert cache.get("key") is None
+
+
+def test_cache_size_eviction(tmp_path):
+    clock = Clock()
+    cache = ResponseCache(path=tmp_path / "responses.sqlite", max_entries=2, clock=clock)
+
+    cache.put("a", [("a", {})])
+    clock.now += 1
+    cache.put("b", [("b", {})])
+    clock.now += 1
+
+    # Reading "a" makes "b" the least recently used entry
+    cache.get("a")
+    clock.now += 1
+    cache.put("c", [("c", {})])
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
@@ -0,0 +1,93 @@
+import threading
+
+from vecsync.chat.citations import CitationResolver
+
+
+def test_resolve_known():
+    resolver = CitationResolver({"file_1": "a.pdf"}, lookup=lambda: {})
+    assert resolver.resolve(["file_1"]) == {"file_1": "a.pdf"}
+
+
+def test_resolve_unknown_batched():
+    calls = []
+    release = threading.Event()
+
+    def lookup():
+        release.wait()
+        calls.append(1)
+        return {"file_1": "a.pdf", "file_2": "b.pdf", "file_3": "c.pdf"}
+
+    resolver = CitationResolver({}, lookup=lookup)
+
+    # IDs requested while a fetch is pending share a single lookup
+    resolver.prefetch(["file_1"])
+    resolver.prefetch(["file_2", "file_3"])
+    release.set()
+
+    assert resolver.resolve(["file_1", "file_2", "file_3"]) == {"file_1": "a.pdf", "file_2": "b.pdf", "file_3": "c.pdf"}
+    assert len(calls) <= 2
+
+    # Resolved names are cached
+    resolver.resolve(["file_1", "file_2", "file_3"])
+    assert len(calls) <= 2
+
+
+def test_resolve_missing():
+    calls = []
+
+    def lookup():
+        calls.append(1)
+        return {}
+
+    resolver = CitationResolver({}, lookup=lookup)
+    assert resolver.resolve(["file_1"]) == {"file_1": "file_1"}
+
+    # A file which doesn't exist is only looked up once
+    assert resolver.resolve(["file_1"]) == {"file_1": "file_1"}
+    assert len(calls) == 1
+
+
+def test_resolve_lookup_error():
+    def lookup():
+        raise RuntimeError("API error")
+
+    resolver = CitationResolver({}, lookup=lookup)
+    assert resolver.resolve(["file_1"]) == {"file_1": "file_1"}
+
+
+def test_resolve_lookup_error_retried():
+    calls = []
+
+    def lookup():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("API error")
+        return {"file_1": "a.pdf"}
+
+    resolver = CitationResolver({}, lookup=lookup)
+    assert resolver.resolve(["file_1"]) == {"file_1": "file_1"}
+
+    # A failed lookup is retried when the file is next cited
+    assert resolver.resolve(["file_1"]) == {"file_1": "a.pdf"}
+    assert len(calls) == 2
+
+
+def test_resolver_lru():
+    resolver = CitationResolver({"file_1": "a.pdf", "file_2": "b.pdf"}, lookup=lambda: {"file_3": "c.pdf"}, max_size=2)
+
+    resolver.resolve(["file_1"])
+    assert resolver.resolve(["file_3"]) == {"file_3": "c.pdf"}
+
+    # file_2 was the least recently used name when file_3 was fetched
+    assert resolver.resolve(["file_1", "file_2"]) == {"file_1": "a.pdf", "file_2": "file_2"}
+
+
+def test_resolver_lru_fetches_evicted():
+    files = {"file_1": "a.pdf", "file_2": "b.pdf", "file_3": "c.pdf"}
+    resolver = CitationResolver({}, lookup=lambda: files, max_size=2)
+
+    assert resolver.resolve(["file_1", "file_2"]) == {"file_1": "a.pdf", "file_2": "b.pdf"}
+    assert resolver.resolve(["file_3"]) == {"file_3": "c.pdf"}
+
+    # file_1 was evicted for file_3 and is fetched again
+    assert resolver.resolve(["file_1"]) == {"file_1": "a.pdf"}
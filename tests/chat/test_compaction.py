@@ -0,0 +1,85 @@
+from vecsync.chat.clients.openai import OpenAIHandler
+from vecsync.chat.compaction import SUMMARY_HEADER, ThreadPolicy
+from vecsync.chat.formatter import ConsoleFormatter
+from vecsync.settings import Settings
+
+
+def ask(client, thread_id, prompt):
+    handler = OpenAIHandler(client.citations, ConsoleFormatter())
+    client.stream_response(thread_id, client.assistant_id, handler, prompt)
+    return list(handler.consume_queue())
+
+
+def test_thread_policy(tmp_path):
+    policy = ThreadPolicy(max_turns=10, max_context_tokens=1000)
+
+    assert not policy.should_rotate(9, 1000)
+    assert policy.should_rotate(10, None)
+    assert policy.should_rotate(1, 1001)
+    # Threads are only rotated once a limit is set
+    assert not ThreadPolicy().should_rotate(1000, 10**6)
+
+    assert policy.truncation_strategy() is None
+    assert ThreadPolicy(last_messages=6).truncation_strategy() == {"type": "last_messages", "last_messages": 6}
+
+    settings = Settings(path=tmp_path / "settings.json")
+    assert ThreadPolicy.load(settings) == ThreadPolicy()
+    policy.save(settings)
+    assert ThreadPolicy.load(settings) == policy
+
+
+def test_truncation(mocked_client):
+    mocked_client.connect()
+    ThreadPolicy(last_messages=4).save(mocked_client.settings)
+
+    ask(mocked_client, mocked_client.thread_id, "Hello")
+
+    stream = mocked_client.client.beta.threads.runs.stream
+    assert stream.calls[-1]["truncation_strategy"] == {"type": "last_messages", "last_messages": 4}
+
+
+def test_rotation(mocked_client):
+    mocked_client.connect()
+    ThreadPolicy(max_turns=2).save(mocked_client.settings)
+    old_thread = mocked_client.thread_id
+
+    ask(mocked_client, old_thread, "First question")
+    assert mocked_client._rotation is None
+
+    ask(mocked_client, old_thread, "Second question")
+    new_thread = mocked_client._rotation.result()
+
+    assert new_thread != old_thread
+    assert mocked_client.thread_id == new_thread
+    assert Settings(path=mocked_client.settings_path)["openai_thread_id"].value == new_thread
+
+    # The new thread starts from a summary of the old conversation
+    history = mocked_client.load_history(new_thread)
+    assert history[0]["role"] == "assistant"
+    assert history[0]["content"].startswith(SUMMARY_HEADER)
+
+    # Callers still holding the old thread ID are answered in the new thread
+    ask(mocked_client, old_thread, "Third question")
+    stream = mocked_client.client.beta.threads.runs.stream
+    assert stream.calls[-1]["thread_id"] == new_thread
+
+
+def test_rotation_context_tokens(mocked_client):
+    mocked_client.connect()
+
+    # The mocked runs report 100 prompt tokens
+    ThreadPolicy(max_turns=None, max_context_tokens=99).save(mocked_client.settings)
+    ask(mocked_client, mocked_client.thread_id, "Hello")
+
+    assert mocked_client._rotation is not None
+    mocked_client._rotation.result()
+
+
+def test_other_threads_not_rotated(mocked_client):
+    mocked_client.connect()
+    ThreadPolicy(max_turns=1).save(mocked_client.settings)
+
+    other = mocked_client.client.beta.threads.create().id
+    ask(mocked_client, other, "Hello")
+
+    assert mocked_client._rotation is None
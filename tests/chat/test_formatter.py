@@ -2,6 +2,7 @@ import pytest
 from termcolor import colored
 
 from vecsync.chat.formatter import ConsoleFormatter, GradioFormatter
+from vecsync.store.metadata import FileMetadata
 
 
 @pytest.fixture
@@ -72,3 +73,21 @@ def test_gradio_formatter_get_null_references(gradio_formatter):
     files = {}
     expected = ""
     assert gradio_formatter.get_references(annotations, files) == expected
+
+
+def test_console_formatter_get_references_metadata(console_formatter):
+    annotations = {"file1": "1", "file2": "2"}
+    files = {"file1": "example1.txt", "file2": "example2.txt"}
+    metadata = {"file1": FileMetadata(title="A Paper", authors=["Smith"], year=2020)}
+    expected = (
+        "\n\nReferences\n----------\n"
+        + colored("\n[1] Smith (2020). A Paper", "yellow")
+        + colored("\n[2] example2.txt", "yellow")
+    )
+    assert console_formatter.get_references(annotations, files, metadata) == expected
+
+
+def test_gradio_formatter_format_reference_metadata(gradio_formatter):
+    metadata = FileMetadata(title="A Paper", authors=["Smith"], year=2020)
+    expected = "<strong>[1]</strong> Smith (2020). A Paper"
+    assert gradio_formatter.format_reference("1", "example.txt", metadata) == expected
@@ -0,0 +1,61 @@
+from vecsync.chat.history import PAGE_SIZE, HistoryCache
+
+
+def add_messages(client, thread_id, count):
+    for i in range(count):
+        client.beta.threads.messages.create(thread_id=thread_id, role="user", content=f"Message {i}")
+
+
+def test_history_sync_paginated(mocked_client, tmp_path):
+    backend = mocked_client.client
+    add_messages(backend, "thread_1", PAGE_SIZE * 2 + 5)
+
+    cache = HistoryCache(path=tmp_path / "cache.sqlite")
+    assert cache.sync(backend, "thread_1") == PAGE_SIZE * 2 + 5
+    assert backend.beta.threads.messages.list.calls == 3
+
+    history = cache.read("thread_1")
+    assert len(history) == PAGE_SIZE * 2 + 5
+    assert history[0]["content"] == "Message 0"
+    assert history[-1]["content"] == f"Message {PAGE_SIZE * 2 + 4}"
+
+
+def test_history_sync_incremental(mocked_client, tmp_path):
+    backend = mocked_client.client
+    add_messages(backend, "thread_1", 3)
+
+    cache = HistoryCache(path=tmp_path / "cache.sqlite")
+    cache.sync(backend, "thread_1")
+
+    add_messages(backend, "thread_1", 2)
+    assert cache.sync(backend, "thread_1") == 2
+    assert cache.sync(backend, "thread_1") == 0
+    assert cache.count("thread_1") == 5
+
+
+def test_history_read_page(mocked_client, tmp_path):
+    backend = mocked_client.client
+    add_messages(backend, "thread_1", 5)
+
+    cache = HistoryCache(path=tmp_path / "cache.sqlite")
+    cache.sync(backend, "thread_1")
+
+    assert [m["content"] for m in cache.read("thread_1", limit=2)] == ["Message 3", "Message 4"]
+    assert [m["content"] for m in cache.read("thread_1", limit=2, skip=2)] == ["Message 1", "Message 2"]
+    assert [m["content"] for m in cache.read("thread_1", limit=2, skip=4)] == ["Message 0"]
+
+
+def test_history_separate_threads(mocked_client, tmp_path):
+    backend = mocked_client.client
+    add_messages(backend, "thread_1", 2)
+    add_messages(backend, "thread_2", 1)
+
+    cache = HistoryCache(path=tmp_path / "cache.sqlite")
+    cache.sync(backend, "thread_1")
+    cache.sync(backend, "thread_2")
+
+    assert cache.count("thread_1") == 2
+    assert cache.count("thread_2") == 1
+
+    cache.clear("thread_1")
+    assert cache.read("thread_1") == []
@@ -0,0 +1,103 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from vecsync.chat.server import ChatServer
+
+
+@pytest.fixture
+def server(mocked_client):
+    mocked_client.connect()
+    with ChatServer(mocked_client, port=0, concurrency=2, pool_size=1) as server:
+        yield server
+
+
+def request(server, method, path, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(server.url + path, data=data, method=method)
+    with urllib.request.urlopen(req, timeout=5) as response:
+        return response.headers, response.read().decode()
+
+
+def parse_events(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_health(server):
+    _, body = request(server, "GET", "/health")
+    health = json.loads(body)
+
+    assert health["status"] == "ok"
+    assert health["assistant_id"] == server.client.assistant_id
+    assert health["requests"] == 0
+
+
+def test_chat_stream(server):
+    headers, body = request(server, "POST", "/chat", {"message": "Hello"})
+    events = parse_events(body)
+
+    assert headers["Content-Type"] == "text/event-stream"
+    assert "".join(data["text"] for event, data in events if event == "delta") == "Thisisatestmessagefromtheassistant"
+    assert events[-1][0] == "done"
+    assert events[-1][1]["citations"] == []
+
+    # Requests without a session never use the persisted thread
+    assert events[-1][1]["thread_id"] != server.client.thread_id
+
+    health = json.loads(request(server, "GET", "/health")[1])
+    assert health["requests"] == 1
+    assert health["first_token_seconds"]["p50"] >= 0
+
+
+def test_chat_json(server):
+    _, body = request(server, "POST", "/chat", {"message": "Hello", "stream": False})
+    assert json.loads(body)["answer"] == "Thisisatestmessagefromtheassistant"
+
+
+def test_chat_session(server):
+    first = json.loads(request(server, "POST", "/chat", {"message": "Hi", "session": "a", "stream": False})[1])
+    second = json.loads(request(server, "POST", "/chat", {"message": "Hi", "session": "a", "stream": False})[1])
+    other = json.loads(request(server, "POST", "/chat", {"message": "Hi", "session": "b", "stream": False})[1])
+
+    assert first["thread_id"] == second["thread_id"]
+    assert first["thread_id"] != other["thread_id"]
+
+    request(server, "DELETE", "/sessions/a")
+    assert "a" not in server.sessions.sessions
+
+
+def test_chat_bad_request(server):
+    with pytest.raises(urllib.error.HTTPError) as e:
+        request(server, "POST", "/chat", {"text": "Hello"})
+    assert e.value.code == 400
+
+
+def test_chat_concurrency_limit(server):
+    for _ in range(server.concurrency):
+        server._slots.acquire()
+
+    with pytest.raises(urllib.error.HTTPError) as e:
+        request(server, "POST", "/chat", {"message": "Hello"})
+
+    assert e.value.code == 429
+    assert e.value.headers["Retry-After"] == "1"
+    assert json.loads(request(server, "GET", "/health")[1])["rejected"] == 1
+
+
+def test_chat_error(server, monkeypatch):
+    def fail(**kwargs):
+        raise RuntimeError("Run failed")
+
+    monkeypatch.setattr(server.client.client.beta.threads.runs, "stream", fail)
+    _, body = request(server, "POST", "/chat", {"message": "Hello"})
+
+    event, data = parse_events(body)[-1]
+    assert event == "error"
+    assert data["error"] == "RuntimeError: Run failed"
+    assert json.loads(request(server, "GET", "/health")[1])["errors"] == 1
@@ -0,0 +1,52 @@
+import time
+
+from vecsync.chat.sessions import SessionThreads, ThreadPool
+
+
+def test_thread_pool_acquire(mocked_client):
+    pool = ThreadPool(mocked_client, size=2)
+    pool.fill()
+
+    deadline = time.monotonic() + 5
+    while pool.available.qsize() < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert pool.available.qsize() == 2
+    assert pool.acquire() in {"thread_1", "thread_2"}
+
+
+def test_thread_pool_acquire_empty(mocked_client):
+    pool = ThreadPool(mocked_client, size=0)
+    assert pool.acquire() == "thread_1"
+    assert pool.acquire() == "thread_2"
+
+
+def test_session_threads_owner(mocked_client):
+    mocked_client.connect()
+    sessions = SessionThreads(mocked_client, pool_size=0)
+
+    assert sessions.open("a") == (mocked_client.thread_id, True)
+    assert sessions.get("a") == mocked_client.thread_id
+
+
+def test_session_threads_separate(mocked_client):
+    mocked_client.connect()
+    sessions = SessionThreads(mocked_client, pool_size=0)
+
+    thread_a = sessions.get("a")
+    thread_b, persisted = sessions.open("b")
+
+    assert thread_a != thread_b
+    assert not persisted
+
+
+def test_session_threads_release(mocked_client):
+    mocked_client.connect()
+    sessions = SessionThreads(mocked_client, pool_size=0)
+
+    sessions.open("a")
+    sessions.open("b")
+    sessions.close("a")
+
+    # The persisted thread is handed to the next new session
+    assert sessions.open("c") == (mocked_client.thread_id, True)
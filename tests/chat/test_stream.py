@@ -0,0 +1,47 @@
+from vecsync.chat.stream import StreamBuffer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_stream_buffer_interval():
+    clock = FakeClock()
+    buffer = StreamBuffer(interval=1.0, max_chars=100, clock=clock)
+
+    assert not buffer.append("a")
+    assert not buffer.append("b")
+
+    clock.now = 1.0
+    assert buffer.append("c")
+    assert buffer.flush() == "abc"
+    assert not buffer.pending
+
+
+def test_stream_buffer_max_chars():
+    buffer = StreamBuffer(interval=100.0, max_chars=3, clock=FakeClock())
+
+    assert not buffer.append("ab")
+    assert buffer.append("cd")
+    assert buffer.flush() == "abcd"
+
+
+def test_stream_buffer_flush():
+    clock = FakeClock()
+    buffer = StreamBuffer(interval=1.0, clock=clock)
+
+    buffer.append("ab")
+    assert buffer.flush() == "ab"
+
+    buffer.append("cd")
+    assert buffer.flush() == "abcd"
+    assert buffer.flush() == "abcd"
+
+    # The interval is measured from the last flush
+    clock.now = 1.5
+    buffer.flush()
+    assert not buffer.append("e")
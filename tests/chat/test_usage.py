@@ -0,0 +1,46 @@
+from datetime import date
+
+import pytest
+
+from vecsync.chat.usage import Budget, Usage, UsageLedger, estimate_cost
+from vecsync.settings import Settings
+
+
+def test_estimate_cost():
+    assert estimate_cost("gpt-4o-mini", 1_000_000, 1_000_000) == pytest.approx(0.75)
+    assert estimate_cost("gpt-4o-mini-2024-07-18", 1_000_000, 0) == pytest.approx(0.15)
+    assert estimate_cost("gpt-4o", 1_000_000, 0) == pytest.approx(2.50)
+    assert estimate_cost("unknown-model", 1_000_000, 0) is None
+    assert estimate_cost(None, 1_000_000, 0) is None
+
+
+def test_usage_add():
+    total = Usage(prompt_tokens=1, completion_tokens=2, total_tokens=3, cost=0.5) + Usage(total_tokens=1)
+    assert total == Usage(prompt_tokens=1, completion_tokens=2, total_tokens=4, cost=0.5)
+    assert (Usage() + Usage()).cost is None
+
+
+def test_ledger(tmp_path):
+    ledger = UsageLedger(path=tmp_path / "usage.sqlite")
+    day_1, day_2 = date(2025, 1, 1), date(2025, 1, 2)
+
+    ledger.record(Usage(prompt_tokens=10, completion_tokens=5, total_tokens=15, cost=0.1), "thread_1", day=day_1)
+    ledger.record(Usage(prompt_tokens=20, completion_tokens=5, total_tokens=25), "thread_2", "session", day=day_2)
+    ledger.record(Usage(prompt_tokens=30, completion_tokens=5, total_tokens=35), "thread_2", "session", day=day_2)
+
+    assert ledger.total(day_1) == Usage(prompt_tokens=10, completion_tokens=5, total_tokens=15, cost=0.1)
+    assert ledger.total(day_2).total_tokens == 60
+    assert ledger.total(date(2025, 1, 3)) == Usage()
+
+    assert {k: v.total_tokens for k, v in ledger.summary(by="day").items()} == {"2025-01-02": 60, "2025-01-01": 15}
+    assert list(ledger.summary(by="thread")) == ["thread_2", "thread_1"]
+    assert {k: v.total_tokens for k, v in ledger.summary(by="session").items()} == {"session": 60, "": 15}
+    assert list(ledger.summary(by="day", since=day_2)) == ["2025-01-02"]
+
+
+def test_budget_settings(tmp_path):
+    settings = Settings(path=tmp_path / "settings.json")
+    assert Budget.load(settings) is None
+
+    Budget(daily_tokens=1000, action="warn").save(settings)
+    assert Budget.load(settings) == Budget(daily_tokens=1000, action="warn")
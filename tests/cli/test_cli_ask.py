@@ -0,0 +1,47 @@
+import json
+
+from click.testing import CliRunner
+
+import vecsync.cli.ask as cli
+
+
+def test_ask_single(monkeypatch, mocked_client):
+    monkeypatch.setattr("vecsync.cli.ask.OpenAIClient", lambda **kwargs: mocked_client)
+
+    result = CliRunner().invoke(cli.ask, ["What is this?"])
+    assert result.exit_code == 0
+
+    answer = json.loads(result.stdout.splitlines()[-1])
+    assert answer["question"] == "What is this?"
+    assert answer["answer"] == "Thisisatestmessagefromtheassistant"
+
+
+def test_ask_batch_resume(monkeypatch, mocked_client, tmp_path):
+    monkeypatch.setattr("vecsync.cli.ask.OpenAIClient", lambda **kwargs: mocked_client)
+
+    questions = tmp_path / "questions.txt"
+    questions.write_text("First?\nSecond?\n")
+    output = tmp_path / "answers.jsonl"
+    output.write_text(json.dumps({"id": "1", "question": "First?", "answer": "Done"}) + "\n")
+
+    result = CliRunner().invoke(cli.ask, ["--batch", str(questions), "--output", str(output), "--concurrency", "2"])
+    assert result.exit_code == 0
+    assert "Answered 1 questions | Failed: 0 | Skipped: 1" in result.output
+
+    answers = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [a["id"] for a in answers] == ["1", "2"]
+
+
+def test_ask_requires_question(mocked_client):
+    result = CliRunner().invoke(cli.ask, [])
+    assert result.exit_code != 0
+    assert "Provide either a QUESTION or --batch" in result.output
+
+
+def test_ask_batch_invalid(mocked_client, tmp_path):
+    questions = tmp_path / "questions.jsonl"
+    questions.write_text('{"question": "First?"}\n{"id": "2"}\n')
+
+    result = CliRunner().invoke(cli.ask, ["--batch", str(questions)])
+    assert result.exit_code == 2
+    assert 'Line 2 has no "question"' in result.output
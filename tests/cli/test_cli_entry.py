@@ -0,0 +1,96 @@
+import json
+import subprocess
+import sys
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from vecsync.cli.lazy import LazyGroup
+from vecsync.cli.settings import group as settings_group
+
+# Modules which must not be imported to run a command, and the maximum time in seconds to import the CLI
+# and resolve the command. Gradio alone takes seconds to import so the budget catches it being pulled in.
+IMPORT_BUDGETS = {
+    "ask": ({"gradio", "tqdm"}, 2.5),
+    "settings show": ({"gradio", "openai", "tqdm"}, 1.0),
+    "store list": ({"gradio", "tqdm"}, 2.5),
+    "sync": ({"gradio", "tqdm"}, 2.5),
+    "assistants list": ({"gradio", "tqdm"}, 2.5),
+    "chat": ({"gradio", "tqdm"}, 2.5),
+    "search": ({"gradio", "tqdm"}, 2.5),
+    "serve": ({"gradio", "tqdm"}, 2.5),
+    "usage show": ({"gradio", "openai", "tqdm"}, 1.0),
+}
+
+RESOLVE_COMMAND = """
+import json, sys
+from time import perf_counter
+
+start = perf_counter()
+import click
+from vecsync.cli.entry import cli
+
+command, ctx = cli, click.Context(cli)
+for name in sys.argv[1:]:
+    command = command.get_command(ctx, name)
+
+print(json.dumps({
+    "elapsed": perf_counter() - start,
+    "command": command.name,
+    "modules": sorted({m.split(".")[0] for m in sys.modules}),
+}))
+"""
+
+
+@pytest.fixture
+def lazy_group():
+    @click.group(cls=LazyGroup, lazy_commands={"settings": "vecsync.cli.settings:group"})
+    def group():
+        pass
+
+    return group
+
+
+def test_lazy_group_loads_on_invoke(lazy_group):
+    assert "settings" not in lazy_group.commands
+
+    result = CliRunner().invoke(lazy_group, ["settings", "--help"])
+
+    assert result.exit_code == 0
+    assert "Commands to manage application settings" in result.output
+    assert lazy_group.commands["settings"] is settings_group
+
+
+def test_lazy_group_help_lists_commands(lazy_group):
+    result = CliRunner().invoke(lazy_group, ["--help"])
+
+    assert result.exit_code == 0
+    assert "settings" in result.output
+
+
+def test_lazy_group_invalid_command():
+    @click.group(cls=LazyGroup, lazy_commands={"bad": "vecsync.constants:DEFAULT_STORE_NAME"})
+    def group():
+        pass
+
+    with pytest.raises(ValueError, match="is not a click command"):
+        group.get_command(click.Context(group), "bad")
+
+
+@pytest.mark.parametrize("command", IMPORT_BUDGETS)
+def test_command_import_budget(command):
+    forbidden, budget = IMPORT_BUDGETS[command]
+
+    # Run in a fresh interpreter since the test session has already imported everything
+    output = subprocess.run(
+        [sys.executable, "-c", RESOLVE_COMMAND, *command.split()],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output)
+
+    assert result["command"] == command.split()[-1]
+    assert forbidden.isdisjoint(result["modules"]), f"'vs {command}' imports {forbidden & set(result['modules'])}"
+    assert result["elapsed"] < budget, f"'vs {command}' took {result['elapsed']:.2f}s to import"
@@ -0,0 +1,122 @@
+import json
+
+from click.testing import CliRunner
+
+import vecsync.cli.search as cli
+from vecsync.chat.formatter import PlainFormatter
+from vecsync.constants import DEFAULT_STORE_NAME
+from vecsync.settings import Settings
+from vecsync.store.base import SearchResult
+from vecsync.store.local import LocalVectorStore
+from vecsync.store.metadata import FileMetadata, MetadataIndex
+
+
+def test_format_results():
+    results = [
+        SearchResult(file_id="file_1", filename="a.pdf", score=0.9, text="First passage"),
+        SearchResult(file_id="file_2", filename="b.pdf", score=0.8, text="Second passage"),
+        SearchResult(file_id="file_1", filename="a.pdf", score=0.7, text="Third passage"),
+    ]
+    metadata = {"file_2": FileMetadata(title="A Paper", authors=["Smith"], year=2020)}
+
+    # The plain formatter omits references, so they are checked with the console formatter
+    text = cli.format_results(results, cli.ConsoleFormatter(), metadata)
+    plain = cli.format_results(results, PlainFormatter())
+
+    assert "1. [1] score 0.900" in plain
+    assert "2. [2] score 0.800" in plain
+    assert "3. [1] score 0.700" in plain
+    assert "References" in text
+    assert "a.pdf" in text
+    assert "Smith (2020). A Paper" in text
+    assert text.count("a.pdf") == 1
+
+
+def test_format_results_truncates():
+    results = [SearchResult(file_id="file_1", filename="a.pdf", score=0.5, text="word " * 500)]
+
+    text = cli.format_results(results, PlainFormatter(), width=50)
+
+    assert "…" in text
+    assert len(text) < 100
+
+
+def test_search(monkeypatch, mocked_vector_store, create_test_upload, tmp_path):
+    mocked_vector_store.sync(create_test_upload)
+    monkeypatch.setattr("vecsync.cli.search.OpenAiVectorStore", lambda _, **kwargs: mocked_vector_store)
+    monkeypatch.setattr("vecsync.cli.search.Settings", lambda: Settings(path=tmp_path / "settings.json"))
+    monkeypatch.setattr("vecsync.cli.search.MetadataIndex", lambda: MetadataIndex(tmp_path / "metadata.json"))
+
+    runner = CliRunner()
+    result = runner.invoke(cli.search, ["causal effects", "--top-k", "2"])
+    assert result.exit_code == 0
+
+    assert "score 1.000" in result.output
+    assert "score 0.500" in result.output
+    assert "References" in result.output
+
+
+def test_search_json(monkeypatch, mocked_vector_store, create_test_upload, tmp_path):
+    mocked_vector_store.sync(create_test_upload)
+    monkeypatch.setattr("vecsync.cli.search.OpenAiVectorStore", lambda _, **kwargs: mocked_vector_store)
+    monkeypatch.setattr("vecsync.cli.search.Settings", lambda: Settings(path=tmp_path / "settings.json"))
+
+    runner = CliRunner()
+    result = runner.invoke(cli.search, ["causal effects", "--json"])
+    assert result.exit_code == 0
+
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert [line["rank"] for line in lines] == [1, 2, 3]
+    assert lines[0]["score"] == 1.0
+    assert "causal effects" in lines[0]["text"]
+
+
+def test_search_uses_cached_store(monkeypatch, mocked_vector_store, create_test_upload, tmp_path):
+    mocked_vector_store.sync(create_test_upload)
+    settings = Settings(path=tmp_path / "settings.json")
+    settings["openai_resources"] = {DEFAULT_STORE_NAME: {"vector_store_id": "vector_store_1"}}
+    monkeypatch.setattr("vecsync.cli.search.OpenAiVectorStore", lambda _, **kwargs: mocked_vector_store)
+    monkeypatch.setattr("vecsync.cli.search.Settings", lambda: settings)
+    mocked_vector_store.store = None
+
+    runner = CliRunner()
+    result = runner.invoke(cli.search, ["query", "--json"])
+    assert result.exit_code == 0
+
+    # The cached ID is searched directly without looking up the store
+    assert mocked_vector_store.store is None
+    assert len(result.output.splitlines()) == 3
+
+
+def test_search_local(monkeypatch, tmp_path):
+    document = tmp_path / "notes.txt"
+    document.write_text("Propensity scores adjust for treatment selection bias.")
+    local_store = LocalVectorStore("test_store", path=tmp_path / "stores")
+    local_store.sync([document])
+    monkeypatch.setattr("vecsync.cli.search.local_store", lambda _: local_store)
+
+    runner = CliRunner()
+    result = runner.invoke(cli.search, ["selection bias", "--backend", "local", "--json"])
+    assert result.exit_code == 0
+
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert len(lines) == 1
+    assert lines[0]["filename"] == "notes.txt"
+
+
+def test_search_filter(monkeypatch, mocked_vector_store, create_test_upload, tmp_path):
+    files = sorted(create_test_upload)
+    mocked_vector_store.sync(files, {f.name: {"year": 2020 + i} for i, f in enumerate(files)})
+    monkeypatch.setattr("vecsync.cli.search.OpenAiVectorStore", lambda _, **kwargs: mocked_vector_store)
+    monkeypatch.setattr("vecsync.cli.search.Settings", lambda: Settings(path=tmp_path / "settings.json"))
+
+    runner = CliRunner()
+    result = runner.invoke(cli.search, ["query", "--json", "--filter", "year>=2021", "--filter", "year<2022"])
+    assert result.exit_code == 0
+
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert [line["filename"] for line in lines] == [files[1].name]
+
+    result = runner.invoke(cli.search, ["query", "--filter", "year"])
+    assert result.exit_code == 2
+    assert "Invalid filter" in result.output
@@ -1,7 +1,12 @@
 from click.testing import CliRunner
 
 import vecsync.cli.settings as cli
+from vecsync.chat.compaction import ThreadPolicy
+from vecsync.connection import ConnectionOptions
 from vecsync.settings import Settings
+from vecsync.store.chunking import ChunkingPolicy
+from vecsync.store.priority import SyncPriority
+from vecsync.store.sharding import ShardingOptions
 
 
 def test_settings_show(monkeypatch, tmp_path):
@@ -30,3 +35,91 @@ def test_settings_delete(monkeypatch, tmp_path):
     assert result.exit_code == 0
     assert "Settings file cleared." in result.output
     assert not settings_file.exists()
+
+
+def test_settings_thread(monkeypatch, tmp_path):
+    settings_file = tmp_path / "settings.json"
+    monkeypatch.setattr("vecsync.cli.settings.Settings", lambda: Settings(settings_file))
+
+    runner = CliRunner()
+    result = runner.invoke(cli.thread, ["--max-turns", "10", "--max-context-tokens", "0", "--last-messages", "6"])
+    assert result.exit_code == 0
+    assert "max_context_tokens: unlimited" in result.output
+
+    assert ThreadPolicy.load(Settings(settings_file)) == ThreadPolicy(
+        max_turns=10, max_context_tokens=None, last_messages=6
+    )
+
+
+def test_settings_connection(monkeypatch, tmp_path):
+    settings_file = tmp_path / "settings.json"
+    monkeypatch.setattr("vecsync.cli.settings.Settings", lambda: Settings(settings_file))
+
+    runner = CliRunner()
+    result = runner.invoke(cli.connection, ["--max-connections", "16", "--read-timeout", "30", "--no-http2"])
+    assert result.exit_code == 0
+    assert "max_connections: 16" in result.output
+
+    assert ConnectionOptions.load(Settings(settings_file)) == ConnectionOptions(
+        max_connections=16, read_timeout=30.0, http2=False
+    )
+
+
+def test_settings_chunking(monkeypatch, tmp_path):
+    settings_file = tmp_path / "settings.json"
+    monkeypatch.setattr("vecsync.cli.settings.Settings", lambda: Settings(settings_file))
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli.chunking, ["--profile", "medium", "--source", "zotero=small", "--large-file-size", "5000000"]
+    )
+    assert result.exit_code == 0
+    assert "Chunking policy updated" in result.output
+
+    assert ChunkingPolicy.load(Settings(settings_file)) == ChunkingPolicy(
+        default="medium", sources={"zotero": "small"}, large_file_bytes=5_000_000
+    )
+
+    result = runner.invoke(cli.chunking, ["--source", "zotero=auto", "--large-file-size", "0"])
+    assert ChunkingPolicy.load(Settings(settings_file)) == ChunkingPolicy(default="medium")
+
+    result = runner.invoke(cli.chunking, ["--source", "zotero=huge"])
+    assert result.exit_code == 2
+
+
+def test_settings_shards(monkeypatch, tmp_path):
+    settings_file = tmp_path / "settings.json"
+    monkeypatch.setattr("vecsync.cli.settings.Settings", lambda: Settings(settings_file))
+
+    runner = CliRunner()
+    result = runner.invoke(cli.shards)
+    assert result.exit_code == 0
+    assert "shards: 1" in result.output
+
+    result = runner.invoke(cli.shards, ["4"])
+    assert result.exit_code == 0
+    assert "Shard count updated" in result.output
+    assert ShardingOptions.load(Settings(settings_file)).shards == 4
+
+    result = runner.invoke(cli.shards, ["0"])
+    assert result.exit_code == 2
+
+
+def test_settings_priority(monkeypatch, tmp_path):
+    settings_file = tmp_path / "settings.json"
+    monkeypatch.setattr("vecsync.cli.settings.Settings", lambda: Settings(settings_file))
+
+    runner = CliRunner()
+    result = runner.invoke(cli.priority, ["added", "--pin", "survey.pdf", "--pin", "review.pdf"])
+    assert result.exit_code == 0
+    assert "Sync priority updated" in result.output
+    assert SyncPriority.load(Settings(settings_file)) == SyncPriority(
+        order="added", pinned=["survey.pdf", "review.pdf"]
+    )
+
+    result = runner.invoke(cli.priority, ["--clear-pins"])
+    assert result.exit_code == 0
+    assert SyncPriority.load(Settings(settings_file)) == SyncPriority(order="added")
+
+    result = runner.invoke(cli.priority, ["largest"])
+    assert result.exit_code == 2
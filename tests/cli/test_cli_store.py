@@ -4,7 +4,7 @@ import vecsync.cli.store as cli
 
 
 def test_list_stores_empty(monkeypatch, mocked_vector_store):
-    monkeypatch.setattr("vecsync.cli.store.OpenAiVectorStore", lambda _: mocked_vector_store)
+    monkeypatch.setattr("vecsync.cli.store.OpenAiVectorStore", lambda _, **kwargs: mocked_vector_store)
 
     runner = CliRunner()
     result = runner.invoke(cli.list_stores)
@@ -18,8 +18,8 @@ def test_list_stores_non_empty(monkeypatch, mocked_vector_store, tmp_path):
     with open(filename, "w") as f:
         f.write("Test data")
 
-    mocked_vector_store._upload_files({filename})
-    monkeypatch.setattr("vecsync.cli.store.OpenAiVectorStore", lambda _: mocked_vector_store)
+    mocked_vector_store.sync([filename])
+    monkeypatch.setattr("vecsync.cli.store.OpenAiVectorStore", lambda _, **kwargs: mocked_vector_store)
 
     runner = CliRunner()
     result = runner.invoke(cli.list_stores)
@@ -34,8 +34,8 @@ def test_delete_stores(monkeypatch, mocked_vector_store, tmp_path):
     with open(filename, "w") as f:
         f.write("Test data")
 
-    mocked_vector_store._upload_files({filename})
-    monkeypatch.setattr("vecsync.cli.store.OpenAiVectorStore", lambda _: mocked_vector_store)
+    mocked_vector_store.sync([filename])
+    monkeypatch.setattr("vecsync.cli.store.OpenAiVectorStore", lambda _, **kwargs: mocked_vector_store)
 
     runner = CliRunner()
     result = runner.invoke(cli.delete)
@@ -43,3 +43,20 @@ def test_delete_stores(monkeypatch, mocked_vector_store, tmp_path):
 
     assert "Deleting 1 files from" in result.output
     assert "Deleting vector store" in result.output
+
+
+def test_gc(monkeypatch, mocked_vector_store, tmp_path):
+    filename = tmp_path / "data.pdf"
+    filename.write_text("Test data")
+    mocked_vector_store._upload(filename)
+    monkeypatch.setattr("vecsync.cli.store.OpenAiVectorStore", lambda _, **kwargs: mocked_vector_store)
+
+    runner = CliRunner()
+    result = runner.invoke(cli.gc, ["--dry-run"])
+    assert result.exit_code == 0
+    assert "Kept 1 unattached files uploaded in the last 24 hours" in result.output
+
+    result = runner.invoke(cli.gc, ["--grace-hours", "0"])
+    assert result.exit_code == 0
+    assert "Deleted 1 of 1 orphaned files" in result.output
+    assert len(mocked_vector_store.client.files.list()) == 0
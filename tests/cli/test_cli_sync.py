@@ -1,6 +1,9 @@
 from click.testing import CliRunner
 
 import vecsync.cli.sync as cli
+from vecsync.chat.cache import ResponseCache
+from vecsync.store.attributes import HashCache
+from vecsync.store.local import LocalVectorStore
 
 
 def test_sync_filesource(monkeypatch, tmp_path, mocked_vector_store):
@@ -9,8 +12,13 @@ def test_sync_filesource(monkeypatch, tmp_path, mocked_vector_store):
     with open(filename, "w") as f:
         f.write("Test data")
 
+    cache = ResponseCache(path=tmp_path / "responses.sqlite")
+    cache.put("key", [("cached", {})])
+
     monkeypatch.chdir(tmp_path)
-    monkeypatch.setattr("vecsync.cli.sync.OpenAiVectorStore", lambda _: mocked_vector_store)
+    monkeypatch.setattr("vecsync.cli.sync.OpenAiVectorStore", lambda _, **kwargs: mocked_vector_store)
+    monkeypatch.setattr("vecsync.cli.sync.ResponseCache", lambda: cache)
+    monkeypatch.setattr("vecsync.cli.sync.HashCache", lambda: HashCache(tmp_path / "hashes.json"))
 
     runner = CliRunner()
     result = runner.invoke(cli.sync, ["--source", "file"])
@@ -20,3 +28,28 @@ def test_sync_filesource(monkeypatch, tmp_path, mocked_vector_store):
     assert "Saved: 1 | Deleted: 0 | Skipped: 0" in result.output
 
     assert len(mocked_vector_store.get_files()) == 1
+    assert len(HashCache(tmp_path / "hashes.json").load()) == 1
+
+    # Changing the store invalidates cached responses
+    assert len(cache) == 0
+
+
+def test_sync_local_backend(monkeypatch, tmp_path):
+    with open(tmp_path / "data.pdf", "w") as f:
+        f.write("Test data")
+
+    local_store = LocalVectorStore("test_store", path=tmp_path / "stores")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("vecsync.cli.sync.local_store", lambda _: local_store)
+    monkeypatch.setattr("vecsync.cli.sync.ResponseCache", lambda: ResponseCache(path=tmp_path / "responses.sqlite"))
+    monkeypatch.setattr("vecsync.cli.sync.HashCache", lambda: HashCache(tmp_path / "hashes.json"))
+    # PDF extraction needs the optional pypdf dependency
+    monkeypatch.setattr("vecsync.store.local.extract_text", lambda path: "Extracted text about causal inference")
+
+    runner = CliRunner()
+    result = runner.invoke(cli.sync, ["--backend", "local"])
+    assert result.exit_code == 0
+
+    assert "Syncing 1 files from local to the local store" in result.output
+    assert "Saved: 1 | Deleted: 0 | Skipped: 0" in result.output
+    assert local_store.search("causal")[0].filename == "data.pdf"
@@ -0,0 +1,31 @@
+from click.testing import CliRunner
+
+import vecsync.cli.usage as cli
+from vecsync.chat.usage import Usage, UsageLedger
+from vecsync.settings import Settings
+
+
+def test_usage_show(monkeypatch, tmp_path):
+    ledger = UsageLedger(path=tmp_path / "usage.sqlite")
+    ledger.record(Usage(prompt_tokens=100, completion_tokens=20, total_tokens=120, cost=0.001), "thread_1")
+
+    monkeypatch.setattr("vecsync.cli.usage.UsageLedger", lambda: ledger)
+    monkeypatch.setattr("vecsync.cli.usage.Settings", lambda: Settings(tmp_path / "settings.json"))
+
+    result = CliRunner().invoke(cli.show, ["--by", "thread"])
+    assert result.exit_code == 0
+    assert "thread_1: 120 tokens (100 prompt + 20 completion) ~$0.0010" in result.output
+
+
+def test_usage_budget(monkeypatch, tmp_path):
+    settings_file = tmp_path / "settings.json"
+    monkeypatch.setattr("vecsync.cli.usage.Settings", lambda: Settings(settings_file))
+
+    runner = CliRunner()
+    result = runner.invoke(cli.budget, ["50000", "--warn"])
+    assert result.exit_code == 0
+    assert "Daily token budget: 50,000 tokens (warn when used up)" in result.output
+    assert Settings(settings_file)["token_budget"].value == {"daily_tokens": 50000, "action": "warn"}
+
+    result = runner.invoke(cli.budget, ["--clear"])
+    assert "No token budget set." in result.output
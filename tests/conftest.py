@@ -1,3 +1,4 @@
+import itertools
 import os
 import sqlite3
 from datetime import datetime
@@ -5,13 +6,17 @@ from types import SimpleNamespace
 from typing import Any
 
 import pytest
+from openai import NotFoundError
 from pydantic import BaseModel
 from pytest import fixture
 
 import vecsync.chat.clients.openai as client_mod
+import vecsync.chat.clients.responses as responses_mod
 from vecsync.chat.clients.openai import OpenAIClient, OpenAIHandler
+from vecsync.chat.clients.responses import ResponsesClient
 from vecsync.chat.formatter import ConsoleFormatter
 from vecsync.settings import SettingExists, SettingMissing, Settings
+from vecsync.store.attributes import matches
 from vecsync.store.openai import OpenAiVectorStore
 
 
@@ -60,6 +65,62 @@ def zotero_db_mock(tmp_path_factory):
     return dbfile
 
 
+@fixture
+def zotero_library_mock(tmp_path_factory):
+    # Prepare a fake DB with the item, field and creator tables used for metadata
+    dbfile = tmp_path_factory.mktemp("library") / "zotero.sqlite"
+    conn = sqlite3.connect(str(dbfile))
+    cur = conn.cursor()
+    cur.executescript(
+        """
+        CREATE TABLE collections (collectionID INTEGER, collectionName TEXT);
+        CREATE TABLE collectionItems (collectionID INTEGER, itemID INTEGER);
+        CREATE TABLE items (itemID INTEGER, key TEXT, dateAdded TEXT);
+        CREATE TABLE itemAttachments (itemID INTEGER, parentItemID INTEGER, contentType TEXT, path TEXT);
+        CREATE TABLE fields (fieldID INTEGER, fieldName TEXT);
+        CREATE TABLE itemData (itemID INTEGER, fieldID INTEGER, valueID INTEGER);
+        CREATE TABLE itemDataValues (valueID INTEGER, value TEXT);
+        CREATE TABLE creators (creatorID INTEGER, firstName TEXT, lastName TEXT);
+        CREATE TABLE itemCreators (itemID INTEGER, creatorID INTEGER, orderIndex INTEGER);
+        """
+    )
+    cur.executemany("INSERT INTO collections VALUES (?,?)", [(1, "Foo")])
+    cur.executemany("INSERT INTO collectionItems VALUES (?,?)", [(1, 10), (1, 20)])
+    cur.executemany(
+        "INSERT INTO items VALUES (?,?,?)",
+        [
+            (10, "P1", "2023-01-05 10:00:00"),
+            (11, "A1", "2023-01-05 10:00:00"),
+            (20, "P2", "2024-03-01 08:30:00"),
+            (21, "A2", "2024-03-01 08:30:00"),
+        ],
+    )
+    cur.executemany(
+        "INSERT INTO itemAttachments VALUES (?,?,?,?)",
+        [(11, 10, "application/pdf", "storage:paper1.pdf"), (21, 20, "application/pdf", "storage:paper2.pdf")],
+    )
+    cur.executemany("INSERT INTO fields VALUES (?,?)", [(1, "title"), (2, "date"), (3, "url")])
+    cur.executemany(
+        "INSERT INTO itemData VALUES (?,?,?)",
+        [(10, 1, 100), (10, 2, 101), (10, 3, 102), (20, 1, 200)],
+    )
+    cur.executemany(
+        "INSERT INTO itemDataValues VALUES (?,?)",
+        [(100, "Attention Is All You Need"), (101, "2017-06-12 2017-06-12"), (102, "https://x"), (200, "Untitled")],
+    )
+    cur.executemany("INSERT INTO creators VALUES (?,?,?)", [(1, "Ashish", "Vaswani"), (2, "Noam", "Shazeer")])
+    cur.executemany("INSERT INTO itemCreators VALUES (?,?,?)", [(10, 2, 1), (10, 1, 0)])
+    conn.commit()
+    conn.close()
+
+    return dbfile
+
+
+def not_found(id: str) -> NotFoundError:
+    response = SimpleNamespace(request=None, status_code=404, headers={})
+    return NotFoundError(f"No such object: {id}", response=response, body=None)
+
+
 class MockAssistant(BaseModel):
     id: str
     name: str
@@ -79,6 +140,7 @@ class MockMessageContent(BaseModel):
 
 
 class MockMessageData(BaseModel):
+    id: str
     content: list[MockMessageContent]
     created_at: int  # TODO: Check if this is really at both levels
     role: str
@@ -93,6 +155,7 @@ class MockMessage(BaseModel):
 class MockThreadMessageResponse(BaseModel):
     thread_id: str
     data: list[MockMessageData]
+    has_more: bool = False
 
 
 class MockVectorStore(BaseModel):
@@ -108,6 +171,10 @@ class MockFileUpload(BaseModel):
 class MockFile(BaseModel):
     id: str
     filename: str
+    attributes: dict | None = None
+    purpose: str = "assistants"
+    bytes: int = 0
+    created_at: int = 0
 
 
 class MockFileDeletedResult(BaseModel):
@@ -140,10 +207,14 @@ class MockStreamResponse(BaseModel):
 def mock_vector_store():
     vector_store = []
     file_store = []
-    vector_file_store = []
+    # Attached files keyed by vector store ID
+    vector_file_store: dict[str, list] = {}
+    # Files are uploaded concurrently, so IDs come from a counter rather than the store size
+    file_ids = itertools.count(1)
+    store_ids = itertools.count(1)
 
     def create_vector_store(name):
-        store = MockVectorStore(id=f"vector_store_{len(vector_store) + 1}", name=name)
+        store = MockVectorStore(id=f"vector_store_{next(store_ids)}", name=name)
         vector_store.append(store)
         return store
 
@@ -157,16 +228,24 @@ def mock_vector_store():
     def list_vector_stores():
         return vector_store
 
+    def retrieve_vector_store(vector_store_id):
+        for store in vector_store:
+            if store.id == vector_store_id:
+                return store
+        raise not_found(vector_store_id)
+
     def list_files():
         return file_store
 
     def list_vector_store_files(vector_store_id):
-        return vector_file_store
+        return vector_file_store.setdefault(vector_store_id, [])
 
     def delete_vector_store_file(vector_store_id, file_id):
-        for vector_file in vector_file_store:
+        for vector_file in vector_file_store.get(vector_store_id, []):
             if vector_file.id == file_id:
-                vector_file_store.remove(vector_file)
+                vector_file_store[vector_store_id].remove(vector_file)
+                return
+        raise not_found(file_id)
 
     def delete_file(file_id):
         for file in file_store:
@@ -177,28 +256,66 @@ def mock_vector_store():
 
     def create_file(**kwargs):
         base_name = os.path.basename(kwargs["file"].name)
-        file = MockFileUpload(id=f"file_{len(file_store) + 1}", file=kwargs["file"])
-        file_store.append(MockFile(id=file.id, filename=base_name))
+        file = MockFileUpload(id=f"file_{next(file_ids)}", file=kwargs["file"])
+        size = os.path.getsize(kwargs["file"].name)
+        file_store.append(
+            MockFile(id=file.id, filename=base_name, bytes=size, created_at=int(datetime.now().timestamp()))
+        )
         return file
 
-    def create_and_poll(vector_store_id, file_id):
+    def create_and_poll(vector_store_id, file_id, attributes=None, chunking_strategy=None):
+        create_and_poll.calls.append({"file_id": file_id, "chunking_strategy": chunking_strategy})
         for store in vector_store:
             if store.id == vector_store_id:
-                vector_file = MockFile(id=file_id, filename=f"file_{file_id}")
-                vector_file_store.append(vector_file)
+                vector_file = MockFile(id=file_id, filename=f"file_{file_id}", attributes=attributes)
+                vector_file_store.setdefault(vector_store_id, []).append(vector_file)
                 return vector_file
         return None
 
+    create_and_poll.calls = []
+
+    def update_vector_store_file(file_id, vector_store_id, attributes):
+        for vector_file in vector_file_store.get(vector_store_id, []):
+            if vector_file.id == file_id:
+                vector_file.attributes = attributes
+                return vector_file
+        raise not_found(file_id)
+
+    def search_vector_store(vector_store_id, query, max_num_results=10, filters=None):
+        if vector_store_id not in [store.id for store in vector_store]:
+            raise not_found(vector_store_id)
+
+        # Uploaded files which were never attached are searched too, unless the store has attached files
+        attached = {f.id: f.attributes or {} for f in vector_file_store.get(vector_store_id, [])}
+        files = [f for f in file_store if len(attached) == 0 or f.id in attached]
+        if filters is not None:
+            files = [f for f in files if matches(filters, attached.get(f.id, {}))]
+
+        # Every file matches with a decreasing score
+        return [
+            SimpleNamespace(
+                file_id=file.id,
+                filename=file.filename,
+                score=1 / (i + 1),
+                content=[SimpleNamespace(type="text", text=f"Passage about {query} from {file.filename}")],
+                attributes={},
+            )
+            for i, file in enumerate(files[:max_num_results])
+        ]
+
     # attach methods
     vs_files_ns = SimpleNamespace()
     vs_files_ns.list = list_vector_store_files
     vs_files_ns.delete = delete_vector_store_file
     vs_files_ns.create_and_poll = create_and_poll
+    vs_files_ns.update = update_vector_store_file
 
     stores_ns = SimpleNamespace()
     stores_ns.create = create_vector_store
     stores_ns.delete = delete_vector_store
     stores_ns.list = list_vector_stores
+    stores_ns.retrieve = retrieve_vector_store
+    stores_ns.search = search_vector_store
     stores_ns.files = vs_files_ns
 
     files_ns = SimpleNamespace()
@@ -219,6 +336,7 @@ def mock_client_backend():
     assistant_store = []
     threads_store = []
     message_store = []
+    cancelled_runs = []
 
     def create_assistant(**kwargs):
         name = kwargs["name"]
@@ -229,6 +347,12 @@ def mock_client_backend():
     def list_assistants():
         return assistant_store
 
+    def retrieve_assistant(assistant_id):
+        for assistant in assistant_store:
+            if assistant.id == assistant_id:
+                return assistant
+        raise not_found(assistant_id)
+
     def delete_assistant(assistant_id):
         for assistant in assistant_store:
             if assistant.id == assistant_id:
@@ -237,14 +361,23 @@ def mock_client_backend():
     def create_thread(**kwargs):
         thread = MockThread(id=f"thread_{len(threads_store) + 1}")
         threads_store.append(thread)
+        for message in kwargs.get("messages", []):
+            create_message(thread_id=thread.id, **message)
         return thread
 
+    def retrieve_thread(thread_id):
+        for thread in threads_store:
+            if thread.id == thread_id:
+                return thread
+        raise not_found(thread_id)
+
     def create_message(**kwargs):
         created_at = int(datetime.now().timestamp())
 
         message = MockMessage(
             created_at=created_at,
             data=MockMessageData(
+                id=f"msg_{len(message_store) + 1}",
                 created_at=created_at,
                 content=[MockMessageContent(type="text", text=MockMessageContentText(value=kwargs["content"]))],
                 role=kwargs["role"],
@@ -257,9 +390,24 @@ def mock_client_backend():
     def list_messages(**kwargs):
         thread_id = kwargs["thread_id"]
         messages = [message.data for message in message_store if message.thread_id == thread_id]
-        return MockThreadMessageResponse(thread_id=thread_id, data=messages)
+        list_messages.calls += 1
+
+        if kwargs.get("order", "desc") == "desc":
+            messages = messages[::-1]
+        if "after" in kwargs:
+            ids = [m.id for m in messages]
+            messages = messages[ids.index(kwargs["after"]) + 1 :]
+
+        limit = kwargs.get("limit", 20)
+        return MockThreadMessageResponse(thread_id=thread_id, data=messages[:limit], has_more=len(messages) > limit)
+
+    list_messages.calls = 0
 
     def stream_response(**kwargs):
+        stream_response.calls.append(kwargs)
+        for message in kwargs.get("additional_messages") or []:
+            create_message(thread_id=kwargs["thread_id"], **message)
+
         class StreamManager:
             def __init__(self, handler):
                 self.handler = handler
@@ -273,6 +421,7 @@ def mock_client_backend():
             def until_done(self):
                 text = """This is a test message from the assistant"""
                 for delta in text.split():
+                    self.handler.on_event(event=None)
                     message = MockStreamResponse(
                         content=[
                             MockStreamResponseContent(
@@ -284,23 +433,84 @@ def mock_client_backend():
 
                 self.handler.on_message_done(message=None)
 
+                # The SDK sets the current run from the run events, the last of which reports the usage
+                self.handler._AssistantEventHandler__current_run = SimpleNamespace(
+                    id="run_1",
+                    status="completed",
+                    model="gpt-4o-mini",
+                    usage=SimpleNamespace(prompt_tokens=100, completion_tokens=8, total_tokens=108),
+                    last_error=None,
+                )
+
         return StreamManager(handler=kwargs["event_handler"])
 
+    stream_response.calls = []
+
+    def create_completion(**kwargs):
+        content = f"Summary of {len(kwargs['messages'][-1]['content'])} characters"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    def create_response(**kwargs):
+        create_response.calls.append(kwargs)
+        response_id = f"resp_{len(create_response.calls)}"
+
+        events = [SimpleNamespace(type="response.output_text.delta", delta=f"{word} ") for word in ["A", "test"]]
+        # Repeated citations of the same file are sent as separate annotations
+        for index in range(2):
+            annotation = {"type": "file_citation", "file_id": "file_1", "filename": "filename.txt", "index": 7}
+            events.append(
+                SimpleNamespace(
+                    type="response.output_text.annotation.added", annotation=annotation, annotation_index=index
+                )
+            )
+        events.append(
+            SimpleNamespace(
+                type="response.completed",
+                response=SimpleNamespace(
+                    id=response_id,
+                    model="gpt-4o-mini",
+                    status="completed",
+                    usage=SimpleNamespace(input_tokens=120, output_tokens=6, total_tokens=126),
+                ),
+            )
+        )
+
+        class ResponseStream:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, exc_type, exc_value, traceback):
+                return False
+
+            def __iter__(self):
+                return iter(events)
+
+        return ResponseStream()
+
+    create_response.calls = []
+
     # attach methods
     assistants_ns = SimpleNamespace()
     assistants_ns.create = create_assistant
     assistants_ns.list = list_assistants
+    assistants_ns.retrieve = retrieve_assistant
     assistants_ns.delete = delete_assistant
 
     messages_ns = SimpleNamespace()
     messages_ns.create = create_message
     messages_ns.list = list_messages
 
+    def cancel_run(**kwargs):
+        cancelled_runs.append(kwargs["run_id"])
+
     runs_ns = SimpleNamespace()
     runs_ns.stream = stream_response
+    runs_ns.cancel = cancel_run
+    runs_ns.cancelled = cancelled_runs
 
     threads_ns = SimpleNamespace()
     threads_ns.create = create_thread
+    threads_ns.retrieve = retrieve_thread
     threads_ns.messages = messages_ns
     threads_ns.runs = runs_ns
 
@@ -309,6 +519,8 @@ def mock_client_backend():
     client.beta = SimpleNamespace()
     client.beta.assistants = assistants_ns
     client.beta.threads = threads_ns
+    client.chat = SimpleNamespace(completions=SimpleNamespace(create=create_completion))
+    client.responses = SimpleNamespace(create=create_response)
 
     return client
 
@@ -323,10 +535,29 @@ def mocked_vector_store():
 
 @pytest.fixture
 def mocked_client(tmp_path, mocked_vector_store, monkeypatch):
-    monkeypatch.setattr(client_mod, "OpenAiVectorStore", lambda store_name: mocked_vector_store)
+    monkeypatch.setattr(client_mod, "OpenAiVectorStore", lambda store_name, **kwargs: mocked_vector_store)
 
     settings_path = tmp_path / "settings.json"
-    client = OpenAIClient(store_name="test_store", settings_path=settings_path)
+    history_path = tmp_path / "history.sqlite"
+    usage_path = tmp_path / "usage.sqlite"
+    client = OpenAIClient(
+        store_name="test_store", settings_path=settings_path, history_path=history_path, usage_path=usage_path
+    )
+    client.client = mock_client_backend()
+
+    return client
+
+
+@pytest.fixture
+def mocked_responses_client(tmp_path, mocked_vector_store, monkeypatch):
+    monkeypatch.setattr(responses_mod, "OpenAiVectorStore", lambda store_name, **kwargs: mocked_vector_store)
+
+    client = ResponsesClient(
+        store_name="test_store",
+        settings_path=tmp_path / "settings.json",
+        history_path=tmp_path / "history.sqlite",
+        usage_path=tmp_path / "usage.sqlite",
+    )
     client.client = mock_client_backend()
 
     return client
@@ -335,7 +566,7 @@ def mocked_client(tmp_path, mocked_vector_store, monkeypatch):
 @pytest.fixture
 def mocked_client_handler():
     return OpenAIHandler(
-        files={"file_1", "filename.txt"},
+        files={"file_1": "filename.txt"},
         formatter=ConsoleFormatter(),
     )
 
@@ -1,4 +1,17 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+import vecsync.chat.clients.openai as client_mod
+from vecsync.chat.cache import ResponseCache
+from vecsync.chat.clients.openai import OpenAIHandler
+from vecsync.chat.formatter import ConsoleFormatter
+from vecsync.chat.usage import Budget, BudgetExceeded, Usage
 from vecsync.settings import Settings
+from vecsync.store.local import LocalVectorStore
+from vecsync.store.openai import OpenAiVectorStore
 
 
 def test_list_assistants(mocked_client):
@@ -31,6 +44,9 @@ def test_get_thread_id_new(mocked_client):
 
 
 def test_get_thread_id_existing(mocked_client):
+    mocked_client.client.beta.threads.create()
+    mocked_client.client.beta.threads.create()
+
     settings = Settings(path=mocked_client.settings_path)
     settings["openai_thread_id"] = "thread_2"
 
@@ -38,6 +54,15 @@ def test_get_thread_id_existing(mocked_client):
     assert thread_id == "thread_2"
 
 
+def test_get_thread_id_deleted(mocked_client):
+    settings = Settings(path=mocked_client.settings_path)
+    settings["openai_thread_id"] = "thread_deleted"
+
+    thread_id = mocked_client._get_thread_id()
+    assert thread_id == "thread_1"
+    assert settings["openai_thread_id"].value == "thread_1"
+
+
 def test_create_assistant(mocked_client, mocked_vector_store):
     mocked_client.vector_store = mocked_vector_store
     id = mocked_client._create_assistant()
@@ -82,6 +107,17 @@ def test_load_history_valid(mocked_client):
     assert [x["role"] for x in history] == ["user", "user", "assistant"]
 
 
+def test_load_history_cached(mocked_client):
+    mocked_client.send_message("Hello")
+    mocked_client.load_history()
+
+    mocked_client.send_message("World")
+    history = mocked_client.load_history(limit=1)
+
+    assert history == [{"role": "user", "content": "World"}]
+    assert mocked_client.history.count(mocked_client.thread_id) == 2
+
+
 def test_message(mocked_client, mocked_client_handler):
     mocked_client.stream_response(thread_id="", assistant_id="", handler=mocked_client_handler)
 
@@ -89,7 +125,8 @@ def test_message(mocked_client, mocked_client_handler):
     while not mocked_client_handler.queue.empty():
         items.append(mocked_client_handler.queue.get_nowait())
 
-    assert items == ["This", "is", "a", "test", "message", "from", "the", "assistant"]
+    # The stream is always terminated with a sentinel
+    assert items == ["This", "is", "a", "test", "message", "from", "the", "assistant", None]
 
 
 def test_consume_queue(mocked_client, mocked_client_handler):
@@ -98,3 +135,364 @@ def test_consume_queue(mocked_client, mocked_client_handler):
     items = list(mocked_client_handler.consume_queue())
 
     assert items == ["This", "is", "a", "test", "message", "from", "the", "assistant"]
+
+
+def test_stream_response_with_prompt(mocked_client, mocked_client_handler, monkeypatch):
+    mocked_client.connect()
+
+    def fail(**kwargs):
+        raise AssertionError("The prompt should be sent with the run")
+
+    monkeypatch.setattr(mocked_client.client.beta.threads.messages, "create", fail)
+    mocked_client.stream_response(mocked_client.thread_id, mocked_client.assistant_id, mocked_client_handler, "Hello")
+
+    history = mocked_client.load_history()
+    assert history == [{"role": "user", "content": "Hello"}]
+
+
+def test_consume_queue_error(mocked_client, mocked_client_handler):
+    def fail(**kwargs):
+        raise RuntimeError("Run failed")
+
+    mocked_client.client.beta.threads.runs.stream = fail
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(mocked_client.stream_response, "", "", mocked_client_handler)
+
+        with pytest.raises(RuntimeError, match="Run failed"):
+            list(mocked_client_handler.consume_queue())
+
+
+def test_consume_queue_cancel(mocked_client):
+    class RunningHandler(OpenAIHandler):
+        current_run = SimpleNamespace(id="run_1")
+
+    handler = RunningHandler(files={}, formatter=ConsoleFormatter())
+
+    # Consumer stops after the first chunk which cancels the stream
+    handler.on_message_delta(delta=SimpleNamespace(content=[]), snapshot=None)
+    for _ in handler.consume_queue():
+        break
+
+    assert handler.cancelled.is_set()
+
+    mocked_client.stream_response(thread_id="thread_1", assistant_id="", handler=handler)
+    assert mocked_client.client.beta.threads.runs.cancelled == ["run_1"]
+    assert list(handler.consume_queue()) == []
+
+
+def test_aconsume_queue(mocked_client, mocked_client_handler):
+    async def consume():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(mocked_client.stream_response, "", "", mocked_client_handler)
+            return [chunk async for chunk in mocked_client_handler.aconsume_queue()]
+
+    items = asyncio.run(consume())
+    assert items == ["This", "is", "a", "test", "message", "from", "the", "assistant"]
+
+
+def test_aconsume_queue_error(mocked_client, mocked_client_handler):
+    def fail(**kwargs):
+        raise RuntimeError("Run failed")
+
+    mocked_client.client.beta.threads.runs.stream = fail
+
+    async def consume():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(mocked_client.stream_response, "", "", mocked_client_handler)
+            return [chunk async for chunk in mocked_client_handler.aconsume_queue()]
+
+    with pytest.raises(RuntimeError, match="Run failed"):
+        asyncio.run(consume())
+
+
+def test_connect_caches_ids(mocked_client, mocked_vector_store):
+    mocked_client.connect()
+    assistant_id = mocked_client.assistant_id
+
+    resources = Settings(path=mocked_client.settings_path)["openai_resources"].value
+    assert resources["test_store"] == {"vector_store_id": mocked_vector_store.store.id, "assistant_id": assistant_id}
+
+    # A warm start validates the cached IDs without listing the account
+    def fail():
+        raise AssertionError("Cached IDs should be used")
+
+    mocked_client.client.beta.assistants.list = fail
+    mocked_vector_store.client.vector_stores.list = fail
+
+    mocked_client.disconnect()
+    mocked_client.connect()
+    assert mocked_client.assistant_id == assistant_id
+    assert mocked_client.thread_id == "thread_1"
+
+
+def test_connect_stale_cache(mocked_client):
+    mocked_client.connect()
+    mocked_client.client.beta.assistants.delete(mocked_client.assistant_id)
+
+    mocked_client.connect()
+
+    # A new assistant is created which also starts a new thread
+    assert mocked_client.assistant_id == "assistant_vecsync-test_store_1"
+    assert mocked_client.thread_id == "thread_2"
+
+
+def test_response_cache(mocked_client, tmp_path, monkeypatch):
+    mocked_client.response_cache = ResponseCache(path=tmp_path / "responses.sqlite")
+    mocked_client.connect()
+
+    def ask(prompt):
+        handler = OpenAIHandler(mocked_client.files, ConsoleFormatter())
+        mocked_client.stream_response(mocked_client.thread_id, mocked_client.assistant_id, handler, prompt)
+        return list(handler.consume_queue())
+
+    streamed = ask("What is this?")
+
+    def fail(**kwargs):
+        raise AssertionError("Cached responses should not create a run")
+
+    monkeypatch.setattr(mocked_client.client.beta.threads.runs, "stream", fail)
+
+    # Hits are rendered through the handler like a streamed response and recorded in the thread
+    assert ask("  what is THIS? ") == streamed
+    history = mocked_client.load_history()
+    assert [m["role"] for m in history] == ["user", "user", "assistant"]
+    assert history[-1]["content"] == "Thisisatestmessagefromtheassistant"
+
+
+def test_response_cache_store_changed(mocked_client, mocked_vector_store, tmp_path):
+    mocked_client.response_cache = ResponseCache(path=tmp_path / "responses.sqlite")
+    mocked_client.connect()
+    key = mocked_client._cache_key("What is this?")
+
+    # Files uploaded for other stores don't change the key, while files attached to this store do
+    client = mocked_vector_store.client
+    with open(tmp_path / "other.pdf", "w") as f:
+        f.write("Other data")
+    file_id = mocked_vector_store._upload(tmp_path / "other.pdf")
+    mocked_client.connect()
+    assert mocked_client._cache_key("What is this?") == key
+
+    client.vector_stores.files.create_and_poll(vector_store_id=mocked_vector_store.store.id, file_id=file_id)
+    mocked_client.connect()
+    assert mocked_client._cache_key("What is this?") != key
+
+
+def test_response_cache_not_stored_on_error(mocked_client, mocked_client_handler, tmp_path, monkeypatch):
+    mocked_client.response_cache = ResponseCache(path=tmp_path / "responses.sqlite")
+    mocked_client.connect()
+
+    def fail(**kwargs):
+        raise RuntimeError("Run failed")
+
+    monkeypatch.setattr(mocked_client.client.beta.threads.runs, "stream", fail)
+    mocked_client.stream_response(mocked_client.thread_id, mocked_client.assistant_id, mocked_client_handler, "Hi")
+
+    assert len(mocked_client.response_cache) == 0
+
+
+def test_response_cache_unavailable(mocked_client, mocked_vector_store, tmp_path, monkeypatch):
+    mocked_client.response_cache = ResponseCache(path=tmp_path / "responses.sqlite")
+    mocked_client.connect()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("Listing failed")
+
+    monkeypatch.setattr(mocked_vector_store, "get_attached_ids", fail)
+    monkeypatch.setattr(mocked_client.response_cache, "put", fail)
+    handler = OpenAIHandler(mocked_client.files, ConsoleFormatter())
+
+    # The prompt is answered without the cache
+    mocked_client.stream_response(mocked_client.thread_id, mocked_client.assistant_id, handler, "What is this?")
+
+    assert "".join(handler.consume_queue()) == "Thisisatestmessagefromtheassistant"
+
+
+def citation_delta(text, citations):
+    annotations = [
+        SimpleNamespace(type="file_citation", text=marker, file_citation=SimpleNamespace(file_id=file_id))
+        for marker, file_id in citations.items()
+    ]
+    content = SimpleNamespace(type="text", text=SimpleNamespace(value=text, annotations=annotations))
+    return SimpleNamespace(content=[content])
+
+
+def test_handler_collapses_citations():
+    handler = OpenAIHandler({"file_1": "a.pdf", "file_2": "b.pdf"}, ConsoleFormatter())
+    handler.formatter = SimpleNamespace(
+        format_citation=lambda i: f"[{i}]", get_references=lambda a, f, m: f" refs={list(f.values())}"
+    )
+
+    delta = citation_delta(
+        "First【4:0†source】【4:1†source】 second【4:2†source】 【4:3†source】.",
+        {
+            "【4:0†source】": "file_1",
+            "【4:1†source】": "file_1",
+            "【4:2†source】": "file_2",
+            "【4:3†source】": "file_1",
+        },
+    )
+    handler.on_message_delta(delta, snapshot=None)
+    handler.on_message_done(message=None)
+    handler.finish()
+
+    assert list(handler.consume_queue()) == ["First[1] second[2][1].", " refs=['a.pdf', 'b.pdf']"]
+
+
+def test_handler_resolves_new_file(mocked_client, mocked_vector_store, create_test_upload):
+    mocked_client.connect()
+    assert mocked_client.files == {}
+
+    # A file synced after connecting is named once it is cited
+    mocked_vector_store.sync(create_test_upload)
+    file_id = mocked_vector_store.get_files()[0].id
+
+    handler = OpenAIHandler(mocked_client.citations, ConsoleFormatter())
+    handler.on_message_delta(citation_delta("Text【4:0†source】", {"【4:0†source】": file_id}), snapshot=None)
+    handler.on_message_done(message=None)
+    handler.finish()
+
+    references = "".join(handler.consume_queue())
+    assert mocked_vector_store.get_file_names()[file_id] in references
+
+
+def test_usage_recorded(mocked_client, mocked_client_handler):
+    mocked_client.connect()
+    mocked_client.stream_response(
+        mocked_client.thread_id, mocked_client.assistant_id, mocked_client_handler, "Hello", session="s1"
+    )
+    list(mocked_client_handler.consume_queue())
+
+    assert mocked_client_handler.usage.total_tokens == 108
+    assert mocked_client.ledger.summary(by="session")["s1"].total_tokens == 108
+    assert mocked_client.usage_report(mocked_client_handler).endswith("| Today: 108 tokens")
+
+
+@pytest.mark.parametrize("action", ["refuse", "warn"])
+def test_budget(mocked_client, mocked_client_handler, action):
+    mocked_client.connect()
+    Budget(daily_tokens=100, action=action).save(mocked_client.settings)
+    mocked_client.ledger.record(Usage(total_tokens=150), "thread_1")
+
+    mocked_client.stream_response(mocked_client.thread_id, mocked_client.assistant_id, mocked_client_handler, "Hi")
+
+    if action == "refuse":
+        with pytest.raises(BudgetExceeded, match="Daily token budget of 100 tokens is used up"):
+            list(mocked_client_handler.consume_queue())
+    else:
+        chunks = list(mocked_client_handler.consume_queue())
+        assert chunks[0].startswith("⚠️ Daily token budget")
+        assert "".join(chunks[1:]) == "Thisisatestmessagefromtheassistant"
+
+
+def test_local_store(mocked_client, tmp_path):
+    document = tmp_path / "notes.txt"
+    document.write_text("Propensity scores adjust for treatment selection bias.")
+    local_store = LocalVectorStore("test_store", path=tmp_path / "stores")
+    local_store.sync([document])
+
+    mocked_client.local_store = local_store
+    mocked_client.connect()
+    assert mocked_client.files == {local_store.file_id("notes.txt"): "notes.txt"}
+
+    handler = OpenAIHandler(mocked_client.citations, ConsoleFormatter())
+    mocked_client.stream_response(mocked_client.thread_id, mocked_client.assistant_id, handler, "What is bias?")
+    text = "".join(handler.consume_queue())
+
+    # Passages are retrieved locally and the run doesn't search the OpenAI vector store
+    run = mocked_client.client.beta.threads.runs.stream.calls[-1]
+    assert run["tools"] == []
+    assert "[1] Propensity scores" in run["additional_instructions"]
+    assert "notes.txt" in text
+
+
+def test_local_store_search_error(mocked_client, tmp_path, monkeypatch):
+    local_store = LocalVectorStore("test_store", path=tmp_path / "stores")
+    local_store.sync([])
+    mocked_client.local_store = local_store
+    mocked_client.connect()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("Search failed")
+
+    monkeypatch.setattr(local_store, "search", fail)
+    handler = OpenAIHandler(mocked_client.citations, ConsoleFormatter())
+
+    # The failed search ends the stream instead of leaving the consumer waiting
+    mocked_client.stream_response(mocked_client.thread_id, mocked_client.assistant_id, handler, "What is bias?")
+
+    with pytest.raises(RuntimeError, match="Search failed"):
+        list(handler.consume_queue())
+
+
+def test_filters(mocked_client, mocked_vector_store, create_test_upload):
+    files = sorted(create_test_upload)
+    mocked_vector_store.sync(files, {f.name: {"year": 2020 + i} for i, f in enumerate(files)})
+
+    mocked_client.filters = {"type": "eq", "key": "year", "value": 2022}
+    mocked_client.connect()
+
+    handler = OpenAIHandler(mocked_client.citations, ConsoleFormatter())
+    mocked_client.stream_response(mocked_client.thread_id, mocked_client.assistant_id, handler, "What is bias?")
+    "".join(handler.consume_queue())
+
+    # Passages come from a filtered vector store search since assistant file search can't filter
+    run = mocked_client.client.beta.threads.runs.stream.calls[-1]
+    assert run["tools"] == []
+    assert files[2].name in run["additional_instructions"]
+    assert files[0].name not in run["additional_instructions"]
+
+
+def test_filters_search_error(mocked_client, mocked_vector_store, monkeypatch):
+    mocked_client.filters = {"type": "eq", "key": "year", "value": 2022}
+    mocked_client.connect()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("Search failed")
+
+    monkeypatch.setattr(mocked_vector_store.client.vector_stores, "search", fail)
+    handler = OpenAIHandler(mocked_client.citations, ConsoleFormatter())
+
+    # A failed filtered search is shown as an error instead of leaving the chat waiting
+    mocked_client.stream_response(mocked_client.thread_id, mocked_client.assistant_id, handler, "What is bias?")
+
+    with pytest.raises(RuntimeError, match="Search failed"):
+        list(handler.consume_queue())
+
+
+def test_sharded(mocked_client, mocked_vector_store, create_test_upload, monkeypatch):
+    files = sorted(create_test_upload)
+    store = OpenAiVectorStore("test_store", client=mocked_vector_store.client, shards=2)
+    store.sync(files)
+    monkeypatch.setattr(client_mod, "OpenAiVectorStore", lambda store_name, **kwargs: store)
+
+    mocked_client.connect()
+    assert mocked_client.sharded
+
+    handler = OpenAIHandler(mocked_client.citations, ConsoleFormatter())
+    mocked_client.stream_response(mocked_client.thread_id, mocked_client.assistant_id, handler, "What is bias?")
+    "".join(handler.consume_queue())
+
+    # Passages are retrieved from every shard since assistant file search only searches one store
+    run = mocked_client.client.beta.threads.runs.stream.calls[-1]
+    assert run["tools"] == []
+    assert all(f.name in run["additional_instructions"] for f in files)
+
+
+def test_sharded_search_error(mocked_client, mocked_vector_store, create_test_upload, monkeypatch):
+    store = OpenAiVectorStore("test_store", client=mocked_vector_store.client, shards=2)
+    store.sync(sorted(create_test_upload))
+    monkeypatch.setattr(client_mod, "OpenAiVectorStore", lambda store_name, **kwargs: store)
+    mocked_client.connect()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("Shard search failed")
+
+    monkeypatch.setattr(store.shards[1], "_search", fail)
+    handler = OpenAIHandler(mocked_client.citations, ConsoleFormatter())
+
+    # A failed search of one shard ends the stream instead of leaving the consumer waiting
+    mocked_client.stream_response(mocked_client.thread_id, mocked_client.assistant_id, handler, "What is bias?")
+
+    with pytest.raises(RuntimeError, match="Shard search failed"):
+        list(handler.consume_queue())
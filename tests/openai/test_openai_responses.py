@@ -0,0 +1,195 @@
+from types import SimpleNamespace
+
+import pytest
+
+import vecsync.chat.clients.responses as responses_mod
+from vecsync.chat.cache import ResponseCache
+from vecsync.chat.clients.openai import OpenAIHandler
+from vecsync.chat.clients.responses import ResponseFailed, ResponsesClient
+from vecsync.chat.formatter import PlainFormatter
+from vecsync.chat.sessions import ThreadPool
+from vecsync.store.local import LocalVectorStore
+from vecsync.store.openai import OpenAiVectorStore
+
+
+def ask(client, thread_id, prompt, formatter=None):
+    handler = OpenAIHandler(client.citations, formatter or PlainFormatter(), client.metadata)
+    client.stream_response(thread_id, client.assistant_id, handler, prompt)
+    return handler, "".join(handler.consume_queue())
+
+
+def test_connect(mocked_responses_client):
+    mocked_responses_client.connect()
+
+    assert mocked_responses_client.connected
+    assert mocked_responses_client.assistant_id is None
+    assert mocked_responses_client.thread_id.startswith("conv_")
+
+    # No assistant or thread is needed
+    backend = mocked_responses_client.client
+    assert backend.beta.assistants.list() == []
+    assert backend.beta.threads.messages.list.calls == 0
+
+
+def test_stream_response(mocked_responses_client):
+    mocked_responses_client.connect()
+    conversation = mocked_responses_client.thread_id
+
+    handler, text = ask(mocked_responses_client, conversation, "What is this?")
+
+    assert text == "A test [1]"
+    assert handler.annotations == {"file_1": 1}
+    assert handler.usage.total_tokens == 126
+
+    request = mocked_responses_client.client.responses.create.calls[-1]
+    assert request["input"] == "What is this?"
+    assert request["tools"] == [{"type": "file_search", "vector_store_ids": ["vector_store_1"]}]
+    assert "previous_response_id" not in request
+
+    assert mocked_responses_client.ledger.total().total_tokens == 126
+    assert mocked_responses_client.load_history() == [
+        {"role": "user", "content": "What is this?"},
+        {"role": "assistant", "content": "A test "},
+    ]
+
+
+def test_chained_turns(mocked_responses_client, tmp_path):
+    mocked_responses_client.connect()
+    conversation = mocked_responses_client.thread_id
+
+    ask(mocked_responses_client, conversation, "First")
+    ask(mocked_responses_client, conversation, "Second")
+
+    calls = mocked_responses_client.client.responses.create.calls
+    assert calls[-1]["previous_response_id"] == "resp_1"
+
+    # A new process continues the persisted conversation
+    client = ResponsesClient(
+        store_name="test_store",
+        settings_path=mocked_responses_client.settings_path,
+        history_path=tmp_path / "history.sqlite",
+        usage_path=tmp_path / "usage.sqlite",
+    )
+    client.client = mocked_responses_client.client
+    client.connect()
+
+    assert client.thread_id == conversation
+    ask(client, conversation, "Third")
+    assert calls[-1]["previous_response_id"] == "resp_2"
+    assert len(client.load_history()) == 6
+
+
+def test_separate_conversations(mocked_responses_client):
+    mocked_responses_client.connect()
+    pool = ThreadPool(mocked_responses_client, size=0)
+    other = pool.acquire()
+
+    ask(mocked_responses_client, mocked_responses_client.thread_id, "First")
+    ask(mocked_responses_client, other, "Second")
+
+    assert other != mocked_responses_client.thread_id
+    assert "previous_response_id" not in mocked_responses_client.client.responses.create.calls[-1]
+
+
+def test_response_cache(mocked_responses_client, tmp_path):
+    mocked_responses_client.response_cache = ResponseCache(path=tmp_path / "responses.sqlite")
+    mocked_responses_client.connect()
+    conversation = mocked_responses_client.thread_id
+
+    _, first = ask(mocked_responses_client, conversation, "Repeat")
+    _, second = ask(mocked_responses_client, conversation, "Repeat")
+
+    assert first == second
+    assert len(mocked_responses_client.client.responses.create.calls) == 1
+    assert len(mocked_responses_client.load_history()) == 4
+
+
+def test_response_cache_unavailable(mocked_responses_client, tmp_path, monkeypatch):
+    mocked_responses_client.response_cache = ResponseCache(path=tmp_path / "responses.sqlite")
+    mocked_responses_client.connect()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("Cache failed")
+
+    monkeypatch.setattr(mocked_responses_client.response_cache, "get", fail)
+    monkeypatch.setattr(mocked_responses_client.response_cache, "put", fail)
+
+    # The prompt is answered without the cache
+    _, text = ask(mocked_responses_client, mocked_responses_client.thread_id, "What is this?")
+    assert text == "A test [1]"
+
+
+def test_failed_response(mocked_responses_client, monkeypatch):
+    mocked_responses_client.connect()
+    failed = SimpleNamespace(
+        type="response.failed",
+        response=SimpleNamespace(status="failed", error=SimpleNamespace(message="server error")),
+    )
+
+    class FailedStream:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def __iter__(self):
+            return iter([failed])
+
+    monkeypatch.setattr(mocked_responses_client.client.responses, "create", lambda **kwargs: FailedStream())
+
+    with pytest.raises(ResponseFailed):
+        ask(mocked_responses_client, mocked_responses_client.thread_id, "Hello")
+
+    assert mocked_responses_client.load_history() == []
+
+
+def test_filters(mocked_responses_client):
+    mocked_responses_client.filters = {"type": "eq", "key": "collection", "value": "Causal"}
+    mocked_responses_client.connect()
+
+    handler = OpenAIHandler(mocked_responses_client.citations, PlainFormatter())
+    mocked_responses_client.stream_response(mocked_responses_client.thread_id, None, handler, "Question")
+    "".join(handler.consume_queue())
+
+    request = mocked_responses_client.client.responses.create.calls[-1]
+    assert request["tools"][0]["filters"] == {"type": "eq", "key": "collection", "value": "Causal"}
+
+
+def test_local_store_search_error(mocked_responses_client, tmp_path, monkeypatch):
+    local_store = LocalVectorStore("test_store", path=tmp_path / "stores")
+    local_store.sync([])
+    mocked_responses_client.local_store = local_store
+    mocked_responses_client.connect()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("Search failed")
+
+    monkeypatch.setattr(local_store, "search", fail)
+    handler = OpenAIHandler(mocked_responses_client.citations, PlainFormatter())
+
+    # The failed search ends the stream instead of leaving the consumer waiting
+    mocked_responses_client.stream_response(mocked_responses_client.thread_id, None, handler, "What is bias?")
+
+    with pytest.raises(RuntimeError, match="Search failed"):
+        list(handler.consume_queue())
+
+
+def test_sharded_search_error(mocked_responses_client, mocked_vector_store, create_test_upload, monkeypatch):
+    store = OpenAiVectorStore("test_store", client=mocked_vector_store.client, shards=2)
+    store.sync(sorted(create_test_upload))
+    monkeypatch.setattr(responses_mod, "OpenAiVectorStore", lambda store_name, **kwargs: store)
+    mocked_responses_client.connect()
+    assert mocked_responses_client.sharded
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("Shard search failed")
+
+    monkeypatch.setattr(store.shards[1], "_search", fail)
+    handler = OpenAIHandler(mocked_responses_client.citations, PlainFormatter())
+
+    # A failed search of one shard ends the stream instead of leaving the consumer waiting
+    mocked_responses_client.stream_response(mocked_responses_client.thread_id, None, handler, "What is bias?")
+
+    with pytest.raises(RuntimeError, match="Shard search failed"):
+        list(handler.consume_queue())
@@ -1,5 +1,12 @@
+import threading
+
 import pytest
 
+from vecsync.store.base import FileStatus
+from vecsync.store.chunking import PROFILES, ChunkingPolicy
+from vecsync.store.openai import OpenAiVectorStore
+from vecsync.store.registry import FileRegistry
+
 
 def test_get_files_none(mocked_vector_store):
     files = mocked_vector_store.get_files()
@@ -25,16 +32,16 @@ def test_get_files_empty(mocked_vector_store):
 
 
 def test_get_files_existing(mocked_vector_store, create_test_upload):
-    files_uploaded = mocked_vector_store._upload_files(create_test_upload)
+    mocked_vector_store.sync(create_test_upload)
 
     remote_files = mocked_vector_store.get_files()
 
-    assert len(remote_files) == len(files_uploaded) == 3
+    assert len(remote_files) == 3
+    assert all(f.status == FileStatus.ATTACHED for f in remote_files)
 
 
 def test_delete_files(mocked_vector_store, create_test_upload):
-    files_uploaded = mocked_vector_store._upload_files(create_test_upload)
-    assert len(files_uploaded) == 3
+    files_uploaded = [mocked_vector_store._upload(file) for file in create_test_upload]
 
     removed_files = mocked_vector_store._delete_files(files_uploaded)
     assert len(removed_files) == 3
@@ -62,16 +69,6 @@ def test_get(mocked_vector_store):
     assert store.id == "vector_store_1"
 
 
-def test_attach_files(mocked_vector_store, create_test_upload):
-    files_uploaded = mocked_vector_store._upload_files(create_test_upload)
-    assert len(files_uploaded) == 3
-
-    mocked_vector_store._attach_files(files_uploaded)
-
-    remote_files = mocked_vector_store.get_files()
-    assert len(remote_files) == 3
-
-
 def test_sync_files(mocked_vector_store, create_test_upload):
     result = mocked_vector_store.sync(create_test_upload)
 
@@ -94,3 +91,290 @@ def test_sync_files_with_existing_overlap(mocked_vector_store, create_test_uploa
     assert result2.files_skipped == 2
     assert result2.remote_count == 3
     assert result2.duration > 0
+
+
+def test_search(mocked_vector_store, create_test_upload):
+    mocked_vector_store.sync(create_test_upload)
+
+    results = mocked_vector_store.search("causal inference", max_results=2)
+
+    assert len(results) == 2
+    assert results[0].score > results[1].score
+    assert results[0].filename.startswith("test_file_")
+    assert "causal inference" in results[0].text
+
+
+def test_search_stale_store_id(mocked_vector_store, create_test_upload):
+    mocked_vector_store.sync(create_test_upload)
+    mocked_vector_store.store = None
+
+    # A cached ID of a deleted store falls back to looking up the store by name
+    results = mocked_vector_store.search("query", store_id="vector_store_deleted")
+
+    assert len(results) == 3
+    assert mocked_vector_store.store.id == "vector_store_1"
+
+
+def test_sync_uploads_concurrently(mocked_vector_store, create_test_upload):
+    create_file = mocked_vector_store.client.files.create
+    active, peak = 0, 0
+    lock = threading.Lock()
+    release = threading.Barrier(3, timeout=5)
+
+    def tracked_create(**kwargs):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        # Every upload waits for the others, which only succeeds if they are in flight together
+        release.wait()
+        with lock:
+            active -= 1
+        return create_file(**kwargs)
+
+    mocked_vector_store.client.files.create = tracked_create
+    mocked_vector_store.workers = 3
+
+    result = mocked_vector_store.sync(create_test_upload)
+
+    assert result.files_saved == 3
+    assert peak == 3
+
+
+def test_sync_attributes(mocked_vector_store, create_test_upload):
+    files = sorted(create_test_upload)
+    attributes = {f.name: {"source": "file", "year": 2020 + i} for i, f in enumerate(files)}
+
+    mocked_vector_store.sync(files, attributes)
+
+    attached = mocked_vector_store.client.vector_stores.files.list("vector_store_1")
+    assert sorted(f.attributes["year"] for f in attached) == [2020, 2021, 2022]
+
+    results = mocked_vector_store.search("query", filters={"type": "gte", "key": "year", "value": 2021})
+    assert {r.filename for r in results} == {files[1].name, files[2].name}
+
+    # Changed attributes of files which are already attached are updated
+    attributes[files[0].name] = {"source": "file", "year": 2030}
+    result = mocked_vector_store.sync(files, attributes)
+
+    assert result.files_saved == 0
+    assert sorted(f.attributes["year"] for f in attached) == [2021, 2022, 2030]
+
+
+def test_sync_chunking(mocked_vector_store, create_test_upload):
+    files = sorted(create_test_upload)
+    attributes = {f.name: {"source": "file"} for f in files}
+    create_and_poll = mocked_vector_store.client.vector_stores.files.create_and_poll
+
+    mocked_vector_store.sync(files, attributes, ChunkingPolicy(default="small"))
+
+    assert len(create_and_poll.calls) == 3
+    assert all(call["chunking_strategy"] == PROFILES["small"].strategy() for call in create_and_poll.calls)
+    attached = mocked_vector_store.client.vector_stores.files.list("vector_store_1")
+    assert all(f.attributes == {"source": "file", "chunking": "small"} for f in attached)
+
+    # Files are attached again when their profile changes, and left alone otherwise
+    mocked_vector_store.sync(files, attributes, ChunkingPolicy(default="small", sources={"file": "large"}))
+    mocked_vector_store.sync(files, attributes, ChunkingPolicy(default="small", sources={"file": "large"}))
+
+    assert len(create_and_poll.calls) == 6
+    assert create_and_poll.calls[-1]["chunking_strategy"] == PROFILES["large"].strategy()
+    assert len(attached) == 3
+
+
+def test_sync_order(mocked_vector_store, tmp_path):
+    files = _sharded_upload(tmp_path, 5)
+    client = mocked_vector_store.client
+    create_and_poll = client.vector_stores.files.create_and_poll
+    mocked_vector_store._upload(files[1])
+    mocked_vector_store.workers = 1
+
+    # Each new file is attached as soon as it is uploaded, in the order given
+    attached_before_upload = []
+    create = client.files.create
+
+    def logged_create(**kwargs):
+        attached_before_upload.append(len(create_and_poll.calls))
+        return create(**kwargs)
+
+    client.files.create = logged_create
+    result = mocked_vector_store.sync(files[::-1])
+
+    assert result.files_saved == 4
+    assert attached_before_upload == [0, 1, 2, 4]
+    names = {f.id: f.filename for f in client.files.list()}
+    assert [names[call["file_id"]] for call in create_and_poll.calls] == [f.name for f in files[::-1]]
+
+
+def _sharded_upload(tmp_path, count: int) -> list:
+    files = []
+    for i in range(count):
+        file = tmp_path / f"paper_{i}.txt"
+        file.write_text(f"This is paper {i}")
+        files.append(file)
+    return files
+
+
+def _placement(store: OpenAiVectorStore) -> dict[str, str]:
+    """Get the name of the shard each file is attached to, keyed by file name."""
+    names = store.get_file_names()
+    return {
+        names[f.id]: shard.name
+        for shard in store.shards
+        for f in store.client.vector_stores.files.list(vector_store_id=shard.store.id)
+    }
+
+
+def test_sync_sharded(mocked_vector_store, tmp_path):
+    files = _sharded_upload(tmp_path, 30)
+    store = OpenAiVectorStore("test_store", client=mocked_vector_store.client, shards=3)
+
+    result = store.sync(files)
+
+    assert result.remote_count == 30
+    assert [shard.store.name for shard in store.shards] == ["test_store", "test_store-shard-1", "test_store-shard-2"]
+    # Every file is attached once, to the shard the ring places it on
+    placement = _placement(store)
+    assert placement == {f.name: store.shards[store.ring.shard(f.name)].name for f in files}
+    assert set(placement.values()) == {shard.name for shard in store.shards}
+    assert len(store.get_files()) == 30
+
+    results = store.search("query", max_results=5)
+    assert len(results) == 5
+    assert [r.score for r in results] == sorted((r.score for r in results), reverse=True)
+
+
+def test_sync_resharded(mocked_vector_store, tmp_path):
+    files = _sharded_upload(tmp_path, 40)
+    client = mocked_vector_store.client
+    create_and_poll = client.vector_stores.files.create_and_poll
+
+    store = OpenAiVectorStore("test_store", client=client, shards=3)
+    store.sync(files)
+    before = _placement(store)
+    attached = len(create_and_poll.calls)
+
+    # Adding a shard only moves the files placed on it, without uploading them again
+    store = OpenAiVectorStore("test_store", client=client, shards=4)
+    result = store.sync(files)
+    after = _placement(store)
+
+    moved = {name for name in after if after[name] != before[name]}
+    assert result.files_saved == 0
+    assert len(after) == 40
+    assert 0 < len(moved) < 20
+    assert all(after[name] == "test_store-shard-3" for name in moved)
+    assert len(create_and_poll.calls) - attached == len(moved)
+
+    # Removing shards moves their files back and deletes their stores
+    store = OpenAiVectorStore("test_store", client=client, shards=2)
+    store.sync(files)
+
+    assert len(_placement(store)) == 40
+    assert sorted(s.name for s in client.vector_stores.list()) == ["test_store", "test_store-shard-1"]
+
+
+def test_read_before_sharded_sync(mocked_vector_store, tmp_path):
+    files = _sharded_upload(tmp_path, 10)
+    client = mocked_vector_store.client
+    mocked_vector_store.sync(files)
+    store_id = mocked_vector_store.store.id
+
+    # Shards added since the last sync read as empty until the next sync creates them
+    store = OpenAiVectorStore("test_store", client=client, shards=3)
+    assert len(store.get_attached_ids()) == 10
+    store = OpenAiVectorStore("test_store", client=client, shards=3)
+    assert len(store.search("query", max_results=5, store_id=store_id)) == 5
+
+    # Only the missing shards are created, after every existing shard is located
+    client.vector_stores.create(name="test_store-shard-2")
+    store = OpenAiVectorStore("test_store", client=client, shards=3)
+    store.get_or_create()
+    assert sorted(s.name for s in client.vector_stores.list()) == [
+        "test_store",
+        "test_store-shard-1",
+        "test_store-shard-2",
+    ]
+
+
+def test_sync_shared_files(mocked_vector_store, tmp_path):
+    registry = FileRegistry(tmp_path / "files.json")
+    papers = OpenAiVectorStore("test_store", client=mocked_vector_store.client, registry=registry)
+    theses = OpenAiVectorStore("other_store", client=mocked_vector_store.client, registry=registry)
+
+    files = _sharded_upload(tmp_path, 3)
+    (tmp_path / "copies").mkdir()
+    copies = []
+    for file in files:
+        copy = tmp_path / "copies" / f"copy_of_{file.name}"
+        copy.write_bytes(file.read_bytes())
+        copies.append(copy)
+
+    assert papers.sync(files).files_saved == 3
+
+    # Files with the same contents are attached to the other store without uploading them again
+    result = theses.sync(copies)
+    assert result.files_saved == 0
+    assert result.files_reused == 3
+    assert len(mocked_vector_store.client.files.list()) == 3
+    assert set(_placement(theses)) == {f.name for f in files}
+
+    result = theses.sync(copies)
+    assert result.files_reused == 0
+    assert result.files_skipped == 3
+
+    # A removed file is kept while another store holds it
+    result = papers.sync(files[1:])
+    assert result.files_deleted == 0
+    assert len(_placement(papers)) == 2
+    assert len(mocked_vector_store.client.files.list()) == 3
+
+    result = theses.sync(copies[1:])
+    assert result.files_deleted == 1
+    assert len(mocked_vector_store.client.files.list()) == 2
+
+
+def test_sync_keeps_files_of_unregistered_stores(mocked_vector_store, tmp_path):
+    files = _sharded_upload(tmp_path, 3)
+    client = mocked_vector_store.client
+
+    # The default store was synced before the registry existed, so it never recorded its files
+    mocked_vector_store.sync(files)
+    registry = FileRegistry(tmp_path / "files.json")
+    project = OpenAiVectorStore("project", client=client, registry=registry)
+    project.sync(files)
+
+    result = project.sync(files[1:])
+    assert result.files_deleted == 0
+    assert len(client.files.list()) == 3
+
+    project.delete()
+    assert len(client.files.list()) == 3
+    assert len(mocked_vector_store.get_attached_ids()) == 3
+
+
+def test_collect_garbage(mocked_vector_store, tmp_path):
+    files = _sharded_upload(tmp_path, 6)
+    client = mocked_vector_store.client
+    mocked_vector_store.sync(files[:2])
+    OpenAiVectorStore("other_store", client=client).sync(files[2:3])
+
+    # Files left behind by an interrupted sync, two of them uploaded before the grace period
+    for file in files[3:]:
+        mocked_vector_store._upload(file)
+    for file in client.files.list():
+        if file.filename in (files[3].name, files[4].name):
+            file.created_at -= 7200
+
+    result = mocked_vector_store.collect_garbage(grace_period=3600, dry_run=True)
+    assert result.files_orphaned == 2
+    assert result.files_recent == 1
+    assert result.files_deleted == 0
+    assert result.bytes_orphaned == files[3].stat().st_size + files[4].stat().st_size
+    assert len(client.files.list()) == 6
+
+    result = mocked_vector_store.collect_garbage(grace_period=3600)
+    assert result.files_deleted == 2
+    assert result.bytes_reclaimed == result.bytes_orphaned
+    # Files held by any store are kept
+    assert sorted(f.filename for f in client.files.list()) == sorted(f.name for f in files[:3] + files[5:])
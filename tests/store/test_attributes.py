@@ -0,0 +1,85 @@
+import hashlib
+
+import pytest
+
+from vecsync.store.attributes import HashCache, file_attributes, file_hash, matches, parse_filters
+
+
+def test_parse_filters():
+    assert parse_filters([]) is None
+    assert parse_filters(["collection=Causal inference"]) == {
+        "type": "eq",
+        "key": "collection",
+        "value": "Causal inference",
+    }
+    assert parse_filters(["year >= 2020", "source!=zotero"]) == {
+        "type": "and",
+        "filters": [
+            {"type": "gte", "key": "year", "value": 2020},
+            {"type": "ne", "key": "source", "value": "zotero"},
+        ],
+    }
+    assert parse_filters(["reviewed=true"])["value"] is True
+
+
+@pytest.mark.parametrize("expression", ["year", "=2020", "year>=", "my year=2020"])
+def test_parse_filters_invalid(expression):
+    with pytest.raises(ValueError):
+        parse_filters([expression])
+
+
+def test_matches():
+    attributes = {"source": "zotero", "year": 2019, "collection": "Causal"}
+
+    assert matches(None, attributes)
+    assert matches(parse_filters(["year>=2019", "collection=Causal"]), attributes)
+    assert not matches(parse_filters(["year>2019"]), attributes)
+    either = {"type": "or", "filters": [parse_filters(["year=2000"]), parse_filters(["source=zotero"])]}
+    assert matches(either, attributes)
+
+    # Missing attributes and mismatched types never match
+    assert not matches(parse_filters(["hash=abc"]), attributes)
+    assert not matches(parse_filters(["collection>5"]), attributes)
+
+
+def test_file_attributes(tmp_path):
+    path = tmp_path / "papers" / "a.pdf"
+    path.parent.mkdir()
+    path.write_bytes(b"%PDF")
+
+    attributes = file_attributes(path, "zotero", root=tmp_path, collection="Causal", year=2020)
+
+    assert attributes == {
+        "source": "zotero",
+        "collection": "Causal",
+        "year": 2020,
+        "hash": hashlib.sha256(b"%PDF").hexdigest(),
+        "path": "papers/a.pdf",
+    }
+    assert set(file_attributes(path, "file")) == {"source", "hash", "path"}
+
+
+def test_hash_cache(tmp_path, monkeypatch):
+    path = tmp_path / "a.pdf"
+    path.write_bytes(b"%PDF")
+    cache = HashCache(tmp_path / "hashes.json")
+
+    reads = []
+    monkeypatch.setattr("vecsync.store.attributes.file_hash", lambda p: reads.append(p) or file_hash(p))
+
+    assert file_attributes(path, "file", hashes=cache)["hash"] == hashlib.sha256(b"%PDF").hexdigest()
+    cache.save()
+
+    # An unchanged file is not read again, even by a new process
+    cache = HashCache(tmp_path / "hashes.json")
+    assert cache.hash(path) == hashlib.sha256(b"%PDF").hexdigest()
+    assert len(reads) == 1
+
+    path.write_bytes(b"%PDF-1.7")
+    assert cache.hash(path) == hashlib.sha256(b"%PDF-1.7").hexdigest()
+    assert len(reads) == 2
+
+    # Entries of deleted files are dropped
+    path.unlink()
+    cache.save()
+    assert HashCache(tmp_path / "hashes.json").load() == {}
@@ -0,0 +1,61 @@
+import pytest
+
+from vecsync.settings import Settings
+from vecsync.store.chunking import PROFILES, ChunkingPolicy
+
+
+def test_select(tmp_path):
+    paper = tmp_path / "paper.pdf"
+    paper.write_bytes(b"x" * 100)
+    book = tmp_path / "book.pdf"
+    book.write_bytes(b"x" * 10_000)
+
+    policy = ChunkingPolicy(default="medium", sources={"zotero": "small"}, large_file_bytes=1000)
+
+    assert policy.select(paper) == "medium"
+    assert policy.select(paper, "zotero") == "small"
+    assert policy.select(book, "zotero") == "large"
+
+
+def test_select_large_file_from_source(tmp_path):
+    book = tmp_path / "book.pdf"
+    book.write_bytes(b"x" * 10_000)
+
+    policy = ChunkingPolicy(sources={"zotero": "small"}, large_file_bytes=1000, large_file_profile="medium")
+
+    # A large file from a source with its own profile uses the large file profile
+    assert policy.select(book, "zotero") == "medium"
+    assert policy.select(book, "file") == "medium"
+
+
+def test_policy_settings(tmp_path):
+    settings = Settings(path=tmp_path / "settings.json")
+    assert ChunkingPolicy.load(settings) == ChunkingPolicy()
+
+    policy = ChunkingPolicy(default="small", sources={"file": "large"})
+    policy.save(settings)
+    assert ChunkingPolicy.load(settings) == policy
+
+
+def test_profiles():
+    assert PROFILES["auto"] is None
+    assert PROFILES["small"].strategy() == {
+        "type": "static",
+        "static": {"max_chunk_size_tokens": 300, "chunk_overlap_tokens": 60},
+    }
+    assert PROFILES["small"].words() == (225, 45)
+
+
+def test_policy_unknown_profile(tmp_path):
+    with pytest.raises(ValueError, match="Unknown chunking profile 'huge'"):
+        ChunkingPolicy(default="huge")
+    with pytest.raises(ValueError):
+        ChunkingPolicy(sources={"zotero": "huge"})
+    with pytest.raises(ValueError):
+        ChunkingPolicy(large_file_profile="huge")
+
+    # A policy edited by hand is checked when it is loaded, rather than silently chunking with "auto"
+    settings = Settings(path=tmp_path / "settings.json")
+    settings["chunking"] = {"default": "huge"}
+    with pytest.raises(ValueError):
+        ChunkingPolicy.load(settings)
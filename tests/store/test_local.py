@@ -0,0 +1,155 @@
+import numpy as np
+import pytest
+
+from vecsync.store.base import FileStatus
+from vecsync.store.chunking import ChunkingPolicy
+from vecsync.store.local import LocalVectorStore, chunk_words, tokenize
+
+
+@pytest.fixture
+def documents(tmp_path):
+    folder = tmp_path / "documents"
+    folder.mkdir()
+    texts = {
+        "causal.txt": "Causal inference with adversarial representation learning. " * 50,
+        "bias.txt": "Treatment selection bias in observational data. " * 30 + "Gardening tomatoes. " * 5,
+        "garden.txt": "Gardening tips for tomatoes and peppers. " * 40,
+    }
+    for name, text in texts.items():
+        (folder / name).write_text(text)
+    return folder
+
+
+@pytest.fixture
+def local_store(tmp_path):
+    return LocalVectorStore("test_store", path=tmp_path / "stores")
+
+
+def test_tokenize_and_chunk():
+    assert tokenize("Causal Effects, e.g. ATE!") == ["causal", "effects", "e", "g", "ate"]
+
+    words = " ".join(str(i) for i in range(250))
+    chunks = chunk_words(words, size=100, overlap=20)
+    assert [len(c.split()) for c in chunks] == [100, 100, 90]
+    assert chunks[1].split()[0] == "80"
+
+    assert chunk_words("", size=100) == []
+    assert chunk_words("one two", size=100, overlap=20) == ["one two"]
+
+
+def test_get_missing(local_store):
+    with pytest.raises(ValueError):
+        local_store.get()
+
+    assert local_store.get_file_names() == {}
+    assert local_store.get_or_create().name == "test_store"
+
+
+def test_sync(local_store, documents):
+    result = local_store.sync(list(documents.iterdir()))
+
+    assert result.files_saved == 3
+    assert result.remote_count == 3
+
+    files = local_store.get_files()
+    assert {f.name for f in files} == {"causal.txt", "bias.txt", "garden.txt"}
+    assert all(f.status == FileStatus.ATTACHED for f in files)
+    assert set(local_store.get_file_names().values()) == {"causal.txt", "bias.txt", "garden.txt"}
+
+
+def test_sync_incremental(local_store, documents):
+    local_store.sync(list(documents.iterdir()))
+
+    result = local_store.sync(list(documents.iterdir()))
+    assert result.files_saved == 0
+    assert result.files_skipped == 3
+
+    (documents / "garden.txt").unlink()
+    (documents / "bias.txt").write_text("Instrumental variables and confounding.")
+
+    result = local_store.sync(list(documents.iterdir()))
+    assert result.files_saved == 1
+    assert result.files_deleted == 1
+    assert result.remote_count == 2
+
+    # Only the latest index version is kept
+    assert len(list(local_store.path.glob("index-*"))) == 1
+    assert len(list((local_store.path / "segments").glob("*.npz"))) == 2
+
+    assert local_store.search("tomatoes") == []
+    assert local_store.search("confounding")[0].filename == "bias.txt"
+
+
+def test_search(local_store, documents):
+    local_store.sync(list(documents.iterdir()))
+
+    results = local_store.search("gardening tomatoes", max_results=3)
+
+    assert len(results) == 3
+    assert results[0].filename == "garden.txt"
+    assert [r.score for r in results] == sorted([r.score for r in results], reverse=True)
+    assert "tomatoes" in results[0].text.lower()
+
+    # Files which share no terms with the query are not returned
+    assert {r.filename for r in local_store.search("adversarial")} == {"causal.txt"}
+    assert local_store.search("unknown words") == []
+
+
+def test_search_memory_maps_index(local_store, documents):
+    local_store.sync(list(documents.iterdir()))
+    local_store.search("bias")
+
+    assert isinstance(local_store._index["postings"], np.memmap)
+
+
+def test_search_empty_store(local_store):
+    local_store.create()
+
+    assert local_store.search("anything") == []
+
+
+def test_search_with_embeddings(tmp_path, documents):
+    def embed(texts):
+        return np.array([[t.count("tomatoes"), t.count("bias"), 0.1] for t in texts], dtype=float)
+
+    store = LocalVectorStore("test_store", path=tmp_path / "stores", embed=embed, semantic_weight=1.0)
+    store.sync(list(documents.iterdir()))
+
+    assert "embeddings" in store._load_index(store._read_manifest())
+    assert store.search("bias", max_results=1)[0].filename == "bias.txt"
+
+
+def test_delete(local_store, documents):
+    local_store.sync(list(documents.iterdir()))
+    local_store.delete()
+
+    assert not local_store.path.exists()
+    assert local_store.store is None
+
+
+def test_search_filters(local_store, documents):
+    files = list(documents.iterdir())
+    local_store.sync(files, {f.name: {"source": "file", "topic": f.stem} for f in files})
+
+    results = local_store.search("tomatoes", filters={"type": "ne", "key": "topic", "value": "garden"})
+    assert {r.filename for r in results} == {"bias.txt"}
+
+    # Attributes are updated without indexing the files again
+    result = local_store.sync(files, {f.name: {"source": "file", "topic": "other"} for f in files})
+    assert result.files_saved == 0
+    assert local_store.search("tomatoes", filters={"type": "eq", "key": "topic", "value": "garden"}) == []
+
+
+def test_sync_chunking(local_store, documents):
+    files = list(documents.iterdir())
+    local_store.sync(files)
+    auto = {f.name: f.chunks for f in local_store._read_manifest().files.values()}
+
+    result = local_store.sync(files, chunking=ChunkingPolicy(default="large"))
+    manifest = local_store._read_manifest()
+
+    # A profile change indexes every file again with the larger chunks
+    assert result.files_saved == 3
+    assert all(f.chunking == "large" for f in manifest.files.values())
+    assert sum(f.chunks for f in manifest.files.values()) < sum(auto.values())
+    assert local_store.sync(files, chunking=ChunkingPolicy(default="large")).files_saved == 0
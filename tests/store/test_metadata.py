@@ -0,0 +1,68 @@
+from vecsync.store.base import FileStatus, StoredFile
+from vecsync.store.metadata import FileMetadata, MetadataIndex
+
+
+def stored(id: str, name: str) -> StoredFile:
+    return StoredFile(id=id, name=name, status=FileStatus.ATTACHED)
+
+
+def test_describe():
+    metadata = FileMetadata(title="Title", authors=["Smith", "Jones", "Lee"], year=2020)
+    assert metadata.describe("file.pdf") == "Smith et al. (2020). Title"
+
+    metadata = FileMetadata(title="Title", authors=["Smith", "Jones"])
+    assert metadata.describe("file.pdf") == "Smith & Jones. Title"
+
+    metadata = FileMetadata(title="Title")
+    assert metadata.describe("file.pdf") == "Title"
+
+
+def test_describe_missing_title():
+    metadata = FileMetadata(authors=["Smith"], year=2020)
+    assert metadata.describe("file.pdf") == "file.pdf"
+
+
+def test_refresh_adds_missing(tmp_path):
+    index = MetadataIndex(path=tmp_path / "metadata.json")
+    lookup = {"a.pdf": FileMetadata(title="A"), "b.pdf": FileMetadata(title="B")}
+
+    added = index.refresh([stored("file_1", "a.pdf"), stored("file_2", "c.pdf")], lambda: lookup)
+
+    assert added == 1
+    assert index.get("file_1").title == "A"
+    assert "file_2" not in index
+
+    # Entries are persisted and reloaded from disk
+    reloaded = MetadataIndex(path=tmp_path / "metadata.json")
+    assert reloaded.get("file_1").title == "A"
+
+
+def test_refresh_skips_lookup_when_current(tmp_path):
+    index = MetadataIndex(path=tmp_path / "metadata.json")
+    index.refresh([stored("file_1", "a.pdf")], lambda: {"a.pdf": FileMetadata(title="A")})
+
+    def fail():
+        raise AssertionError("Lookup should not be called")
+
+    assert index.refresh([stored("file_1", "a.pdf")], fail) == 0
+
+
+def test_refresh_skips_lookup_for_other_sources(tmp_path):
+    index = MetadataIndex(path=tmp_path / "metadata.json")
+    index.refresh([stored("file_1", "a.pdf")], lambda: {"a.pdf": FileMetadata(title="A")}, names=["a.pdf"])
+
+    def fail():
+        raise AssertionError("Lookup should not be called")
+
+    # Files which didn't come from the looked up source never trigger the lookup
+    remote = [stored("file_1", "a.pdf"), stored("file_2", "notes.pdf")]
+    assert index.refresh(remote, fail, names=["a.pdf"]) == 0
+
+
+def test_refresh_prunes_stale(tmp_path):
+    index = MetadataIndex(path=tmp_path / "metadata.json")
+    index.refresh([stored("file_1", "a.pdf")], lambda: {"a.pdf": FileMetadata(title="A")})
+    index.refresh([], dict)
+
+    assert len(index) == 0
+    assert len(MetadataIndex(path=tmp_path / "metadata.json")) == 0
@@ -0,0 +1,51 @@
+import os
+
+from vecsync.settings import Settings
+from vecsync.store.file import FileStore
+from vecsync.store.priority import SyncPriority
+
+
+def _files(tmp_path):
+    files = []
+    for i, size in enumerate([300, 100, 200]):
+        path = tmp_path / f"paper{i}.pdf"
+        path.write_bytes(b"x" * size)
+        os.utime(path, (1000 + i, 1000 + i))
+        files.append(path)
+    return files
+
+
+def names(files):
+    return [f.name for f in files]
+
+
+def test_sort(tmp_path):
+    files = _files(tmp_path)
+
+    assert names(SyncPriority().sort(files)) == ["paper0.pdf", "paper1.pdf", "paper2.pdf"]
+    assert names(SyncPriority(order="smallest").sort(files)) == ["paper1.pdf", "paper2.pdf", "paper0.pdf"]
+    assert names(SyncPriority(order="modified").sort(files)) == ["paper2.pdf", "paper1.pdf", "paper0.pdf"]
+
+    # Files without a time added go last
+    added = {"paper0.pdf": 5.0, "paper2.pdf": 9.0}
+    assert names(SyncPriority(order="added").sort(files, added)) == ["paper2.pdf", "paper0.pdf", "paper1.pdf"]
+
+    priority = SyncPriority(order="smallest", pinned=["paper0.pdf", "paper2.pdf"])
+    assert names(priority.sort(files)) == ["paper0.pdf", "paper2.pdf", "paper1.pdf"]
+
+
+def test_priority_settings(tmp_path):
+    settings = Settings(path=tmp_path / "settings.json")
+    assert SyncPriority.load(settings) == SyncPriority()
+
+    priority = SyncPriority(order="added", pinned=["paper.pdf"])
+    priority.save(settings)
+    assert SyncPriority.load(settings) == priority
+
+
+def test_file_store_added(tmp_path):
+    files = _files(tmp_path)
+
+    added = FileStore(tmp_path).get_added(files)
+
+    assert added == {f.name: f.stat().st_ctime for f in files}
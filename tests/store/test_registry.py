@@ -0,0 +1,64 @@
+from vecsync.store.registry import FileRegistry
+
+
+def test_registry_add_find(tmp_path):
+    registry = FileRegistry(tmp_path / "files.json")
+    assert registry.find("abc") is None
+
+    registry.add("abc", "file_1", "paper.pdf", "papers")
+    registry.add("abc", "file_1", "paper.pdf", "theses")
+    registry.save()
+
+    entry = FileRegistry(tmp_path / "files.json").find("abc")
+    assert entry.file_id == "file_1"
+    assert entry.stores == ["papers", "theses"]
+
+
+def test_registry_release(tmp_path):
+    registry = FileRegistry(tmp_path / "files.json")
+    registry.add("abc", "file_1", "paper.pdf", "papers")
+    registry.add("abc", "file_1", "paper.pdf", "theses")
+
+    # The file is only unreferenced once every store released it
+    assert not registry.release("file_1", "papers")
+    assert registry.release("file_1", "theses")
+    assert registry.find("abc") is None
+
+    # Files which were never registered are held by no other store
+    assert registry.release("file_2", "papers")
+
+
+def test_registry_forget(tmp_path):
+    registry = FileRegistry(tmp_path / "files.json")
+    registry.add("abc", "file_1", "paper.pdf", "papers")
+    registry.add("def", "file_2", "thesis.pdf", "papers")
+
+    registry.forget({"file_1"})
+
+    assert registry.find("abc") is None
+    assert len(registry) == 1
+
+
+def test_registry_concurrent_save(tmp_path):
+    path = tmp_path / "files.json"
+    registry = FileRegistry(path)
+    registry.add("abc", "file_1", "paper.pdf", "papers")
+    registry.add("def", "file_2", "thesis.pdf", "papers")
+    registry.save()
+
+    # Two syncs load the registry before either saves
+    theses = FileRegistry(path)
+    theses.load()
+    reviews = FileRegistry(path)
+    reviews.load()
+
+    theses.add("abc", "file_1", "paper.pdf", "theses")
+    assert reviews.release("file_2", "papers")
+    reviews.add("abc", "file_1", "paper.pdf", "reviews")
+    theses.save()
+    reviews.save()
+
+    registry = FileRegistry(path)
+    assert registry.find("abc").stores == ["papers", "theses", "reviews"]
+    assert registry.find("def") is None
+    assert reviews.find("abc").stores == ["papers", "theses", "reviews"]
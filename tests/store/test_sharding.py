@@ -0,0 +1,44 @@
+import pytest
+
+from vecsync.store.sharding import HashRing, shard_index, shard_name
+
+
+def test_hash_ring_single_shard():
+    ring = HashRing(1)
+    assert {ring.shard(f"paper_{i}.pdf") for i in range(100)} == {0}
+
+
+def test_hash_ring_balanced():
+    ring = HashRing(4)
+    counts = [0] * 4
+    for i in range(4000):
+        counts[ring.shard(f"paper_{i}.pdf")] += 1
+
+    # Every shard holds close to a quarter of the files
+    assert all(700 < count < 1300 for count in counts)
+
+
+def test_hash_ring_minimal_moves():
+    names = [f"paper_{i}.pdf" for i in range(4000)]
+    before, after = HashRing(4), HashRing(5)
+
+    moved = [name for name in names if before.shard(name) != after.shard(name)]
+
+    # Only the files falling on the new shard move, about one in five
+    assert all(after.shard(name) == 4 for name in moved)
+    assert 600 < len(moved) < 1000
+
+
+def test_hash_ring_invalid():
+    with pytest.raises(ValueError):
+        HashRing(0)
+
+
+def test_shard_names():
+    assert shard_name("papers", 0) == "papers"
+    assert shard_name("papers", 3) == "papers-shard-3"
+
+    assert shard_index("papers", "papers") == 0
+    assert shard_index("papers", "papers-shard-3") == 3
+    assert shard_index("papers", "papers-shard-x") is None
+    assert shard_index("papers", "other-shard-1") is None
@@ -1,5 +1,6 @@
 import builtins
 import sqlite3
+from datetime import datetime, timezone
 from pathlib import Path
 
 import pytest
@@ -93,3 +94,50 @@ def test_resolve_collection_prompt_blank(monkeypatch, settings_mock):
 
     collection = ZoteroStore._resolve_collection([Collection(id=123, name="Test")])
     assert collection == 123
+
+
+def test_get_metadata(zotero_library_mock, monkeypatch, settings_mock):
+    monkeypatch.setattr("vecsync.store.zotero.Settings", lambda: settings_mock({"zotero_collection": 1}))
+
+    db = sqlite3.connect(zotero_library_mock)
+    store = ZoteroStore(db_connection=db, root=Path(""))
+    metadata = store.get_metadata()
+
+    assert set(metadata.keys()) == {"paper1.pdf", "paper2.pdf"}
+    assert metadata["paper1.pdf"].title == "Attention Is All You Need"
+    assert metadata["paper1.pdf"].authors == ["Vaswani", "Shazeer"]
+    assert metadata["paper1.pdf"].year == 2017
+    assert metadata["paper2.pdf"].authors == []
+    assert metadata["paper2.pdf"].year is None
+
+
+def test_get_attributes(zotero_library_mock, monkeypatch, settings_mock, tmp_path):
+    monkeypatch.setattr("vecsync.store.zotero.Settings", lambda: settings_mock({"zotero_collection": 1}))
+
+    db = sqlite3.connect(zotero_library_mock)
+    store = ZoteroStore(db_connection=db, root=tmp_path)
+    files = store.get_files()
+    for file in files:
+        file.parent.mkdir(parents=True)
+        file.write_bytes(b"%PDF")
+
+    attributes = store.get_attributes(files)
+
+    assert attributes["paper1.pdf"]["collection"] == "Foo"
+    assert attributes["paper1.pdf"]["year"] == 2017
+    assert attributes["paper1.pdf"]["path"] == "A1/paper1.pdf"
+    assert "year" not in attributes["paper2.pdf"]
+
+
+def test_get_added(zotero_library_mock, monkeypatch, settings_mock, tmp_path):
+    monkeypatch.setattr("vecsync.store.zotero.Settings", lambda: settings_mock({"zotero_collection": 1}))
+
+    db = sqlite3.connect(zotero_library_mock)
+    store = ZoteroStore(db_connection=db, root=tmp_path)
+    files = store.get_files()
+
+    added = store.get_added(files)
+
+    assert added["paper1.pdf"] == datetime(2023, 1, 5, 10, tzinfo=timezone.utc).timestamp()
+    assert added["paper2.pdf"] > added["paper1.pdf"]
+    assert store.get_added(files[:1]).keys() == {files[0].name}
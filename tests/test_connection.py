@@ -0,0 +1,38 @@
+import pytest
+
+from vecsync.connection import ConnectionOptions, openai_client, reset_clients
+from vecsync.settings import Settings
+
+
+@pytest.fixture
+def shared_clients():
+    reset_clients()
+    yield
+    reset_clients()
+
+
+def test_shared_client(shared_clients):
+    options = ConnectionOptions(max_connections=4, read_timeout=30)
+
+    client = openai_client(options)
+    assert openai_client(ConnectionOptions(max_connections=4, read_timeout=30)) is client
+    assert openai_client(ConnectionOptions()) is not client
+
+    assert client.timeout.read == 30
+    assert client.timeout.connect == options.connect_timeout
+    assert client.max_retries == options.max_retries
+
+
+def test_reset_clients(shared_clients):
+    client = openai_client(ConnectionOptions())
+    reset_clients()
+    assert openai_client(ConnectionOptions()) is not client
+
+
+def test_options_settings(tmp_path):
+    settings = Settings(path=tmp_path / "settings.json")
+    assert ConnectionOptions.load(settings) == ConnectionOptions()
+
+    options = ConnectionOptions(max_keepalive_connections=8, http2=False)
+    options.save(settings)
+    assert ConnectionOptions.load(settings) == options
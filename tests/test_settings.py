@@ -1,4 +1,10 @@
 import json
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
 
 from vecsync.settings import SettingExists, SettingMissing, Settings
 
@@ -43,3 +49,110 @@ def test_delete_settings_missing(settings_fixture):
     settings = Settings(path=settings_fixture)
     del settings["doesNotExist"]
     # No exception should be raised
+
+
+def test_read_settings_cached(tmp_path, monkeypatch):
+    path = tmp_path / "settings.json"
+    settings = Settings(path=path)
+    settings["test"] = "value"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Settings file should not be parsed again")
+
+    monkeypatch.setattr("vecsync.settings.json.load", fail)
+    assert Settings(path=path)["test"].value == "value"
+
+
+def test_read_settings_external_change(tmp_path):
+    path = tmp_path / "settings.json"
+    settings = Settings(path=path)
+    settings["test"] = "value"
+
+    # Simulate another process replacing the file
+    other = tmp_path / "other.json"
+    other.write_text(json.dumps({"test": "changed"}))
+    os.replace(other, path)
+
+    assert settings["test"].value == "changed"
+
+
+def test_batch_settings(tmp_path, monkeypatch):
+    path = tmp_path / "settings.json"
+    settings = Settings(path=path)
+
+    writes = []
+    original = Settings._write
+    monkeypatch.setattr(Settings, "_write", lambda self, data: writes.append(data) or original(self, data))
+
+    with settings.batch():
+        settings["a"] = 1
+        settings["b"] = 2
+        del settings["a"]
+        assert settings["b"].value == 2
+
+    assert len(writes) == 1
+    assert json.loads(path.read_text()) == {"b": 2}
+
+
+def test_batch_settings_error(tmp_path):
+    path = tmp_path / "settings.json"
+    settings = Settings(path=path)
+
+    with pytest.raises(RuntimeError), settings.batch():
+        settings["a"] = 1
+        raise RuntimeError()
+
+    assert type(settings["a"]) is SettingMissing
+    assert json.loads(path.read_text()) == {}
+
+
+def test_batch_settings_threads(tmp_path):
+    settings = Settings(path=tmp_path / "settings.json")
+    settings["counts"] = {}
+    started, finished = threading.Event(), threading.Event()
+
+    def increment(key: str):
+        with settings.batch():
+            counts = dict(settings["counts"].value)
+            started.set()
+            # The other thread's batch waits for this one to be written
+            finished.wait(timeout=0.5)
+            counts[key] = counts.get(key, 0) + 1
+            settings["counts"] = counts
+
+    # Both threads share one instance, as the chat client and its background thread rotation do
+    first = threading.Thread(target=increment, args=("a",))
+    first.start()
+    started.wait()
+    second = threading.Thread(target=lambda: (increment("b"), finished.set()))
+    second.start()
+    first.join()
+    second.join()
+
+    assert settings["counts"].value == {"a": 1, "b": 1}
+
+
+def test_write_settings_atomic(tmp_path):
+    settings = Settings(path=tmp_path / "settings.json")
+    settings["test"] = "value"
+
+    # Only the settings file and its lock remain, no temporary files
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["settings.json", "settings.json.lock"]
+
+
+def test_write_settings_concurrent_processes(tmp_path):
+    path = tmp_path / "settings.json"
+    script = (
+        "import sys\n"
+        "from vecsync.settings import Settings\n"
+        "settings = Settings(path=sys.argv[1])\n"
+        "for i in range(20):\n"
+        "    settings[f'{sys.argv[2]}_{i}'] = i\n"
+    )
+
+    procs = [subprocess.Popen([sys.executable, "-c", script, str(path), f"p{n}"]) for n in range(4)]
+    for proc in procs:
+        assert proc.wait(timeout=60) == 0
+
+    data = json.loads(path.read_text())
+    assert len(data) == 80